@@ -0,0 +1,91 @@
+'''
+Headless batch export, without the Package Exporter window (e.g. on a build farm). Run with mayapy:
+\n    mayapy Batch.py <definition file> <output directory> [options]
+\nThe definition file describes a scene and its packages (see Export.readDefinition()). It can be saved from the
+window with 'Package Exporter > Save Package Definition...'. Each run exports one definition, so many scenes can be
+exported at once by running one process per definition file.
+\nExit codes: 0 if everything was exported, 1 if any package's FBX export failed, 2 if the definition or options are invalid.
+'''
+import argparse
+import os
+import sys
+
+# Allow 'PackageExport' to be imported when this file is run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def parseArguments(args = None):
+    parser = argparse.ArgumentParser(description = "Export packages from a package definition file without the Package Exporter window.")
+    parser.add_argument('definition', help = "the package definition file")
+    parser.add_argument('output', help = "the directory to export to, created if it doesn't exist")
+    parser.add_argument('--scene', help = "the maya scene to open, instead of the definition's scene")
+    parser.add_argument('--format', dest = 'jsonFormat', help = "the JSON scene's format: pretty, compact, ndjson, binary or binary32")
+    parser.add_argument('--workers', type = int, help = "the amount of mayapy processes to export FBX files with (0 exports them in this process)")
+    parser.add_argument('--force', action = 'store_true', help = "export every FBX file, even unchanged ones")
+    parser.add_argument('--profile', action = 'store_true', help = "trace peak memory and write a profile report beside the JSON scene")
+    parser.add_argument('--no-fbx', dest = 'fbx', action = 'store_false', help = "don't export FBX files")
+    parser.add_argument('--no-json', dest = 'json', action = 'store_false', help = "don't export the JSON scene")
+
+    return parser.parse_args(args)
+
+def main(args = None):
+    arguments = parseArguments(args)
+
+    import maya.standalone
+    maya.standalone.initialize(name = 'python')
+
+    try:
+        import maya.cmds as cmds
+        from PackageExport import Export
+
+        if (not cmds.pluginInfo('fbxmaya', query = True, loaded = True)):
+            cmds.loadPlugin('fbxmaya', quiet = True)
+
+        try:
+            definition = Export.readDefinition(arguments.definition)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Couldn't read package definition: {e}")
+            return 2
+
+        scene = arguments.scene or definition.get('scene')
+        if (scene):
+            print(f"Opening {scene}...")
+            cmds.file(scene, open = True, force = True)
+
+        output = os.path.abspath(arguments.output).replace('\\', '/')
+        os.makedirs(output, exist_ok = True)
+
+        try:
+            packages, settings = Export.fromDefinition(definition, output)
+
+            # Command line options override the definition
+            if (arguments.jsonFormat != None):
+                settings.jsonFormat = arguments.jsonFormat
+            if (arguments.workers != None):
+                settings.workerCount = arguments.workers
+            if (arguments.force):
+                settings.forceRebuild = True
+            if (arguments.profile):
+                settings.profileEnabled = True
+            settings.fbxEnabled = settings.fbxEnabled and arguments.fbx
+            settings.jsonEnabled = settings.jsonEnabled and arguments.json
+
+            for pack in packages:
+                os.makedirs(pack.directory, exist_ok = True)
+
+            errors, warnings = Export.validate(packages, settings)
+            if (len(errors) > 0):
+                raise ValueError(" ".join(errors))
+        except (KeyError, ValueError) as e:
+            print(f"Invalid package definition: {e}")
+            return 2
+
+        for warning in warnings:
+            print(f"Warning: {warning}")
+
+        failed = Export.export(packages, settings)
+        return 1 if len(failed) > 0 else 0
+    finally:
+        maya.standalone.uninitialize()
+
+if __name__ == '__main__':
+    sys.exit(main())
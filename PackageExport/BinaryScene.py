@@ -0,0 +1,151 @@
+'''
+Binary scene format: a small JSON manifest plus one binary sidecar file holding every transform's values.
+\nThe manifest holds the root transform, and for each package its filename, path, transform names and where its
+values are in the sidecar. Each package's values are one contiguous block of little-endian floats, 9 per transform
+(translate xyz, rotate xyz, scale xyz, relative to the root transform), so a reader can memory-map the sidecar and
+use each block directly without parsing any text.
+\nThis module doesn't depend on maya, so readScene() can be copied into importers as a reference reader.
+'''
+import json
+import os
+import sys
+from array import array
+
+# NumPy is only needed for reading, and makes writing faster
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+formatName = 'packageExporterBinary'
+formatVersion = 1
+
+# Values stored per transform: translate xyz, rotate xyz, scale xyz
+valuesPerTransform = 9
+
+# Each package's block starts at a multiple of this many bytes in the sidecar
+alignment = 64
+
+# Supported value types: little-endian float64 and float32
+itemSizes = {'<f8' : 8, '<f4' : 4}
+
+def writeScene(f, sidecarPath, rootAttributes, packages, dtype = '<f8'):
+    '''
+    Writes the whole scene in one go (see iterWriteScene()).
+    '''
+    for _ in iterWriteScene(f, sidecarPath, rootAttributes, packages, dtype):
+        pass
+
+def iterWriteScene(f, sidecarPath, rootAttributes, packages, dtype = '<f8'):
+    '''
+    Writes a scene as a JSON manifest and a binary sidecar file, one package at a time. Yields after each package's
+    values are written; the manifest is only written once the generator finishes.
+
+    :param f: The file to write the manifest to, opened for writing text.
+    :param str sidecarPath: The path of the sidecar file. The manifest refers to it by filename, so it should be in the same directory.
+    :param dict rootAttributes: The root transform's attributes (see MainWindow.transform.attributes).
+    :param packages: An iterable of {'fileName', 'path', 'names', 'values'} dicts. 'values' is a block of transform
+    values relative to the root (see TransformMath.relativeTo()), with one row per name.
+    :param str dtype: '<f8' for float64 or '<f4' for float32 values.
+    '''
+    entries = []
+    offset = 0
+
+    with open(sidecarPath, 'wb') as sidecar:
+        for package in packages:
+            padding = -offset % alignment
+            sidecar.write(bytes(padding))
+            offset += padding
+
+            data = toBytes(package['values'], dtype)
+            sidecar.write(data)
+
+            entries.append({
+                'fileName' : package['fileName'],
+                'path' : package['path'],
+                'offset' : offset,
+                'count' : len(package['names']),
+                'names' : list(package['names'])
+            })
+            offset += len(data)
+            yield
+
+    manifest = {
+        'format' : formatName,
+        'version' : formatVersion,
+        'sidecar' : os.path.basename(sidecarPath),
+        'dtype' : dtype,
+        'valuesPerTransform' : valuesPerTransform,
+        'rootTransform' : rootAttributes,
+        'packages' : entries
+    }
+    f.write(json.dumps(manifest, separators = (',', ':')))
+
+def toBytes(values, dtype):
+    '''
+    Returns a block of transform values as packed little-endian floats.
+    '''
+    if (numpy != None):
+        return numpy.ascontiguousarray(values, dtype = dtype).tobytes()
+
+    packed = array('d' if dtype == '<f8' else 'f', values)
+    if (sys.byteorder != 'little'):
+        packed.byteswap()
+    return packed.tobytes()
+
+def readScene(path):
+    '''
+    Reads a scene written by writeScene(), memory-mapping the sidecar file. Requires NumPy.
+
+    :param str path: The path of the manifest file.
+    :returns dict: The manifest. Each package also has 'values': a read-only (count, 9) NumPy array backed by the
+    sidecar file, so values are only loaded from disk as they're used.
+    '''
+    with open(path) as f:
+        manifest = json.load(f)
+
+    if (manifest.get('format') != formatName or manifest.get('version') != formatVersion):
+        raise ValueError(f"{path} is not a version {formatVersion} binary scene")
+
+    dtype = numpy.dtype(manifest['dtype'])
+    stride = manifest['valuesPerTransform']
+    sidecarPath = os.path.join(os.path.dirname(path), manifest['sidecar'])
+
+    # numpy can't map empty files
+    if (os.path.getsize(sidecarPath) > 0):
+        data = numpy.memmap(sidecarPath, dtype = numpy.uint8, mode = 'r')
+    else:
+        data = numpy.zeros(0, dtype = numpy.uint8)
+
+    for package in manifest['packages']:
+        start = package['offset']
+        end = start + package['count'] * stride * dtype.itemsize
+        package['values'] = data[start : end].view(dtype).reshape(package['count'], stride)
+
+    return manifest
+
+def toJSONScene(scene):
+    '''
+    Converts a scene read by readScene() into the same dict as the JSON scene, e.g. to compare the two formats.
+    \nWith float64 values, json.dumps(toJSONScene(readScene(path)), indent = 4) matches the pretty JSON scene exactly.
+    '''
+    packages = []
+    for package in scene['packages']:
+        rows = package['values'].tolist()
+        transforms = [{
+            'name' : name,
+            'translate' : row[0:3],
+            'rotate' : row[3:6],
+            'scale' : row[6:9]
+        } for name, row in zip(package['names'], rows)]
+
+        packages.append({
+            'fileName' : package['fileName'],
+            'transforms' : transforms,
+            'path' : package['path']
+        })
+
+    return {
+        'rootTransform' : scene['rootTransform'],
+        'packages' : packages
+    }
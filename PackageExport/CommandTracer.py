@@ -0,0 +1,170 @@
+'''
+Opt-in tracing of maya.cmds calls, to find commands that are called once per item when they could be called once.
+\nWhile tracing is enabled, the 'cmds' module of the package's modules is swapped for a proxy that records every call.
+Calls are grouped by the user action they were made in (see action()): per action, the amount of calls to each
+command, the total time spent in each, and the lines that called them the most are printed when the action finishes.
+\nTurn tracing on and off with 'Package Exporter > Trace Commands', or setEnabled().
+'''
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import maya.cmds as cmds
+
+# Modules whose cmds calls are traced
+tracedModules = ['MainWindow', 'UIHelpers', 'Export', 'SceneState', 'Manifest', 'ShapeGrouping', 'FingerprintCache',
+                 'PackageItems']
+
+# The amount of commands and call sites listed in each summary
+summaryCount = 10
+
+enabled = False
+
+# The trace of the outermost action currently running, which nested actions' calls are added to
+currentTrace = None
+
+class actionTrace:
+    '''
+    The cmds calls made during one user action.
+    '''
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.seconds = 0.0
+        # command name -> [calls, seconds]
+        self.commands = {}
+        # (command name, call site) -> calls
+        self.callSites = {}
+
+    def record(self, command, callSite, seconds):
+        entry = self.commands.get(command)
+        if (entry == None):
+            entry = self.commands[command] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+        key = (command, callSite)
+        self.callSites[key] = self.callSites.get(key, 0) + 1
+
+    def summary(self):
+        calls = sum(entry[0] for entry in self.commands.values())
+        commandSeconds = sum(entry[1] for entry in self.commands.values())
+
+        lines = [f"{self.name}: {calls} cmds call(s) taking {commandSeconds:.3f}s of {self.seconds:.3f}s",
+                 f"    {'command':<24}{'calls':>8}{'seconds':>10}"]
+
+        commands = sorted(self.commands.items(), key = lambda item: item[1][1], reverse = True)
+        for command, (count, seconds) in commands[:summaryCount]:
+            lines.append(f"    {command:<24}{count:>8}{seconds:>10.3f}")
+
+        if (len(self.callSites) > 0):
+            lines.append(f"    {'top call sites':<24}{'calls':>8}")
+            callSites = sorted(self.callSites.items(), key = lambda item: item[1], reverse = True)
+            for (command, callSite), count in callSites[:summaryCount]:
+                lines.append(f"    {command:<24}{count:>8}  {callSite}")
+
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.name
+
+class tracedCommands:
+    '''
+    Stands in for the maya.cmds module, recording each call into the current action's trace.
+    '''
+    def __init__(self, module):
+        self.module = module
+
+    def __getattr__(self, name):
+        function = getattr(self.module, name)
+        if (not callable(function)):
+            return function
+
+        def traced(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                if (currentTrace != None):
+                    caller = sys._getframe(1)
+                    callSite = f"{os.path.basename(caller.f_code.co_filename)}:{caller.f_lineno} {caller.f_code.co_name}()"
+                    currentTrace.record(name, callSite, seconds)
+
+        # Cache the wrapper, so later calls don't go through __getattr__
+        setattr(self, name, traced)
+        return traced
+
+def setEnabled(value):
+    '''
+    Turns tracing on or off, by swapping the cmds module of every traced module.
+    '''
+    global enabled
+    enabled = bool(value)
+
+    import importlib
+    replacement = tracedCommands(cmds) if enabled else cmds
+
+    for name in tracedModules:
+        module = importlib.import_module(f"PackageExport.{name}")
+        module.cmds = replacement
+
+    print(f"Command tracing {'enabled' if enabled else 'disabled'}")
+
+def isEnabled():
+    return enabled
+
+@contextmanager
+def action(name):
+    '''
+    Groups the cmds calls made during a user action, and prints them when it finishes. Use as a with statement or
+    a function decorator. Actions run inside another action (e.g. turning off sync select while auto-generating)
+    are part of the outer action.
+    \nDoes nothing while tracing is disabled.
+
+    :param str name: The name of the action, e.g. 'Auto-generate'.
+    '''
+    if (currentTrace != None):
+        yield
+        return
+
+    trace = startTrace(name)
+    try:
+        with resumeTrace(trace):
+            yield
+    finally:
+        finishTrace(trace)
+
+def startTrace(name):
+    '''
+    Starts the trace of an action that runs in several parts (e.g. a time-sliced export). Record each part with
+    resumeTrace(), then print it with finishTrace().
+
+    :returns actionTrace: The trace, or None if tracing is disabled.
+    '''
+    return actionTrace(name) if enabled else None
+
+@contextmanager
+def resumeTrace(trace):
+    '''
+    Records the cmds calls made in a with block into a trace from startTrace(). Does nothing if 'trace' is None.
+    '''
+    global currentTrace
+
+    if (trace == None or currentTrace != None):
+        yield
+        return
+
+    currentTrace = trace
+    try:
+        yield
+    finally:
+        currentTrace = None
+
+def finishTrace(trace):
+    if (trace == None):
+        return
+
+    trace.seconds = time.perf_counter() - trace.start
+    print(trace.summary())
@@ -0,0 +1,284 @@
+'''
+Delta export: instead of rewriting the whole JSON scene, write only what changed since the last export.
+\nA full export (the base scene) also writes a state file, holding a hash of every transform's values.
+Later exports compare against it and write numbered delta files beside the base scene, each holding the packages'
+added, moved and removed transforms. compact() folds the deltas back into the base scene.
+\nDelta file format:
+    {"format": "packageExporterDelta", "version": 1, "base": <base scene filename>, "sequence": <1, 2, ...>,
+     "rootTransform": {...}, "removedPackages": [<fileName>, ...],
+     "packages": [{"fileName", "path", "added": [<transform>, ...], "moved": [<transform>, ...], "removed": [<name>, ...]}]}
+\nTransforms are in the same format as the JSON scene. Deltas are applied to the base scene in sequence order.
+'''
+import hashlib
+import json
+import os
+
+from PackageExport import BinaryScene
+from PackageExport import SceneWriter
+from PackageExport import TransformMath
+
+deltaFormatName = 'packageExporterDelta'
+stateVersion = 1
+
+# Scene formats that can be the base of deltas (binary scenes are rewritten in full)
+baseFormats = ('pretty', 'compact', 'ndjson')
+
+def hashRows(values):
+    '''
+    Returns a short hash of each transform's values in a block (see TransformMath.relativeTo()).
+    '''
+    data = BinaryScene.toBytes(values, '<f8')
+    rowSize = 8 * TransformMath.valuesPerTransform
+
+    return [hashlib.blake2b(data[i : i + rowSize], digest_size = 8).hexdigest() for i in range(0, len(data), rowSize)]
+
+def getDeltaPath(scenePath, sequence):
+    root, _ = os.path.splitext(scenePath)
+    return f"{root}.delta{sequence}.json"
+
+class exportState:
+    '''
+    The state of the last export that deltas are written against: the base scene, the amount of deltas written since,
+    and each package's path and transform hashes.
+    '''
+    def __init__(self, path):
+        '''
+        :param str path: The path of the state file.
+        '''
+        self.path = path
+        self.base = None
+        self.jsonFormat = None
+        self.sequence = 0
+        self.packages = {}
+
+    def load(self):
+        '''
+        Reads the state file. Returns whether it exists and its base scene can still have deltas written against it.
+        '''
+        if (not os.path.isfile(self.path)):
+            return False
+
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (type(data) != dict or data.get('version') != stateVersion):
+            return False
+
+        self.base = data['base']
+        self.jsonFormat = data['format']
+        self.sequence = data['sequence']
+        self.packages = data['packages']
+
+        return os.path.isfile(self.getBasePath())
+
+    def save(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({
+                'version' : stateVersion,
+                'base' : self.base,
+                'format' : self.jsonFormat,
+                'sequence' : self.sequence,
+                'packages' : self.packages
+            }, separators = (',', ':')))
+
+    def getBasePath(self):
+        return os.path.join(os.path.dirname(self.path), self.base)
+
+    def getDeltaPaths(self):
+        return [getDeltaPath(self.getBasePath(), sequence) for sequence in range(1, self.sequence + 1)]
+
+    def startBase(self, scenePath, jsonFormat):
+        '''
+        Resets the state for a new full export to 'scenePath', and deletes the deltas of the previous base scene.
+        '''
+        if (self.base != None):
+            removeFiles(self.getDeltaPaths())
+
+        self.base = os.path.basename(scenePath)
+        self.jsonFormat = jsonFormat
+        self.sequence = 0
+        self.packages = {}
+
+    def discard(self):
+        '''
+        Deletes the state file and the deltas written since the last full export.
+        '''
+        if (self.base != None):
+            removeFiles(self.getDeltaPaths())
+        removeFiles([self.path])
+
+    def recordPackages(self, packages):
+        '''
+        Passes packages through to a scene writer, recording their transform hashes for the next delta export.
+
+        :param packages: An iterable of {'fileName', 'path', 'names', 'values'} dicts (see MainWindow.exportJSON()).
+        '''
+        for package in packages:
+            digests = hashRows(package['values'])
+            self.packages[package['fileName']] = {
+                'path' : package['path'],
+                'items' : dict(zip(package['names'], digests))
+            }
+
+            yield package
+
+def iterWriteDelta(state, rootAttributes, packages):
+    '''
+    Writes the changes since the last export as the next delta file, and updates the state to match.
+    \nPackages are compared one per step. The delta file and the state are only written once the generator finishes,
+    so closing it early leaves the last export's state as it was on disk.
+    If nothing changed, no delta file is written.
+
+    :param exportState state: The state of the last export.
+    :param dict rootAttributes: The root transform's attributes (see MainWindow.transform.attributes).
+    :param packages: An iterable of {'fileName', 'path', 'names', 'values'} dicts (see MainWindow.exportJSON()).
+    :returns tuple[str, int]: The path of the delta file (or None), and the amount of transforms that were added, moved or removed.
+    '''
+    entries = []
+    changes = 0
+    seen = set()
+
+    for package in packages:
+        fileName = package['fileName']
+        seen.add(fileName)
+
+        previous = state.packages.get(fileName, {'path' : None, 'items' : {}})
+        items = dict(zip(package['names'], hashRows(package['values'])))
+        state.packages[fileName] = {'path' : package['path'], 'items' : items}
+
+        flat = package['values'].reshape(-1) if hasattr(package['values'], 'reshape') else package['values']
+        added = []
+        moved = []
+        for i, (name, digest) in enumerate(items.items()):
+            old = previous['items'].get(name)
+            if (old == digest):
+                continue
+
+            attributes = TransformMath.valuesToAttributes(name, flat, i * TransformMath.valuesPerTransform)
+            if (old == None):
+                added.append(attributes)
+            else:
+                moved.append(attributes)
+
+        removed = [name for name in previous['items'] if name not in items]
+
+        # Leave out packages that didn't change at all
+        if (not added and not moved and not removed and previous['path'] == package['path']):
+            yield
+            continue
+
+        changes += len(added) + len(moved) + len(removed)
+        entries.append({
+            'fileName' : fileName,
+            'path' : package['path'],
+            'added' : added,
+            'moved' : moved,
+            'removed' : removed
+        })
+        yield
+
+    removedPackages = [fileName for fileName in state.packages if fileName not in seen]
+    for fileName in removedPackages:
+        changes += len(state.packages.pop(fileName)['items'])
+
+    if (len(entries) <= 0 and len(removedPackages) <= 0):
+        return None, 0
+
+    state.sequence += 1
+    deltaPath = getDeltaPath(state.getBasePath(), state.sequence)
+
+    with open(deltaPath, 'w') as f:
+        f.write(json.dumps({
+            'format' : deltaFormatName,
+            'version' : stateVersion,
+            'base' : state.base,
+            'sequence' : state.sequence,
+            'rootTransform' : rootAttributes,
+            'removedPackages' : removedPackages,
+            'packages' : entries
+        }, separators = (',', ':')))
+
+    state.save()
+    return deltaPath, changes
+
+def readScene(scenePath, jsonFormat):
+    '''
+    Reads a pretty, compact or newline-delimited JSON scene into the same dict as the JSON scene.
+    '''
+    with open(scenePath) as f:
+        if (jsonFormat != 'ndjson'):
+            return json.load(f)
+
+        scene = json.loads(f.readline())
+        scene['packages'] = [json.loads(line) for line in f if line.strip()]
+        return scene
+
+def applyDelta(scene, delta):
+    '''
+    Applies a delta to a scene dict (see readScene()), in place.
+    '''
+    packages = {package['fileName'] : package for package in scene['packages']}
+
+    for fileName in delta['removedPackages']:
+        packages.pop(fileName, None)
+
+    for entry in delta['packages']:
+        package = packages.setdefault(entry['fileName'], {'fileName' : entry['fileName'], 'transforms' : [], 'path' : entry['path']})
+        package['path'] = entry['path']
+
+        transforms = {transform['name'] : transform for transform in package['transforms']}
+        for name in entry['removed']:
+            transforms.pop(name, None)
+        for transform in entry['moved'] + entry['added']:
+            transforms[transform['name']] = transform
+
+        package['transforms'] = list(transforms.values())
+
+    # Packages that lost all their transforms are left out of full exports too
+    scene['rootTransform'] = delta['rootTransform']
+    scene['packages'] = [package for package in packages.values() if len(package['transforms']) > 0]
+
+def compact(statePath):
+    '''
+    Folds the deltas written since the last full export back into the base scene, then deletes them.
+    \nThe rewritten base scene holds the same packages and transforms as a full export would
+    (transforms added since the last full export are at the end of their package).
+
+    :param str statePath: The path of the state file written with the base scene.
+    :returns int: The amount of deltas folded in.
+    '''
+    state = exportState(statePath)
+    if (not state.load()):
+        raise RuntimeError(f"No base scene to compact for {statePath}")
+
+    if (state.sequence <= 0):
+        return 0
+
+    scenePath = state.getBasePath()
+    scene = readScene(scenePath, state.jsonFormat)
+
+    deltaPaths = state.getDeltaPaths()
+    for deltaPath in deltaPaths:
+        with open(deltaPath) as f:
+            applyDelta(scene, json.load(f))
+
+    # Write to a temporary file first, so the base scene isn't lost if writing fails
+    tempPath = f"{scenePath}.tmp"
+    with open(tempPath, 'w') as f:
+        SceneWriter.writeScene(f, scene['rootTransform'], scene['packages'], state.jsonFormat)
+    os.replace(tempPath, scenePath)
+
+    removeFiles(deltaPaths)
+
+    state.sequence = 0
+    state.save()
+
+    return len(deltaPaths)
+
+def removeFiles(paths):
+    for path in paths:
+        if (os.path.isfile(path)):
+            os.remove(path)
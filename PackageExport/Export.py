@@ -0,0 +1,635 @@
+'''
+Export API, independent of the Package Exporter window.
+\nEverything an export needs is passed in: a list of exportPackage objects and an exportSettings object.
+The window builds these from its UI (see MainWindow.export()), and Batch.py builds them from a package definition
+file, so exports can also run headless in mayapy.
+\nExports are split into steps: iterExport() and friends are generators that export one package per step, and
+return their result when they're finished. export() runs every step at once.
+'''
+import json
+import os
+
+import maya.cmds as cmds
+
+from PackageExport import BinaryScene
+from PackageExport import DeltaExport
+from PackageExport import Manifest
+from PackageExport import PackageItems
+from PackageExport import ParallelExport
+from PackageExport import Profiling
+from PackageExport import SceneState
+from PackageExport import SceneWriter
+from PackageExport import TransformMath
+from PackageExport import TransformSampling
+
+definitionVersion = 1
+
+# FBX properties set before exporting, as (label, property, default value)
+fbxProperties = [
+    ("Smoothing Groups", 'Export|IncludeGrp|Geometry|SmoothingGroups', True),
+    ("Smooth Mesh", 'Export|IncludeGrp|Geometry|SmoothMesh', True),
+    ("Split Vertex Normals", 'Export|IncludeGrp|Geometry|expHardEdges', False),
+    ("Triangulate", 'Export|IncludeGrp|Geometry|Triangulate', False),
+    ("Tangents & Binormals", 'Export|IncludeGrp|Geometry|TangentsandBinormals', False),
+
+    ("Skinning", 'Export|IncludeGrp|Animation|Deformation|Skins', True),
+    ("Blendshapes", 'Export|IncludeGrp|Animation|Deformation|Shape', True)
+]
+
+class exportPackage:
+    '''
+    One package to export: its filename, the directory its FBX file is exported to, and its items.
+    '''
+    def __init__(self, fileName, directory, items):
+        '''
+        :param str fileName: The package's filename, without an extension.
+        :param str directory: The directory the package's FBX file is exported to. The JSON scene points to it too.
+        :param itemStore items: The package's items, with up to date values (see PackageItems.itemStore.update()).
+        The first item is the one exported as the package's FBX file.
+        '''
+        self.fileName = fileName
+        self.directory = directory
+        self.items = items
+
+    def getFBXPath(self):
+        return f"{self.directory}/{self.fileName}.fbx"
+
+class exportSettings:
+    '''
+    Settings for an export, equivalent to the 'Export Settings' pane of the window.
+    '''
+    def __init__(self, directory, fileName, fbxEnabled = True, jsonEnabled = True, fbxProperties = None,
+                 forceRebuild = False, workerCount = 0, jsonFormat = 'pretty', deltaEnabled = False, root = None,
+                 profileEnabled = False):
+        '''
+        :param str directory: The directory the JSON scene (and packages without their own directory) are exported to.
+        :param str fileName: The JSON scene's filename, without an extension.
+        :param bool fbxEnabled: Whether to export each package's FBX file.
+        :param bool jsonEnabled: Whether to export the JSON scene.
+        :param list[tuple[str, int]] fbxProperties: Pairs of FBX property and value. Defaults to every property's default value.
+        :param bool forceRebuild: Whether to export every FBX file, even if the export manifest says it's unchanged.
+        :param int workerCount: The amount of mayapy processes to export FBX files with, or 0 to export them in this process.
+        :param str jsonFormat: The format of the JSON scene (see SceneWriter.formats).
+        :param bool deltaEnabled: Whether to only write what changed since the last JSON export (see DeltaExport).
+        :param dict root: The root transform's attributes (see getRootAttributes()), or None to export transforms as they are in the scene.
+        :param bool profileEnabled: Whether to trace peak memory and write a profile report beside the JSON scene (see Profiling).
+        '''
+        self.directory = directory
+        self.fileName = fileName
+        self.fbxEnabled = fbxEnabled
+        self.jsonEnabled = jsonEnabled
+        self.fbxProperties = fbxProperties if fbxProperties != None else getDefaultFBXProperties()
+        self.forceRebuild = forceRebuild
+        self.workerCount = workerCount
+        self.jsonFormat = jsonFormat
+        self.deltaEnabled = deltaEnabled
+        self.root = root
+        self.profileEnabled = profileEnabled
+
+    def getPath(self, extension):
+        '''
+        Returns the path of a file beside the JSON scene, e.g. getPath('json') for the JSON scene itself.
+        '''
+        return f"{self.directory}/{self.fileName}.{extension}"
+
+    def getRootAttributes(self):
+        # Without a root transform, transforms are exported as they are in the maya scene
+        if (self.root == None):
+            return TransformMath.valuesToAttributes(None, TransformMath.identityValues)
+        return self.root
+
+def getDefaultFBXProperties():
+    return [(fbxProperty, int(value)) for _, fbxProperty, value in fbxProperties]
+
+def getRootAttributes(name):
+    '''
+    Returns the attributes of a transform for use as the root transform.
+    \nSince the root transform is for the positions of objects, its rotation and scale are reset.
+
+    :param str name: The name of the transform in the maya scene.
+    :returns dict: The transform's attributes (see MainWindow.transform.attributes).
+    '''
+    values, missing = TransformSampling.sampleTransforms([name])
+    if (len(missing) > 0):
+        raise ValueError(f"Root transform {name} doesn't exist")
+
+    attributes = TransformMath.valuesToAttributes(name, values)
+    attributes['rotate'] = [0, 0, 0]
+    attributes['scale'] = [1, 1, 1]
+    return attributes
+
+def validate(packages, settings):
+    '''
+    Checks whether an export can be run, the same way for the window and Batch.py.
+    \nErrors stop the export. Warnings are things the export will leave out or may get wrong, which the window asks
+    about before continuing.
+
+    :returns tuple[list[str], list[str]]: The errors and the warnings, as messages to show to the user.
+    '''
+    errors = []
+    warnings = []
+
+    if (settings.fileName == ""):
+        errors.append("The JSON scene has no filename.")
+
+    if (not os.path.isdir(settings.directory)):
+        errors.append(f"Export directory \"{settings.directory}\" is invalid or does not exist.")
+
+    if (settings.jsonFormat not in SceneWriter.formats):
+        errors.append(f"Unknown JSON format {settings.jsonFormat}.")
+
+    # Packages without their own directory are exported to the settings' directory, which is checked above
+    for pack in packages:
+        if (pack.directory != settings.directory and not os.path.isdir(pack.directory)):
+            errors.append(f"Export directory \"{pack.directory}\" of package \"{pack.fileName}\" is invalid or does not exist.")
+
+    names = [pack.fileName for pack in packages if pack.fileName != ""]
+    if (len(names) != len(set(names))):
+        errors.append("More than one package has the same filename.")
+
+    if (any(len(pack.items) <= 0 for pack in packages)):
+        warnings.append("One or more packages have no items. These will not be exported.")
+
+    if (any(pack.fileName == "" for pack in packages)):
+        warnings.append("One or more packages have no filename. These will not be exported.")
+
+    if (settings.jsonEnabled and settings.root == None):
+        warnings.append("The root transform has not been set. This may cause issues when loading the JSON scene somewhere else.")
+
+    return errors, warnings
+
+def runSteps(steps):
+    '''
+    Runs a generator of export steps (e.g. iterExport()) to completion, and returns its result.
+    '''
+    while (True):
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def export(packages, settings, progress = None, profile = None):
+    '''
+    Exports the packages' FBX files and the JSON scene.
+    \nThe time spent in each phase is printed when the export finishes. If settings.profileEnabled is set, peak memory
+    is traced too and the profile is written as a report beside the JSON scene.
+
+    :param list[exportPackage] packages: The packages to export.
+    :param exportSettings settings: The export settings.
+    :param mainProgressBar progress: Optional progress bar, stepped once per package. Cancelling it stops the export
+    after the current package.
+    :param exportProfile profile: Optional profile to record into, e.g. with phases from before the export.
+    :returns list[str]: The filenames of packages whose FBX export failed or was cancelled.
+    '''
+    return runSteps(iterExport(packages, settings, progress, profile))
+
+def iterExport(packages, settings, progress = None, profile = None):
+    '''
+    Generator version of export(), which exports one package per step.
+    '''
+    if (profile == None):
+        profile = Profiling.exportProfile('Export', settings.profileEnabled)
+
+    failed = []
+
+    profile.start()
+    try:
+        if (settings.fbxEnabled):
+            failed = yield from profile.iterPhase('fbx', iterExportFBX(packages, settings, progress, profile))
+        if (settings.jsonEnabled and progress and progress.isCancelled()):
+            print("JSON Export cancelled")
+        elif (settings.jsonEnabled):
+            yield from profile.iterPhase('json', iterExportJSON(packages, settings, profile, progress))
+    finally:
+        profile.stop()
+
+    print(profile.summary())
+    if (settings.profileEnabled):
+        profile.writeReport(settings.getPath('profile.json'))
+
+    return failed
+
+def iterExportFBX(packages, settings, progress = None, profile = None):
+    '''
+    Exports each package's FBX file, one package per step.
+    \nPackages whose hash matches the export manifest are skipped (see Manifest.exportManifest) unless
+    settings.forceRebuild is enabled.
+
+    :param exportProfile profile: Optional profile to record the time spent on each package into.
+    :returns list[str]: The filenames of packages whose FBX export failed or was cancelled.
+    '''
+    if (profile == None):
+        profile = Profiling.exportProfile('FBX Export')
+
+    if (settings.workerCount > 0):
+        return (yield from iterExportFBXParallel(packages, settings, progress, profile))
+
+    for fbxProperty, value in settings.fbxProperties:
+        cmds.FBXProperty(fbxProperty, '-v', value)
+
+    manifest = Manifest.exportManifest(settings.getPath('manifest.json'))
+    failed = []
+
+    print(f"Starting FBX Export to {settings.directory}...")
+
+    previousSelection = cmds.ls(selection = True, long = True)
+    try:
+        for i, pack in enumerate(packages):
+            if (progress):
+                if (progress.isCancelled()):
+                    print("FBX Export cancelled")
+                    failed += [other.fileName for other in packages[i:] if len(other.items) > 0 and other.fileName != ""]
+                    break
+                progress.step()
+
+            if (len(pack.items) <= 0):
+                print(f"No items in {pack.fileName} package, skipping...")
+                continue
+
+            if (pack.fileName == ""):
+                print("Skipped exporting package due to empty filename")
+                continue
+
+            directory = pack.getFBXPath()
+
+            with profile.phase('fbx/hash', pack.fileName):
+                digest = Manifest.hashPackage(pack.items.names[0], settings.fbxProperties, directory)
+            if (not settings.forceRebuild and manifest.isUpToDate(pack.fileName, digest, directory)):
+                print(f"{pack.fileName} package is unchanged, skipping...")
+                manifest.skip(pack.fileName)
+                continue
+
+            # Exporting moves the package's mesh and moves it back, so none of it needs to be undoable
+            with profile.phase('fbx/export', pack.fileName), SceneState.undoDisabled():
+                # Reset transforms so offsets/rotation arent baked into the mesh, then put them back after exporting
+                # This helps for instancing later
+                with SceneState.neutralTransform(pack.items.names[0]) as node:
+                    cmds.select(node, replace = True)
+
+                    print(f"Exporting {pack.fileName} package to {directory}")
+                    # -s makes it export selected instead of export all
+                    cmds.FBXExport("-file", directory, "-s")
+
+                profile.addOutput(directory, pack.fileName)
+
+            manifest.record(pack.fileName, digest, directory)
+            yield
+    finally:
+        # Keep what was exported before any error, so it isn't exported again
+        manifest.save()
+
+        if (previousSelection):
+            cmds.select(previousSelection, replace = True)
+        else:
+            cmds.select(clear = True)
+
+    print(f"Finished FBX Export to {settings.directory}. {manifest.summary()}.")
+    return failed
+
+def iterExportFBXParallel(packages, settings, progress = None, profile = None):
+    '''
+    Exports each package's FBX file through a pool of background mayapy processes (see ParallelExport.workerPool).
+    \nEach package's representative mesh is written to a temporary scene (one package per step), which a worker opens
+    and exports with the FBX settings. While the workers run, each step polls them for results without blocking,
+    so maya stays responsive and the export can be cancelled between polls.
+
+    :returns list[str]: The filenames of packages whose FBX export failed or was cancelled.
+    '''
+    import shutil
+    import tempfile
+
+    if (profile == None):
+        profile = Profiling.exportProfile('FBX Export')
+
+    manifest = Manifest.exportManifest(settings.getPath('manifest.json'))
+    digests = {}
+
+    print(f"Starting parallel FBX Export to {settings.directory} with {settings.workerCount} worker(s)...")
+
+    tempDir = tempfile.mkdtemp(prefix = 'packageExportScenes_')
+    cancelled = []
+    try:
+        jobs = []
+        previousSelection = cmds.ls(selection = True, long = True)
+
+        try:
+            for i, pack in enumerate(packages):
+                if (progress and progress.isCancelled()):
+                    print("FBX Export cancelled before all scenes were written")
+                    cancelled = [remaining.fileName for remaining in packages[i:] if len(remaining.items) > 0]
+                    break
+
+                if (len(pack.items) <= 0):
+                    print(f"No items in {pack.fileName} package, skipping...")
+                    continue
+
+                if (pack.fileName == ""):
+                    print("Skipped exporting package due to empty filename")
+                    continue
+
+                output = pack.getFBXPath()
+
+                with profile.phase('fbx/hash', pack.fileName):
+                    digests[pack.fileName] = Manifest.hashPackage(pack.items.names[0], settings.fbxProperties, output)
+                if (not settings.forceRebuild and manifest.isUpToDate(pack.fileName, digests[pack.fileName], output)):
+                    print(f"{pack.fileName} package is unchanged, skipping...")
+                    manifest.skip(pack.fileName)
+                    if (progress):
+                        progress.step()
+                    continue
+
+                scene = os.path.join(tempDir, f"{pack.fileName}.mb").replace('\\', '/')
+                with profile.phase('fbx/write scenes', pack.fileName):
+                    cmds.select(pack.items.names[0], replace = True)
+                    cmds.file(scene, exportSelected = True, type = 'mayaBinary', force = True, preserveReferences = False,
+                              channels = False, constraints = False, expressions = False, constructionHistory = True, shader = True)
+
+                jobs.append({
+                    'name' : pack.fileName,
+                    'scene' : scene,
+                    'node' : pack.items.names[0],
+                    'output' : output
+                })
+                yield
+        finally:
+            if (previousSelection):
+                cmds.select(previousSelection, replace = True)
+            else:
+                cmds.select(clear = True)
+
+        results = []
+        if (progress and progress.isCancelled()):
+            cancelled = [job['name'] for job in jobs] + cancelled
+            jobs = []
+
+        if (len(jobs) > 0):
+            pool = ParallelExport.workerPool(workerCount = settings.workerCount)
+            try:
+                with profile.phase('fbx/workers'):
+                    pool.start(jobs, settings.fbxProperties)
+
+                while (True):
+                    with profile.phase('fbx/workers'):
+                        running = pool.poll(progress, timeout = 0.01)
+                    if (not running):
+                        break
+                    yield
+            finally:
+                pool.close()
+
+            results = pool.getResults()
+    finally:
+        shutil.rmtree(tempDir, ignore_errors = True)
+
+    failed = []
+    for job, result in zip(jobs, results):
+        if (result['status'] == 'done'):
+            print(f"Exported {job['name']} package to {job['output']}")
+            manifest.record(job['name'], digests[job['name']], job['output'])
+            profile.addOutput(job['output'], job['name'])
+        else:
+            print(f"Package {job['name']} {result['status']}: {result['message']}")
+            failed.append(job['name'])
+    failed.extend(cancelled)
+
+    manifest.save()
+
+    print(f"Finished parallel FBX Export to {settings.directory}. "
+          f"{manifest.summary()}, {len(failed)} failed or cancelled.")
+    return failed
+
+def iterExportJSON(packages, settings, profile = None, progress = None):
+    '''
+    Exports the JSON scene (or the changes since the last export, if settings.deltaEnabled is set).
+    \nThe scene is streamed to the file as it's written, one package per step.
+
+    :param exportProfile profile: Optional profile to record the time spent on each package into.
+    :param mainProgressBar progress: Optional progress bar, stepped once per package. Cancelling it stops the export
+    after the current package, and deletes the partly written scene.
+    :returns str: The path of the file that was written, or None if nothing changed since the last export
+    (or it was cancelled).
+    '''
+    if (profile == None):
+        profile = Profiling.exportProfile('JSON Export')
+
+    jsonFormat = settings.jsonFormat
+    fullPath = settings.getPath(SceneWriter.extensions[jsonFormat])
+
+    print(f"Starting JSON Export to {fullPath}...")
+
+    rootAttributes = settings.getRootAttributes()
+    rootValues = TransformMath.attributesToValues(rootAttributes)
+
+    def iterPackages():
+        for pack in packages:
+            if (len(pack.items) <= 0):
+                print(f"No items in {pack.fileName} package. It will be left out of the scene JSON.")
+                continue
+
+            if (pack.fileName == ""):
+                print(f"Package is missing a filename. It will be left out of the scene JSON.")
+                continue
+
+            # Offset the whole package at once, then convert to dicts as they're written
+            with profile.phase('json/transforms', pack.fileName):
+                relativeValues = TransformMath.relativeTo(pack.items.getValues(), rootValues)
+
+            # Text formats write 'transforms', binary formats write 'names' and 'values'
+            yield {
+                "fileName" : pack.fileName,
+                "transforms" : TransformMath.iterAttributes(pack.items.names, relativeValues),
+                "path" : f"{pack.directory}/{pack.fileName}",
+                "names" : pack.items.names,
+                "values" : relativeValues
+            }
+
+    def iterWrite(steps):
+        '''
+        Runs a scene writer one package per step, until it finishes or the export is cancelled.
+        :returns tuple[bool, object]: Whether the writer finished, and its result.
+        '''
+        while (True):
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return True, stop.value
+
+            if (progress):
+                progress.step()
+                if (progress.isCancelled()):
+                    steps.close()
+                    return False, None
+            yield
+
+    state = DeltaExport.exportState(settings.getPath('state.json'))
+    hasBase = state.load() and state.base == os.path.basename(fullPath) and state.jsonFormat == jsonFormat
+
+    if (settings.deltaEnabled and hasBase):
+        finished, result = yield from profile.iterPhase('json/delta',
+                                                         iterWrite(DeltaExport.iterWriteDelta(state, rootAttributes, iterPackages())))
+        if (not finished):
+            print("JSON Export cancelled, the last export's state was kept.")
+            return None
+
+        deltaPath, changes = result
+        profile.addOutput(deltaPath)
+
+        if (deltaPath == None):
+            print(f"Nothing changed since the last export, {fullPath} is up to date.")
+        else:
+            print(f"Finished delta JSON Export to {deltaPath}. {changes} transform(s) added, moved or removed.")
+        yield
+        return deltaPath
+
+    # A full export becomes the new base for deltas. Keep the state in step with it once delta export has been used.
+    scenePackages = iterPackages()
+    if (jsonFormat not in DeltaExport.baseFormats):
+        if (settings.deltaEnabled):
+            print(f"Changes only export isn't supported for {SceneWriter.formats[jsonFormat]} scenes, writing the full scene.")
+        state.discard()
+        state = None
+    elif (settings.deltaEnabled or state.base != None):
+        state.startBase(fullPath, jsonFormat)
+        scenePackages = state.recordPackages(scenePackages)
+    else:
+        state = None
+
+    # 'w' for write. Transforms are converted as they're written, so their time is part of 'json/write'
+    with open(fullPath, 'w') as f:
+        if (jsonFormat in SceneWriter.binaryTypes):
+            writer = BinaryScene.iterWriteScene(f, settings.getPath('bin'), rootAttributes, scenePackages, SceneWriter.binaryTypes[jsonFormat])
+        else:
+            writer = SceneWriter.iterWriteScene(f, rootAttributes, scenePackages, jsonFormat)
+
+        finished, _ = yield from profile.iterPhase('json/write', iterWrite(writer))
+
+    if (not finished):
+        DeltaExport.removeFiles([fullPath, settings.getPath('bin')] if jsonFormat in SceneWriter.binaryTypes else [fullPath])
+        print(f"JSON Export cancelled, {fullPath} was not written.")
+        return None
+
+    profile.addOutput(fullPath)
+    if (jsonFormat in SceneWriter.binaryTypes):
+        profile.addOutput(settings.getPath('bin'))
+
+    if (state != None):
+        state.save()
+
+    print(f"Finished JSON Export to {fullPath}...")
+    yield
+    return fullPath
+
+#region Package Definitions
+
+def readDefinition(path):
+    '''
+    Reads a package definition file: a JSON description of a scene and its packages, for exporting without the window.
+    \nThe file is a JSON object with:
+    - 'scene', optional: the maya scene to open, relative to the definition file.
+    - 'fileName': the JSON scene's filename.
+    - 'root', optional: the name of the root transform.
+    - 'fbx', 'json', 'jsonFormat', 'deltaEnabled', 'forceRebuild', 'workers', optional: see exportSettings.
+    - 'fbxProperties', optional: an object of FBX property and value, overriding the defaults.
+    - 'packages': a list of {'fileName', 'items', 'uuids', 'directory'} objects. 'items' is a list of transform names.
+    'uuids' is optional, the UUIDs of the items in the same order, so items renamed since are still found.
+    'directory' is optional, relative to the output directory.
+
+    :param str path: The path of the definition file.
+    :returns dict: The definition, with 'scene' made absolute.
+    '''
+    with open(path) as f:
+        definition = json.load(f)
+
+    if (type(definition) != dict or definition.get('version', definitionVersion) != definitionVersion):
+        raise ValueError(f"{path} is not a version {definitionVersion} package definition")
+
+    if (definition.get('scene')):
+        definition['scene'] = os.path.join(os.path.dirname(os.path.abspath(path)), definition['scene'])
+
+    return definition
+
+def fromDefinition(definition, directory):
+    '''
+    Builds the packages and settings described by a package definition (see readDefinition()) from the open scene.
+    \nItems that don't exist in the scene are left out of their package.
+
+    :param dict definition: The package definition.
+    :param str directory: The output directory.
+    :returns tuple[list[exportPackage], exportSettings]: The packages and settings to export with.
+    '''
+    properties = dict(getDefaultFBXProperties())
+    properties.update(definition.get('fbxProperties', {}))
+
+    root = definition.get('root')
+
+    settings = exportSettings(directory, definition['fileName'],
+                              fbxEnabled = definition.get('fbx', True),
+                              jsonEnabled = definition.get('json', True),
+                              fbxProperties = [(fbxProperty, int(value)) for fbxProperty, value in properties.items()],
+                              forceRebuild = definition.get('forceRebuild', False),
+                              workerCount = definition.get('workers', 0),
+                              jsonFormat = definition.get('jsonFormat', 'pretty'),
+                              deltaEnabled = definition.get('deltaEnabled', False),
+                              root = getRootAttributes(root) if root else None)
+
+    packages = []
+    for entry in definition['packages']:
+        items = PackageItems.itemStore()
+        items.extend(entry['items'], entry.get('uuids'))
+        items.resolve()
+
+        missing = items.update()
+        if (len(missing) > 0):
+            print(f"{len(missing)} item(s) of package {entry['fileName']} don't exist in the scene, leaving them out: {', '.join(missing[:10])}")
+            items.removeMany(missing)
+
+        packages.append(exportPackage(entry['fileName'], os.path.join(directory, entry.get('directory', '')).rstrip('/\\'), items))
+
+    return packages, settings
+
+def writeDefinition(path, packages, settings, scene = None):
+    '''
+    Writes a package definition file (see readDefinition()) that exports the same packages with the same settings.
+    \nPackage directories are written relative to settings.directory where possible.
+
+    :param str path: The path of the definition file.
+    :param list[exportPackage] packages: The packages.
+    :param exportSettings settings: The export settings.
+    :param str scene: Optional path of the maya scene the packages are in.
+    '''
+    entries = []
+    for pack in packages:
+        entry = {'fileName' : pack.fileName, 'items' : list(pack.items.names)}
+        if (any(uuid != None for uuid in pack.items.uuids)):
+            entry['uuids'] = list(pack.items.uuids)
+
+        try:
+            directory = os.path.relpath(pack.directory, settings.directory)
+        except ValueError:
+            # On a different drive
+            directory = pack.directory
+
+        if (directory != '.'):
+            entry['directory'] = directory.replace('\\', '/')
+
+        entries.append(entry)
+
+    definition = {
+        'version' : definitionVersion,
+        'scene' : scene,
+        'fileName' : settings.fileName,
+        'root' : settings.root['name'] if settings.root else None,
+        'fbx' : settings.fbxEnabled,
+        'json' : settings.jsonEnabled,
+        'jsonFormat' : settings.jsonFormat,
+        'deltaEnabled' : settings.deltaEnabled,
+        'forceRebuild' : settings.forceRebuild,
+        'workers' : settings.workerCount,
+        'fbxProperties' : dict(settings.fbxProperties),
+        'packages' : entries
+    }
+
+    with open(path, 'w') as f:
+        f.write(json.dumps(definition, indent = 4))
+
+#endregion Package Definitions
@@ -0,0 +1,71 @@
+'''
+Worker process for ParallelExport.workerPool. Run with mayapy:
+\n    mayapy FBXWorker.py <job file>
+\nEach job opens a temporary scene holding one package's representative mesh, moves it back to the origin and exports it
+as an FBX file. Results are reported as JSON lines on stdout (see ParallelExport.reportResult()).
+'''
+import json
+import os
+import sys
+
+# Allow 'PackageExport' to be imported when this file is run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PackageExport.ParallelExport import reportResult
+
+def applyProperties(properties):
+    '''
+    Applies FBX properties (see settingsUI.fbxSettingsLayout.getProperties()) before exporting.
+    '''
+    import maya.cmds as cmds
+
+    for fbxProperty, value in properties:
+        cmds.FBXProperty(fbxProperty, '-v', value)
+
+def runJob(job, properties):
+    import maya.cmds as cmds
+
+    cmds.file(job['scene'], open = True, force = True)
+
+    # Some FBX properties are reset when a scene is opened
+    applyProperties(properties)
+
+    # The node keeps its full path if its parents were exported with it, otherwise it's at the top of the scene
+    node = cmds.ls(job['node'], long = True, type = 'transform')
+    if (not node):
+        node = cmds.ls(job['node'].split('|')[-1], long = True, type = 'transform')
+    if (not node):
+        raise RuntimeError(f"{job['node']} was not found in {job['scene']}")
+
+    # Reset transforms so offsets/rotation arent baked into the mesh. Like the serial export, this falls back to a
+    # duplicate if the values are locked or connected (see SceneState.neutralTransform())
+    from PackageExport import SceneState
+
+    with SceneState.undoDisabled(), SceneState.neutralTransform(node[0]) as neutral:
+        cmds.select(neutral, replace = True)
+
+        # -s makes it export selected instead of export all
+        cmds.FBXExport("-file", job['output'], "-s")
+
+def main(jobFile):
+    import maya.standalone
+    maya.standalone.initialize(name = 'python')
+
+    import maya.cmds as cmds
+    if (not cmds.pluginInfo('fbxmaya', query = True, loaded = True)):
+        cmds.loadPlugin('fbxmaya', quiet = True)
+
+    with open(jobFile) as f:
+        data = json.load(f)
+
+    for job in data['jobs']:
+        try:
+            runJob(job, data['properties'])
+            reportResult(job['name'], 'done')
+        except Exception as e:
+            reportResult(job['name'], 'failed', str(e))
+
+    maya.standalone.uninitialize()
+
+if __name__ == '__main__':
+    main(sys.argv[1])
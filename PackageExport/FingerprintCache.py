@@ -0,0 +1,194 @@
+import maya.cmds as cmds
+
+from PackageExport import SceneState
+from PackageExport import SceneWatcher
+
+class fingerprintCache:
+    '''
+    Cache of shape fingerprints (see ShapeGrouping.getFingerprint()), keyed by the UUID of each shape node.
+    \nShapes are watched for edits (see SceneWatcher.shapeWatcher) from when their entry is stored or checked, so the
+    entries of shapes that haven't been edited since are reused without reading their meshes.
+    \nEach entry also stores a token made of the shape's topology counts and a checksum of its topology (see
+    ShapeGrouping.getShapeToken()). The entries of shapes that weren't watched (e.g. loaded from the scene) or have
+    been edited are only reused while the shape's token still matches, so shapes with new topology are fingerprinted again.
+    \nThe cache is saved to (and loaded from) a network node in the scene, so it persists with the scene file.
+    '''
+
+    nodeName = 'packageExporterCache'
+    attributeName = 'fingerprints'
+    version = 3
+
+    def __init__(self, maxSize = 200000):
+        '''
+        :param int maxSize: The maximum amount of entries. The least recently used entries are evicted first.
+        '''
+        from collections import OrderedDict
+
+        self.entries = OrderedDict()
+        self.maxSize = maxSize
+        self.modified = False
+        self.watcher = SceneWatcher.shapeWatcher()
+
+        # The data last loaded from or saved to the scene (see load())
+        self.data = None
+
+        self.resetCounters()
+
+    def resetCounters(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def getUnchanged(self, uuid):
+        '''
+        Returns the cached fingerprint of a shape that has been watched since it was cached and hasn't been edited,
+        without reading its mesh. Returns None otherwise, in which case the shape's token has to be checked with get().
+
+        :param str uuid: The UUID of the shape node.
+        :returns tuple: The cached fingerprint.
+        '''
+        if (self.watcher.isDirty(uuid)):
+            return None
+
+        entry = self.entries.get(uuid)
+        if (entry == None):
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(uuid)
+        return entry[1]
+
+    def get(self, uuid, token):
+        '''
+        Returns the cached fingerprint of a shape, or None if it isn't cached or the shape has changed since.
+
+        :param str uuid: The UUID of the shape node.
+        :param tuple token: The shape's current token.
+        :returns tuple: The cached fingerprint.
+        '''
+        entry = self.entries.get(uuid)
+
+        if (entry == None or entry[0] != token):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(uuid)
+        self.watch(uuid)
+        return entry[1]
+
+    def set(self, uuid, token, fingerprint):
+        '''
+        Stores the fingerprint of a shape, evicting the least recently used entries if the cache is full.
+
+        :param str uuid: The UUID of the shape node.
+        :param tuple token: The shape's current token.
+        :param tuple fingerprint: The shape's fingerprint.
+        '''
+        self.entries[uuid] = (token, fingerprint)
+        self.entries.move_to_end(uuid)
+        self.modified = True
+        self.watch(uuid)
+
+        while (len(self.entries) > self.maxSize):
+            self.entries.popitem(last = False)
+            self.evictions += 1
+
+    def watch(self, uuid):
+        '''
+        Watches a shape for edits from now on, after its entry has been stored or checked against its token.
+        '''
+        if (uuid not in self.watcher.callbacks):
+            self.watcher.watch([uuid])
+        self.watcher.clean([uuid])
+
+    def clear(self):
+        self.entries.clear()
+        self.modified = True
+
+    def load(self):
+        '''
+        Replaces the cache's entries with the ones saved in the scene. If the scene has no saved cache, the cache is cleared.
+        \nIf the scene holds what this cache last loaded or saved, its entries (and the shapes watched since) are kept.
+        '''
+        import base64
+        import json
+        import zlib
+
+        data = None
+        if (cmds.ls(self.nodeName, type = 'network')
+            and cmds.attributeQuery(self.attributeName, node = self.nodeName, exists = True)):
+            data = cmds.getAttr(f"{self.nodeName}.{self.attributeName}")
+
+        if (data and data == self.data):
+            return
+
+        self.entries.clear()
+        self.modified = False
+        self.watcher.clear()
+        self.data = data
+
+        if (not data):
+            return
+
+        try:
+            saved = json.loads(zlib.decompress(base64.b64decode(data)))
+        except (ValueError, zlib.error):
+            print("Fingerprint cache in the scene could not be read, it will be rebuilt.")
+            return
+
+        if (saved.get('version') != self.version):
+            return
+
+        for uuid, token, fingerprint in saved['entries'][-self.maxSize:]:
+            self.entries[uuid] = (toTuple(token), toTuple(fingerprint))
+
+    def save(self, force = False):
+        '''
+        Saves the cache's entries to a network node in the scene, creating the node if it doesn't exist.
+        \nThe cache isn't part of the user's work, so writing it isn't added to the undo queue and doesn't mark the
+        scene as modified. It's saved with the scene the next time the user saves.
+        :param bool force: Save even if nothing has changed since the cache was loaded.
+        '''
+        if (not self.modified and not force):
+            return
+
+        import base64
+        import json
+        import zlib
+
+        saved = {
+            'version' : self.version,
+            'entries' : [[uuid, token, fingerprint] for uuid, (token, fingerprint) in self.entries.items()]
+        }
+        data = base64.b64encode(zlib.compress(json.dumps(saved, separators = (',', ':')).encode())).decode()
+
+        sceneModified = cmds.file(query = True, modified = True)
+        with SceneState.undoDisabled():
+            if (not cmds.ls(self.nodeName, type = 'network')):
+                cmds.createNode('network', name = self.nodeName, skipSelect = True)
+            if (not cmds.attributeQuery(self.attributeName, node = self.nodeName, exists = True)):
+                cmds.addAttr(self.nodeName, longName = self.attributeName, dataType = 'string')
+
+            cmds.setAttr(f"{self.nodeName}.{self.attributeName}", data, type = 'string')
+        cmds.file(modified = sceneModified)
+        self.data = data
+        self.modified = False
+
+    def summary(self):
+        '''
+        :returns str: The cache's hit/miss counters, for printing to the script editor.
+        '''
+        return f"Fingerprint cache: {self.hits} hit(s), {self.misses} miss(es), " \
+               f"{self.evictions} eviction(s), {len(self.entries)}/{self.maxSize} entries"
+
+    def __len__(self):
+        return len(self.entries)
+
+def toTuple(value):
+    '''
+    Recursively converts lists (e.g. loaded from JSON) to tuples, so they can be compared to and hashed like fingerprints.
+    '''
+    if (type(value) == list):
+        return tuple(toTuple(item) for item in value)
+    return value
@@ -1,5 +1,15 @@
 import maya.cmds as cmds
 from PackageExport.UIHelpers import *
+from PackageExport import ShapeGrouping
+from PackageExport import FingerprintCache
+from PackageExport import TransformSampling
+from PackageExport import PackageItems
+from PackageExport import SceneWriter
+from PackageExport import DeltaExport
+from PackageExport import Export
+from PackageExport import Profiling
+from PackageExport import CommandTracer
+from PackageExport import SceneWatcher
 
 # add icon = addCreateGeneric_100.png
 # add icon = newLayerEmpty.png
@@ -30,79 +40,116 @@ packEditorPane = None
 global syncSelectEnabled
 syncSelectEnabled = False
 
+# The time-sliced export currently running, if any (see export()). Not reset by Create(), since it outlives the window
+global activeExport
+activeExport = None
+
+# Reverse index of which package(s) each scene object is in
+global objectIndex
+objectIndex = PackageItems.packageIndex()
+
+# Which packaged transforms have changed since they were last sampled. Cleared by Create(), along with the packages
+global watcher
+watcher = SceneWatcher.sceneWatcher()
+
+# Not reset by Create(), since the cache is loaded from the scene rather than the window
+global shapeCache
+shapeCache = FingerprintCache.fingerprintCache()
+
+@CommandTracer.action('Auto-generate')
 def autoGeneratePackages(*args):
     '''
     Automatically generates packages by looking through the scene for similar shapes.
     \nNote that this process can easily mistake objects to be similar, especially those with applied transforms.
     '''
     
-    global currentPackage
     global packManagerPane
     global packEditorPane
+    global settingsPane
+    global shapeCache
 
     # Turn off sync select
     packEditorPane.syncIcon.setSyncSelect(False)
 
-    # Get all transforms
-    allTransforms = cmds.ls(long = True, type = 'transform', visible = True)
-    # convert to shapes, so there's 1 shape per transform (there can be more than 1, which leads to duplicates in the package list)
-    allShapes = cmds.filterExpand(allTransforms, fullPath = True, selectionMask = 12)
+    profileEnabled = settingsPane.getProfileEnabled()
+    profile = Profiling.exportProfile('Auto-generate', profileEnabled)
+    profile.start()
 
-    if (allShapes == None):
-        return
+    try:
+        with profile.phase('find shapes'):
+            # Get all transforms
+            allTransforms = cmds.ls(long = True, type = 'transform', visible = True)
+            # convert to shapes, so there's 1 shape per transform (there can be more than 1, which leads to duplicates in the package list)
+            allShapes = cmds.filterExpand(allTransforms, fullPath = True, selectionMask = 12)
 
-    # Initialise progress bar. Progress is calculated based on the amount of shapes that have been checked in the scene.
-    import maya.mel as mel
-    gMainProgressBar = mel.eval('$tmp = $gMainProgressBar')
-    cmds.progressBar(gMainProgressBar, edit = True, beginProgress = True,
-                     isInterruptable = True, status = 'Auto-generating packages...',
-                     maxValue = len(allShapes))
+        if (allShapes == None):
+            return
 
-    for _ in range(len(allShapes)):
-        if (cmds.progressBar(gMainProgressBar, query = True, isCancelled = True)):
-            break
-        
-        if (len(allShapes) <= 0):
-            break
+        # Initialise progress bar. Progress is calculated based on the amount of shapes that have been checked for instancing,
+        # fingerprinted and grouped.
+        progress = mainProgressBar('Auto-generating packages...', len(allShapes) * 3)
 
-        # Add new package
-        packManagerPane.setCurrentPackage(packManagerPane.addPackage())
+        # Reload the fingerprint cache from the scene, so only shapes that changed since the last run are fingerprinted
+        with profile.phase('load cache'):
+            shapeCache.load()
+            shapeCache.resetCounters()
 
-        # Take a shape from the list to base the package off of
-        packageShapes = [allShapes.pop()]
+        # Work out every package before touching the UI
+        with profile.phase('group shapes'):
+            groups = ShapeGrouping.findPackageGroups(allShapes, progress, shapeCache)
 
-        # Update the progress bar since there's one less shape to iterate through
-        cmds.progressBar(gMainProgressBar, edit = True, step = 1)
+        with profile.phase('save cache'):
+            shapeCache.save()
+        print(shapeCache.summary())
 
-        # Iterate through the rest of the list
-        i = 0
-        for _ in range(len(allShapes)):
-            if (cmds.progressBar(gMainProgressBar, query = True, isCancelled = True)):
-                break
-            if (i >= len(allShapes)):
-                break
+        progress.setStatus('Creating packages...')
+        with profile.phase('create packages'):
+            packManagerPane.addPackages(groups)
+            packManagerPane.setCurrentPackage(packManagerPane.packages[0])
 
-            # Check if they're similar based on 'Face Descriptions' (i.e. face topology, edge count) and based on UV sets
-            similar = cmds.polyCompare(packageShapes[0], allShapes[i], faceDesc = True, uvSets = True) == 0
+        with profile.phase('watch items'):
+            syncWatcher()
+        progress.end()
+    finally:
+        profile.stop()
 
-            # If the shape is similar, add it to the package and remove it from the list
-            if (similar):
-                shape = allShapes.pop(i)
-                packageShapes.append(shape)
+    print(profile.summary())
 
-                # Update the progress bar since there's one less shape to iterate through
-                cmds.progressBar(gMainProgressBar, edit = True, step = 1)
-            else:
-                # Only increment i when a shape doesn't match, so we don't skip past things accidentally when removing items
-                i += 1
-        
-        # Get transforms for package shapes
-        for shapeTransform in cmds.listRelatives(packageShapes, parent = True, fullPath = True):
-            currentPackage.items.append(transform(shapeTransform))
-        currentPackage.nameField.setName(str(currentPackage.items[0]))
+    if (profileEnabled):
+        import os
+
+        # Written beside the JSON scene, if the export directory is set
+        directory = settingsPane.dirField.directory
+        if (os.path.isdir(directory) and settingsPane.fileName.text != ""):
+            profile.writeReport(f"{directory}/{settingsPane.fileName.text}.autogenerate.profile.json")
+        else:
+            print("Set the export directory and filename to write the auto-generate profile report")
+
+def syncWatcher():
+    '''
+    Watches the items of every package for changes (see SceneWatcher), so they're only re-sampled once they've changed.
+    '''
+    global packManagerPane
+    global watcher
+    watcher.sync([uuid for pack in packManagerPane.packages for uuid in pack.items.uuids])
+
+def refreshItems(packages, full = False):
+    '''
+    Updates every package's renamed, reparented and deleted items, re-samples the items that have moved since they
+    were last sampled, then watches every package's items for the next changes.
 
-    packManagerPane.setCurrentPackage(packManagerPane.packageList.controls['top'][0])
-    cmds.progressBar(gMainProgressBar, edit = True, endProgress = True)
+    :param list[package] packages: The packages to refresh.
+    :param bool full: Whether to re-sample every item, including ones that haven't sent any changes (e.g. animated ones).
+    :returns list[list[str]]: The names of the items removed from each package.
+    '''
+    global watcher
+    removed = PackageItems.refreshStores([pack.items for pack in packages], None if full else watcher.isDirty)
+
+    for pack in packages:
+        watcher.clean(pack.items.uuids)
+    syncWatcher()
+
+    return removed
 
 def getSelection():
     '''
@@ -135,7 +182,85 @@ class package:
     - A list of transforms.
     - A filename.
     - A path, where the corresponding FBX file will be exported. (This can be toggled on or off)
-    \nInternally, the package class also refers to the UI element that appears in the 'Package Manager' panel.
+    \nPackages are pure data. The 'Package Manager' panel shows them through a small pool of packageRow UI elements,
+    which are bound to whichever packages are scrolled into view.
+    '''
+
+    def __init__(self):
+        global objectIndex
+        self.items = PackageItems.itemStore(owner = self, sceneIndex = objectIndex)
+        self.fileName = ""
+        self.customPathEnabled = False
+        self.directory = ""
+
+    def toggleCustomPath(self):
+        '''
+        Toggle the packages' custom export path (for its corresponding FBX file)
+        '''
+        self.customPathEnabled = not self.customPathEnabled
+        self.updateUI()
+
+    def select(self, modifiers = True):
+        '''
+        Select the packages' contents in the scene. Works with modifiers (Shift and Ctrl)
+        '''
+        if (not modifiers):
+            cmds.select(self.items.names, replace = True)
+            return
+        
+        mods = getModifiers()
+        shift = mods.__contains__('Shift')
+        ctrl = mods.__contains__('Ctrl')
+
+        if (shift and ctrl):
+            cmds.select(self.items.names, add = True)
+        elif(shift):
+            cmds.select(self.items.names, toggle = True)
+        elif(ctrl):
+            cmds.select(self.items.names, deselect = True)
+        else:
+            cmds.select(self.items.names, replace = True)
+
+    def delete(self):
+        # Remove this package's items from the reverse index
+        self.items.clear()
+
+        global packManagerPane
+        packManagerPane.removePackage(self)
+    
+    def open(self):
+        global currentPackage
+        if (currentPackage == self):
+            return
+        
+        global packManagerPane
+        packManagerPane.setCurrentPackage(self)
+
+    def updateUI(self, isCurrent = None):
+        '''
+        Update the package's row in the package manager (if it's scrolled into view) for item count, filename, path,
+        and whether it's opened in the package editor.
+        \n'isCurrent' is kept for compatibility, the row checks the current package itself.
+        '''
+        global packManagerPane
+        if (packManagerPane):
+            packManagerPane.refreshPackage(self)
+
+    def getFileName(self):
+        return self.fileName
+
+    def setFileName(self, value):
+        '''
+        Set the package's filename. Automatically excludes the characters \\/:*?"<>|
+        '''
+        self.fileName = cleanFileName(value)
+        self.updateUI()
+
+class packageRow:
+    '''
+    The UI element for one package in the 'Package Manager' panel.
+    \nRows are recycled: the panel only creates enough of them to fill its visible area, and binds each one to
+    whichever package is scrolled into view. All buttons act on the currently bound package.
     '''
 
     foldedHeight = 36
@@ -143,10 +268,11 @@ class package:
 
     def __init__(self, parent):
         self.name = cmds.formLayout(p = parent, ebg = True, bgc = bgColor(),
-                                    nd = 100, w = 10, h = package.foldedHeight)
+                                    nd = 100, w = 10, h = packageRow.foldedHeight)
         
-        self.items = []
-        self.customPathEnabled = False
+        self.package = None
+        # The state last applied to the maya UI, so rebinding only edits what changed
+        self.state = {}
         
         #region Top Layout
         # Top Layout containing the buttons and filename
@@ -154,20 +280,20 @@ class package:
         
         self.deleteIcon = cmds.iconTextButton(p = self.topLayout, style = 'iconOnly',
                                               i = 'deleteGeneric_100.png', annotation = "Delete this package",
-                                              command = self.delete, w = 28)
+                                              command = lambda: self.package.delete(), w = 28)
         
-        self.nameField = fileNameField(self.topLayout)
-        self.itemCount = cmds.text(p = self.topLayout, align = 'center', label = f"{len(self.items)} Item(s)", w = 50)
+        self.nameField = fileNameField(self.topLayout, onChange = self.onNameChanged)
+        self.itemCount = cmds.text(p = self.topLayout, align = 'center', label = "0 Item(s)", w = 50)
 
         self.selectIcon = cmds.iconTextButton(p = self.topLayout, style = 'iconOnly',
                                               i = 'selectBackFacingUV.png', annotation = "Select objects from this package",
-                                              command = self.select)
+                                              command = lambda: self.package.select())
         self.pathIcon = cmds.iconTextButton(p = self.topLayout, style = 'iconOnly', bgc = [0.37, 0.68, 0.53], ebg = False,
                                             i = 'folder-new.png', annotation = "Enable custom export path",
-                                            command = self.toggleCustomPath)
+                                            command = lambda: self.package.toggleCustomPath())
         self.openIcon = cmds.iconTextButton(p = self.topLayout, style = 'iconOnly', bgc = [0.32, 0.52, 0.65], ebg = False,
                                             i = 'outArrow.png', annotation = "Move to package editor",
-                                            command = self.open)
+                                            command = lambda: self.package.open())
         
         self.topLayout.controls['left'] = [self.deleteIcon, self.nameField]
         self.topLayout.controls['right'] = [self.openIcon, self.pathIcon, self.selectIcon, self.itemCount, self.nameField]
@@ -180,7 +306,7 @@ class package:
         #endregion Top Layout
 
         # Collapsable layout containing the package's custom export directory
-        self.dirField = directoryField(self)
+        self.dirField = directoryField(self, onChange = self.onDirectoryChanged)
         cmds.formLayout(self.dirField, edit = True, visible = False)
 
         cmds.formLayout(self, edit = True,
@@ -188,73 +314,63 @@ class package:
                                       (self.dirField, 'right', 2),
                                       (self.dirField, 'bottom', 6)])
 
-    # self.pathIcon button command
-    def toggleCustomPath(self):
-        '''
-        Toggle the packages' custom export path (for its corresponding FBX file) and expand its layout
-        '''
-        if (self.customPathEnabled):
-            cmds.iconTextButton(self.pathIcon, edit = True, ebg = False,
-                                annotation = "Enable custom export path")
-            self.customPathEnabled = False
+    # self.nameField change command
+    def onNameChanged(self, text):
+        if (self.package):
+            self.package.fileName = text
+            self.state['fileName'] = text
 
-            cmds.formLayout(self, edit = True, h = package.foldedHeight)
-            cmds.formLayout(self.dirField, edit = True, visible = False)
-        else:
-            cmds.iconTextButton(self.pathIcon, edit = True, ebg = True,
-                                annotation = "Disable custom export path")
-            self.customPathEnabled = True
+    # self.dirField change command
+    def onDirectoryChanged(self, directory):
+        if (self.package):
+            self.package.directory = directory
+            self.state['directory'] = directory
 
-            cmds.formLayout(self, edit = True, h = package.expandedHeight)
-            cmds.formLayout(self.dirField, edit = True, visible = True)
+    def bind(self, pack):
+        '''
+        Shows a package in this row, or hides the row if 'pack' is None.
+        '''
+        self.package = pack
+        self.refresh()
 
-    # self.selectIcon button command
-    def select(self, modifiers = True):
+    def refresh(self):
         '''
-        Select the packages' contents in the scene. Works with modifiers (Shift and Ctrl)
+        Updates the row's UI to match its package. Only the parts that changed since the last refresh are sent to maya.
         '''
-        if (not modifiers):
-            cmds.select(self.items, replace = True)
-            return
-        
-        mods = getModifiers()
-        shift = mods.__contains__('Shift')
-        ctrl = mods.__contains__('Ctrl')
+        global currentPackage
 
-        if (shift and ctrl):
-            cmds.select(self.items, add = True)
-        elif(shift):
-            cmds.select(self.items, toggle = True)
-        elif(ctrl):
-            cmds.select(self.items, deselect = True)
-        else:
-            cmds.select(self.items, replace = True)
+        pack = self.package
+        if (pack == None):
+            self.apply('visible', False, lambda value: cmds.formLayout(self, edit = True, visible = value))
+            return
 
-    # self.deleteIcon button command
-    def delete(self):
-        cmds.deleteUI(self, layout = True)
+        self.apply('visible', True, lambda value: cmds.formLayout(self, edit = True, visible = value))
+        self.apply('fileName', pack.fileName, self.nameField.setName)
+        self.apply('itemCount', len(pack.items), lambda value: cmds.text(self.itemCount, edit = True, label = f"{value} Item(s)"))
+        self.apply('directory', pack.directory, self.dirField.setDirectory)
+        self.apply('customPathEnabled', pack.customPathEnabled, self.applyCustomPath)
+        self.apply('isCurrent', currentPackage == pack, self.applyIsCurrent)
 
-        global packManagerPane
-        packManagerPane.removePackage(self)
-    
-    # self.openIcon button command
-    def open(self):
-        global currentPackage
-        if (currentPackage == self):
+    def apply(self, key, value, function):
+        if (self.state.get(key, None) == value and key in self.state):
             return
-        
-        global packManagerPane
-        packManagerPane.setCurrentPackage(self)
 
-    def updateUI(self, isCurrent):
-        '''
-        Update the package's UI for item count and whether it's opened in the package editor.
-        '''
-        if (not cmds.formLayout(self, exists = True)):
-            return
-        
-        cmds.text(self.itemCount, edit = True, label = f"{len(self.items)} Item(s)")
+        self.state[key] = value
+        function(value)
 
+    def applyCustomPath(self, enabled):
+        if (enabled):
+            cmds.iconTextButton(self.pathIcon, edit = True, ebg = True,
+                                annotation = "Disable custom export path")
+            cmds.formLayout(self, edit = True, h = packageRow.expandedHeight)
+            cmds.formLayout(self.dirField, edit = True, visible = True)
+        else:
+            cmds.iconTextButton(self.pathIcon, edit = True, ebg = False,
+                                annotation = "Enable custom export path")
+            cmds.formLayout(self, edit = True, h = packageRow.foldedHeight)
+            cmds.formLayout(self.dirField, edit = True, visible = False)
+
+    def applyIsCurrent(self, isCurrent):
         if (isCurrent):
             cmds.iconTextButton(self.openIcon, edit = True, ebg = True,
                                 annotation = "Currently in package editor")
@@ -262,9 +378,6 @@ class package:
             cmds.iconTextButton(self.openIcon, edit = True, ebg = False,
                                 annotation = "Move to package editor")
 
-    def getFileName(self):
-        return self.nameField.text
-
     # Return self.name so this class can be interacted with in the same way as maya.cmds UI objects
     def __str__(self):
         return self.name
@@ -282,35 +395,6 @@ class transform:
         self.name = name
         self.update()
     
-    def getRelativeAttributes(self, other):
-        '''
-        Returns the translate, rotate and scale relative to another transform.
-        \n(i.e. changes that would be applied to the other transform in order to match this transform)
-
-        :param transform other: The transform object to compare this to.
-        '''
-
-        translate = self.attributes['translate']
-        
-        for i, value in enumerate(other.attributes['translate']):
-            translate[i] -= value
-
-        rotate = self.attributes['rotate']
-        for i, value in enumerate(other.attributes['rotate']):
-            rotate[i] -= value
-
-        scale = self.attributes['scale']
-        for i, value in enumerate(other.attributes['scale']):
-            scale[i] /= value
-
-        # Name is stored as an attribute to making exporting to JSON easier
-        return {
-            'name' : self.name,
-            'translate' : translate,
-            'rotate' : rotate,
-            'scale' : scale
-        }
-
     def update(self, force = True):
         '''
         Checks and returns whether a maya transform exists in the scene under this transform's name.
@@ -320,26 +404,31 @@ class transform:
         :param bool force: Whether or not this transform's attributes should be updated.
         :returns bool: True if a maya transform exists in the scene under the same name as this.
         '''
-        if (not cmds.objExists(self)):
-            return False
-        elif (cmds.objectType(self) != 'transform'):
+        values, missing = TransformSampling.sampleTransforms([self.name])
+
+        if (len(missing) > 0):
             return False
 
         if (force):
-            translate = list(cmds.getAttr(f"{self}.translate")[0])
-            pivot = list(cmds.getAttr(f"{self}.rotatePivot")[0])
-            for i in range(len(translate)): translate[i] += pivot[i]
-
-            # Name is stored as an attribute to making exporting to JSON easier
-            self.attributes = {
-                'name' : self.name,
-                'translate' : translate,
-                'rotate' : list(cmds.getAttr(f"{self}.rotate")[0]),
-                'scale' : list(cmds.getAttr(f"{self}.scale")[0]),
-            }
+            self.setValues(values)
 
         return True
 
+    def setValues(self, values, offset = 0):
+        '''
+        Sets this transform's attributes from a flat array of sampled values (see TransformSampling.sampleTransforms()).
+
+        :param array values: The sampled values.
+        :param int offset: The index in 'values' where this transform's translate, rotate and scale start.
+        '''
+        # Name is stored as an attribute to making exporting to JSON easier
+        self.attributes = {
+            'name' : self.name,
+            'translate' : list(values[offset : offset + 3]),
+            'rotate' : list(values[offset + 3 : offset + 6]),
+            'scale' : list(values[offset + 6 : offset + 9]),
+        }
+
     # Return the name of the maya transform for easy integration/display with UI objects.
     def __str__(self):
         return self.name
@@ -402,12 +491,40 @@ class settingsUI:
                                          (self.rootNameField, 'top', 4, self.fbxToggle),
                                          (self.rootSetButton, 'top', 4, self.fbxToggle)])
 
+        # JSON format dropdown
+        self.jsonFormat = cmds.optionMenu(p = self.collapse, label = "JSON format", h = 25,
+                                          annotation = "Compact and newline-delimited JSON are smaller and faster to write and read")
+        for label in SceneWriter.formats.values():
+            cmds.menuItem(p = self.jsonFormat, label = label)
+
+        # Delta export toggle and compact button
+        self.compactButton = cmds.button(p = self.collapse, label = "Compact", h = 25, w = 60,
+                                         command = lambda _: compactDeltas(),
+                                         annotation = "Fold the changes written since the last full export back into the JSON scene")
+        self.deltaToggle = cmds.checkBox(p = self.collapse, label = "Changes only", value = False,
+                                         annotation = "Only write what changed since the last export, as a delta file beside the JSON scene")
+        cmds.formLayout(self.collapse, edit = True,
+                        attachForm = [(self.jsonFormat, 'left', lOffset + extraOffset),
+                                      (self.compactButton, 'right', rOffset + extraOffset)],
+                        attachControl = [(self.jsonFormat, 'top', 4, self.rootNameField),
+                                         (self.compactButton, 'top', 4, self.rootNameField),
+                                         (self.deltaToggle, 'top', 8, self.rootNameField),
+                                         (self.deltaToggle, 'right', 8, self.compactButton)])
+
         # FBX Settings Frame
         self.fbxSettings = self.fbxSettingsLayout(self.collapse)
         cmds.formLayout(self.collapse, edit = True,
                         attachForm = [(self.fbxSettings, 'left', lOffset),
                                      (self.fbxSettings, 'right', rOffset)],
-                        attachControl = [(self.fbxSettings, 'top', 4, self.rootNameField)])
+                        attachControl = [(self.fbxSettings, 'top', 4, self.jsonFormat)])
+
+        # Profile report toggle
+        self.profileToggle = cmds.checkBox(p = self.collapse, label = "Write profile report", value = False,
+                                           annotation = "Trace peak memory while exporting/auto-generating, and write the time spent in each phase" \
+                                           " to a .profile.json file beside the JSON scene. Tracing memory slows the export down")
+        cmds.formLayout(self.collapse, edit = True,
+                        attachForm = [(self.profileToggle, 'left', lOffset + extraOffset)],
+                        attachControl = [(self.profileToggle, 'top', 4, self.fbxSettings)])
 
         #endregion Collapsable Layout
 
@@ -451,6 +568,9 @@ class settingsUI:
         # Disable/Enable root transform button (and text field)
         cmds.button(self.rootSetButton, edit = True, enable = jsonEnabled)
         cmds.textField(self.rootNameField, edit = True, enable = jsonEnabled, bgc = bgColor(-0.1))
+        cmds.optionMenu(self.jsonFormat, edit = True, enable = jsonEnabled)
+        cmds.checkBox(self.deltaToggle, edit = True, enable = jsonEnabled)
+        cmds.button(self.compactButton, edit = True, enable = jsonEnabled)
 
         if (fbxEnabled and jsonEnabled):
             cmds.button(self.exportButton, edit = True, enable = True,
@@ -465,6 +585,25 @@ class settingsUI:
             cmds.button(self.exportButton, edit = True, enable = False,
                         label = "Export")
 
+    def getJSONFormat(self):
+        '''
+        Returns the format the JSON scene should be written in (see SceneWriter.formats).
+        '''
+        index = cmds.optionMenu(self.jsonFormat, query = True, select = True) or 1
+        return list(SceneWriter.formats)[index - 1]
+
+    def getDeltaEnabled(self):
+        '''
+        Returns whether JSON exports should only write what changed since the last export (see DeltaExport).
+        '''
+        return bool(cmds.checkBox(self.deltaToggle, query = True, value = True))
+
+    def getProfileEnabled(self):
+        '''
+        Returns whether to trace peak memory and write a profile report (see Profiling).
+        '''
+        return bool(cmds.checkBox(self.profileToggle, query = True, value = True))
+
     # self.rootSetButton button command
     def setRootToSelected(self):
         '''
@@ -504,7 +643,7 @@ class settingsUI:
         '''
         class fbxCheckbox:
             '''
-            A checkbox that stores a maya FBX property, and can update that property before an FBX file is exported.
+            A checkbox that stores a maya FBX property and its value.
             '''
             def __init__(self, parent, label, defaultValue, fbxProperty):
                 '''
@@ -522,12 +661,6 @@ class settingsUI:
             def onUIChanged(self):
                 self.value = cmds.checkBox(self, query = True, value = True)
             
-            def sendProperty(self):
-                '''
-                Sends this fbxCheckbox's property via cmds.FBXProperty(). Should be called right before an FBX file is exported.
-                '''
-                cmds.FBXProperty(self.fbxProperty, '-v', int(self.value))
-
             # Return self.name so this class can be interacted with in the same way as maya.cmds UI objects
             def __str__(self):
                 return self.name
@@ -537,23 +670,53 @@ class settingsUI:
 
             self.vForm = verticalFormLayout(parent = self, ebg = False)
 
-            self.vForm.controls['top'].append(self.fbxCheckbox(self.vForm, "Smoothing Groups", True, 'Export|IncludeGrp|Geometry|SmoothingGroups'))
-            self.vForm.controls['top'].append(self.fbxCheckbox(self.vForm, "Smooth Mesh", True, 'Export|IncludeGrp|Geometry|SmoothMesh'))
-            self.vForm.controls['top'].append(self.fbxCheckbox(self.vForm, "Split Vertex Normals", False, 'Export|IncludeGrp|Geometry|expHardEdges'))
-            self.vForm.controls['top'].append(self.fbxCheckbox(self.vForm, "Triangulate", False, 'Export|IncludeGrp|Geometry|Triangulate'))
-            self.vForm.controls['top'].append(self.fbxCheckbox(self.vForm, "Tangents & Binormals", False, 'Export|IncludeGrp|Geometry|TangentsandBinormals'))
-
-            self.vForm.controls['top'].append(self.fbxCheckbox(self.vForm, "Skinning", True, 'Export|IncludeGrp|Animation|Deformation|Skins'))
-            self.vForm.controls['top'].append(self.fbxCheckbox(self.vForm, "Blendshapes", True, 'Export|IncludeGrp|Animation|Deformation|Shape'))
+            self.checkboxes = [self.fbxCheckbox(self.vForm, label, defaultValue, fbxProperty)
+                               for label, fbxProperty, defaultValue in Export.fbxProperties]
+            self.vForm.controls['top'] += self.checkboxes
+
+            # Re-export every package, even ones the export manifest says are unchanged
+            self.forceRebuildToggle = cmds.checkBox(p = self.vForm, l = "Force rebuild", v = False,
+                                                    annotation = "Export every FBX file, even if its package hasn't changed since the last export")
+            self.vForm.controls['top'].append(self.forceRebuildToggle)
+
+            # Parallel export toggle and worker count
+            import os
+            defaultWorkers = max(1, min(8, (os.cpu_count() or 2) // 2))
+
+            self.parallelRow = horizontalFormLayout(self.vForm, ebg = False, h = 20)
+            self.parallelToggle = cmds.checkBox(p = self.parallelRow, l = "Parallel export (mayapy)", v = False,
+                                                annotation = "Export FBX files in background mayapy processes instead of this session")
+            self.workerLabel = cmds.text(p = self.parallelRow, label = "Workers:")
+            self.workerCount = cmds.intField(p = self.parallelRow, value = defaultWorkers, minValue = 1, maxValue = 64, w = 40,
+                                             annotation = "Amount of mayapy processes to export with")
+            self.parallelRow.controls['left'] = [self.parallelToggle]
+            self.parallelRow.controls['right'] = [self.workerCount, self.workerLabel]
+            self.parallelRow.updateLayout(0, 0)
+            self.vForm.controls['top'].append(self.parallelRow)
 
             self.vForm.updateLayout(xOffset = 12)
 
-        def sendProperties(self):
+        def getProperties(self):
             '''
-            Sends all fbxCheckbox properties via cmds.FBXProperty(). Should be called right before an FBX file is exported.
+            Returns all fbxCheckbox properties, for the export API (see Export.exportSettings).
+            :returns list[tuple[str, int]]: Pairs of FBX property and value.
             '''
-            for checkbox in self.vForm.controls['top']:
-                checkbox.sendProperty()
+            return [(checkbox.fbxProperty, int(checkbox.value)) for checkbox in self.checkboxes]
+
+        def getForceRebuild(self):
+            '''
+            Returns whether every FBX file should be exported, ignoring the export manifest.
+            '''
+            return bool(cmds.checkBox(self.forceRebuildToggle, query = True, value = True))
+
+        def getParallelWorkers(self):
+            '''
+            Returns the amount of mayapy workers to export with, or 0 if parallel export is disabled.
+            '''
+            if (not cmds.checkBox(self.parallelToggle, query = True, value = True)):
+                return 0
+
+            return cmds.intField(self.workerCount, query = True, value = True)
         
         # Return self.name so this class can be interacted with in the same way as maya.cmds UI objects
         def __str__(self):
@@ -585,10 +748,14 @@ class packManagerUI:
                                            command = self.addPackage)
         self.autoPackageButton = cmds.button(p = self.buttons, label = "Auto-Generate packages", h = 25, w = 150,
                                              command = autoGeneratePackages)
+        self.refreshIcon = cmds.iconTextButton(p = self.buttons, style = 'iconOnly',
+                                               i = 'refresh.png', annotation = "Update the items of every package that have been moved/deleted." \
+                                               "\nHold SHIFT to re-check every item (e.g. animated ones)",
+                                               command = self.refreshPackages)
         self.deleteIcon = cmds.iconTextButton(p = self.buttons, style = 'iconOnly',
                                               i = 'deleteGeneric_100.png', annotation = "Delete all packages",
                                               command = self.clearPackages)
-        self.buttons.controls['left'] = [self.addIcon]
+        self.buttons.controls['left'] = [self.addIcon, self.refreshIcon]
         self.buttons.controls['right'] = [self.deleteIcon, self.autoPackageButton]
         self.buttons.updateLayout(0, 2)
 
@@ -599,19 +766,90 @@ class packManagerUI:
         #endregion Button Layout
 
         #region Package Scroll List
-        self.scrollLayout = cmds.scrollLayout(p = self, childResizable = True, bgc = bgColor(-0.1), w = 10, h = 1)
+        # The list of packages (the data), and the pool of rows that display the visible part of it
+        self.packages = []
+        self.firstVisible = 0
+
+        # The scroll layout only ever holds as many rows as fit in it, so scrolling is done with a separate scroll bar
+        self.scrollLayout = cmds.scrollLayout(p = self, childResizable = True, bgc = bgColor(-0.1), w = 10, h = 1,
+                                              resizeCommand = self.onListResized)
         self.packageList = verticalFormLayout(self.scrollLayout, False, w = 10)
+        self.scrollBar = cmds.intScrollBar(p = self, horizontal = False, minValue = 0, maxValue = 1, value = 0,
+                                           step = 1, largeStep = 1, enable = False,
+                                           dragCommand = lambda _: self.onScroll(),
+                                           changeCommand = lambda _: self.onScroll())
 
         cmds.formLayout(self, edit = True,
                         attachForm = [(self.scrollLayout, 'left', lOffset),
-                                      (self.scrollLayout, 'right', rOffset),
-                                      (self.scrollLayout, 'bottom', 2)],
-                        attachControl = [(self.scrollLayout, 'top', 0, self.buttons)])
+                                      (self.scrollLayout, 'bottom', 2),
+                                      (self.scrollBar, 'right', rOffset),
+                                      (self.scrollBar, 'bottom', 2)],
+                        attachControl = [(self.scrollLayout, 'top', 0, self.buttons),
+                                         (self.scrollLayout, 'right', 0, self.scrollBar),
+                                         (self.scrollBar, 'top', 0, self.buttons)])
         #endregion Package Scroll List
         
         self.setCurrentPackage(self.addPackage())
 
-    # package.openIcon button command
+    def getVisibleRowCount(self):
+        '''
+        Returns the amount of (folded) rows that fit in the visible area of the package list.
+        '''
+        height = cmds.scrollLayout(self.scrollLayout, query = True, scrollAreaHeight = True)
+        if (not height):
+            height = packageRow.foldedHeight * packManagerUI.minimumRows
+
+        return max(packManagerUI.minimumRows, int(height / (packageRow.foldedHeight + 4)) + 1)
+
+    # The least amount of rows in the pool, for before the window has a size
+    minimumRows = 8
+
+    # self.scrollLayout resize command
+    def onListResized(self, *args):
+        self.refreshRows()
+
+    # self.scrollBar drag/change command
+    def onScroll(self):
+        self.firstVisible = cmds.intScrollBar(self.scrollBar, query = True, value = True)
+        self.refreshRows(updateScrollBar = False)
+
+    def refreshRows(self, updateScrollBar = True):
+        '''
+        Binds the pool of rows to the packages currently scrolled into view.
+        \nRows are only created when the visible area grows, so the UI cost depends on the list's height, not the amount of packages.
+        '''
+        visibleRows = min(self.getVisibleRowCount(), max(1, len(self.packages)))
+
+        # Grow the pool if needed, but never shrink it. Unused rows are hidden instead
+        if (len(self.packageList.controls['top']) < visibleRows):
+            while (len(self.packageList.controls['top']) < visibleRows):
+                self.packageList.controls['top'].append(packageRow(self.packageList))
+            self.packageList.updateLayout(yOffset = 4)
+
+        maxFirst = max(0, len(self.packages) - visibleRows)
+        self.firstVisible = min(max(0, self.firstVisible), maxFirst)
+
+        for i, row in enumerate(self.packageList.controls['top']):
+            index = self.firstVisible + i
+            if (i < visibleRows and index < len(self.packages)):
+                row.bind(self.packages[index])
+            else:
+                row.bind(None)
+
+        if (updateScrollBar):
+            cmds.intScrollBar(self.scrollBar, edit = True, maxValue = max(1, maxFirst), value = self.firstVisible,
+                              largeStep = max(1, visibleRows - 1), enable = maxFirst > 0)
+
+    def refreshPackage(self, pack):
+        '''
+        Updates the row showing a package, if the package is scrolled into view.
+        '''
+        for row in self.packageList.controls['top']:
+            if (row.package == pack):
+                row.refresh()
+                return
+
+    # packageRow.openIcon button command
     def setCurrentPackage(self, pack):
         '''
         Sets the package being edited in the packEditorPane.
@@ -619,11 +857,32 @@ class packManagerUI:
         '''
         global currentPackage
 
-        if (currentPackage):
-            currentPackage.updateUI(False)
-
+        previous = currentPackage
         currentPackage = pack
-        currentPackage.updateUI(True)
+
+        if (previous):
+            previous.updateUI()
+        currentPackage.updateUI()
+
+        global packEditorPane
+        if (packEditorPane):
+            packEditorPane.updateItemsList()
+
+    # self.refreshIcon button command
+    @CommandTracer.action('Refresh all packages')
+    def refreshPackages(self):
+        '''
+        Updates the items of every package, removing the ones that have been deleted from the scene.
+        \nEvery package is checked in a single pass (see PackageItems.refreshStores()), and only items that have
+        changed are re-sampled, unless Shift is held.
+        '''
+        removed = refreshItems(self.packages, full = 'Shift' in getModifiers())
+
+        removedCount = sum(len(names) for names in removed)
+        if (removedCount > 0):
+            print(f"Removed {removedCount} item(s) that no longer exist from {sum(len(names) > 0 for names in removed)} package(s)")
+
+        self.refreshRows()
 
         global packEditorPane
         if (packEditorPane):
@@ -636,7 +895,7 @@ class packManagerUI:
         \nNote that there must always be at least one package, so this immediately creates a new one if the list is empty.
         '''
 
-        if (len(self.packageList.controls) <= 1
+        if (len(self.packages) <= 1
             and len(currentPackage.items) <= 0
             and currentPackage.getFileName() == ""):
             return
@@ -650,36 +909,70 @@ class packManagerUI:
             if (response == 'Cancel'):
                 return
 
-        for package in self.packageList.controls['top']:
-            cmds.deleteUI(package, layout = True)
+        global objectIndex
+        objectIndex.clear()
+
+        global watcher
+        watcher.clear()
         
-        self.packageList.controls['top'] = []
+        self.packages = []
+        self.firstVisible = 0
         self.setCurrentPackage(self.addPackage())
 
-    # package.deleteIcon button command
+    # package.delete
     def removePackage(self, pack):
         '''
         Removes a package from the list.
         \nNote that there must always be at least one package, so this immediately creates a new one if the list is empty.
         '''
-        self.packageList.controls['top'].remove(pack)
+        self.packages.remove(pack)
         
         # select a new currentPackage so packEditor doesn't show information from the package we just deleted
-        if (len(self.packageList.controls['top']) <= 0):
+        if (len(self.packages) <= 0):
             self.setCurrentPackage(self.addPackage())
         else:
-            self.packageList.updateLayout(yOffset = 4)
-            self.setCurrentPackage(self.packageList.controls['top'][0])
+            self.refreshRows()
+            self.setCurrentPackage(self.packages[0])
+
+    def addPackages(self, groups):
+        '''
+        Adds many packages to the list at once, e.g. from precomputed groups of transforms.
+        \nThe items of each package are sampled in one pass, and the list's layout is only updated once at the end.
+        Each package is named after its first item.
+
+        :param list[list[str]] groups: The names of the transforms in each new package.
+        :returns list[package]: The new packages.
+        '''
+        new = []
+
+        self.packageList.suspendLayout()
+        try:
+            for group in groups:
+                if (len(group) <= 0):
+                    continue
+
+                pack = package()
+                pack.items.extend(group)
+                pack.items.update()
+                pack.fileName = cleanFileName(str(pack.items[0]))
+                new.append(pack)
+
+            self.packages += new
+            self.refreshRows()
+        finally:
+            self.packageList.resumeLayout()
+
+        return new
 
     # addIcon button command
     def addPackage(self):
         '''
         Adds a new empty package to the list.
         '''
-        new = package(self.packageList)
+        new = package()
 
-        self.packageList.controls['top'].append(new)
-        self.packageList.updateLayout(yOffset = 4)
+        self.packages.append(new)
+        self.refreshRows()
 
         return new
 
@@ -718,7 +1011,8 @@ class packEditorUI:
                             command = self.addSelection)
         
         self.refreshIcon = cmds.iconTextButton(p = self.buttons, style = 'iconOnly',
-                            i = 'refresh.png', annotation = "Update items that have been moved/deleted",
+                            i = 'refresh.png', annotation = "Update items that have been moved/deleted." \
+                            "\nHold SHIFT to re-check every item (e.g. animated ones)",
                             command = self.refreshAll)
         
         # Create Items list (which is below the buttons) before the syncIcon so it can be referenced
@@ -743,15 +1037,15 @@ class packEditorUI:
                         attachControl = [(self.buttons, 'top', 2, self.title)])
 
     # self.refreshIcon button command
+    @CommandTracer.action('Refresh')
     def refreshAll(self):
         global currentPackage
 
-        for item in currentPackage.items:
-            if (not item.update()):
-                currentPackage.items.remove(item)
+        refreshItems([currentPackage], full = 'Shift' in getModifiers())
         self.updateItemsList()
 
     # self.deleteIcon button command
+    @CommandTracer.action('Delete items')
     def deleteSelection(self):
         selection = cmds.textScrollList(self.itemsList, query = True, selectItem = True)
         if (selection == None):
@@ -760,12 +1054,13 @@ class packEditorUI:
 
         global currentPackage
 
-        for item in selection:
-            currentPackage.items.remove(item)
+        currentPackage.items.removeMany(selection)
+        syncWatcher()
 
         self.updateItemsList()
 
     # self.addIcon button command
+    @CommandTracer.action('Add selection')
     def addSelection(self):
         selection = getSelection()
         if (len(selection) <= 0):
@@ -774,12 +1069,13 @@ class packEditorUI:
 
         global currentPackage
 
-        for item in selection:
-            if (item in currentPackage.items):
-                currentPackage.items[currentPackage.items.index(item)].update()
-                continue
-            
-            currentPackage.items.append(transform(item))
+        # Add new items (existing items keep their place), then sample new and existing items all at once
+        updated = [currentPackage.items.append(item) for item in selection]
+        currentPackage.items.update(updated)
+
+        global watcher
+        watcher.clean([currentPackage.items.uuids[i] for i in updated])
+        syncWatcher()
 
         self.updateItemsList()
 
@@ -789,7 +1085,7 @@ class packEditorUI:
 
     def updateItemsList(self):
         cmds.textScrollList(self.itemsList, edit = True, removeAll = True)
-        cmds.textScrollList(self.itemsList, edit = True, append = currentPackage.items)
+        cmds.textScrollList(self.itemsList, edit = True, append = currentPackage.items.names)
         currentPackage.updateUI(True)
 
     # Return self.name so this class can be interacted with in the same way as maya.cmds UI objects
@@ -808,11 +1104,13 @@ class packEditorUI:
                                 command = self.pressSyncSelect)
             
             self.syncSelectJob = -1
+            self.sceneSyncQueued = False
 
             cmds.textScrollList(itemsList, edit = True, selectCommand = self.listSelectionChanged)
             self.itemsList = itemsList
         
         # self.name button command
+        @CommandTracer.action('Sync select')
         def pressSyncSelect(self):
             modifiers = getModifiers()
             
@@ -856,7 +1154,7 @@ class packEditorUI:
             syncSelectEnabled = True
 
             # Create script job
-            self.syncSelectJob = cmds.scriptJob(event = ["SelectionChanged", self.sceneSelectionChanged],
+            self.syncSelectJob = cmds.scriptJob(event = ["SelectionChanged", self.queueSceneSelectionChanged],
                                                 parent = self, compressUndo = True)
             
             self.quickSyncSelection()
@@ -864,46 +1162,82 @@ class packEditorUI:
         def quickSyncSelection(self):
             # Store current list selection
             listSelection = cmds.textScrollList(self.itemsList, query = True, selectItem = True)
-            sceneSelection = getSelection()
-            
-            # Deselect everything in the list since we'll re-select them all later
-            cmds.textScrollList(self.itemsList, edit = True, deselectAll = True)
             
             # Use empty list rather than None to avoid 'NoneType is not iterable' errors
             if (listSelection == None):
                 listSelection = []
 
-            for item in currentPackage.items:
-                if (item in sceneSelection or item in listSelection):
-                    # If it's selected in the list or the scene, make it selected in both.
-                    cmds.textScrollList(self.itemsList, edit = True, selectItem = item)
-                    cmds.select(item, add = True)
-                else:
-                    # If it exists in the list but isn't selected, deselect it. 
-                    # This way the user doesn't lose their scene selection when they quick-sync or turn on sync selection.
-                    cmds.select(item, deselect = True)
+            # If it's selected in the list or the scene, make it selected in both.
+            selected = set(getSelection())
+            selected.update(listSelection)
+            selected = [item for item in currentPackage.items.names if item in selected]
+
+            self.selectInList(selected)
+            self.selectInScene(selected)
+
+        def selectInList(self, items):
+            '''
+            Replaces the items list's selection, in one deselect and one select edit regardless of the amount of items.
+            :param list[str] items: The names of the package items to select.
+            '''
+            cmds.textScrollList(self.itemsList, edit = True, deselectAll = True)
+
+            if (len(items) > 0):
+                cmds.textScrollList(self.itemsList, edit = True, selectItem = items)
+
+        def selectInScene(self, items):
+            '''
+            Replaces the current package's part of the scene selection, in a single cmds.select call.
+            \nObjects that aren't in the package stay selected, so the user doesn't lose their scene selection
+            when they quick-sync or turn on sync selection.
+            :param list[str] items: The names of the package items to select.
+            '''
+            sceneSelection = cmds.ls(selection = True, long = True)
+            if (sceneSelection == None):
+                sceneSelection = []
+
+            selection = [item for item in sceneSelection if item not in currentPackage.items] + items
+
+            if (len(selection) > 0):
+                cmds.select(selection, replace = True)
+            else:
+                cmds.select(clear = True)
+
+        # self.syncSelectJob script job function
+        def queueSceneSelectionChanged(self):
+            '''
+            Triggers when selection is changed in the scene. Defers sceneSelectionChanged() until maya is idle,
+            so a burst of selection changes (e.g. dragging a selection) only updates the list once.
+            '''
+            if (self.sceneSyncQueued):
+                return
+
+            import maya.utils
+            self.sceneSyncQueued = True
+            maya.utils.executeDeferred(self.flushSceneSelectionChanged)
+
+        @CommandTracer.action('Sync select (scene selection changed)')
+        def flushSceneSelectionChanged(self):
+            self.sceneSyncQueued = False
+
+            # The window may have been closed since the update was queued
+            if (cmds.textScrollList(self.itemsList, exists = True)):
+                self.sceneSelectionChanged()
 
         def sceneSelectionChanged(self, force = False):
             '''
-            self.syncSelectJob script job function. Triggers when selection is changed in the scene.
-            \nUpdates list selection to match scene selection.
+            Updates list selection to match scene selection.
             :param bool force: Use this param to force functionality even when Sync Select is off.
             '''
             
             if (not syncSelectEnabled and not force):
                 return
 
-            selection = getSelection()
-            cmds.textScrollList(self.itemsList, edit = True, deselectAll = True)
-
-            if (len(selection) <= 0):
-                return
-
-            for item in currentPackage.items:
-                if (item in selection):
-                    cmds.textScrollList(self.itemsList, edit = True, selectItem = item)
+            selection = set(getSelection())
+            self.selectInList([item for item in currentPackage.items.names if item in selection])
         
         # packEditorUI.itemsList select command
+        @CommandTracer.action('Sync select (list selection changed)')
         def listSelectionChanged(self, force = False):
             '''
             packEditorUI.itemsList selectCommand. Triggers when selection is changed in the items list.
@@ -919,13 +1253,7 @@ class packEditorUI:
             if (selection == None):
                 selection = []
 
-            for item in currentPackage.items:
-                if (item in selection):
-                    cmds.select(item, add = True)
-                else:
-                    # If it exists in the list but isn't selected, deselect it.
-                    # This way the user doesn't lose their scene selection when they quick-sync or turn on sync selection.
-                    cmds.select(item, deselect = True)
+            self.selectInScene([item for item in selection if item in currentPackage.items])
         
         # Return self.name so this class can be interacted with in the same way as maya.cmds UI objects
         def __str__(self):
@@ -955,7 +1283,16 @@ def packageExporterUI():
     cmds.paneLayout(topBottomPanes, edit = True, paneSize = [2, 100, 10])
 
 # settingsPane.exportButton button command
+@CommandTracer.action('Export')
 def export():
+    global activeExport
+
+    # The export button cancels the export while one is running
+    if (activeExport != None and activeExport.running):
+        print("Cancelling export after the current package...")
+        activeExport.cancel()
+        return
+
     global settingsPane
     fbxEnabled = cmds.checkBox(settingsPane.fbxToggle, query = True, value = True)
     jsonEnabled = cmds.checkBox(settingsPane.jsonToggle, query = True, value = True)
@@ -964,171 +1301,182 @@ def export():
         return
     
     global packManagerPane
-    namesList = []
-    hasEmptyNames = False
-    hasEmptyPackages = False
 
     #region Error/Warning Dialogs
-    import os
-
-    # Check for empty/duplicate package filenames, empty packages and invalid package paths
-    for pack in packManagerPane.packageList.controls['top']:
-        fileName = pack.getFileName()
-
-        if (fileName == ""):
-            hasEmptyNames = True
-        
-        if (len(pack.items) <= 0):
-            hasEmptyPackages = True
-
-        if (pack.customPathEnabled):
-            if (not os.path.isdir(pack.dirField.directory)):
-                cmds.confirmDialog(title = 'Invalid export directory', button = ['Ok'], icon = 'critical',
-                           message = f"Path \"{pack.dirField.directory}\" on package \"{fileName}\"" \
-                "\nis invalid or does not exist.\n\nPlease enter a valid path and try again.")
-                return
-
-        namesList.append(fileName)
-
-    if (settingsPane.fileName.text == ""):
-        cmds.confirmDialog(title = 'Invalid filename', button = ['Ok'], icon = 'critical',
-                           message = 'Please enter a valid filename and try again.')
+    packages = getExportPackages()
+    settings = getExportSettings()
+
+    # The same checks as exports without the window (see Batch.py)
+    errors, warnings = Export.validate(packages, settings)
+    if (len(errors) > 0):
+        cmds.confirmDialog(title = 'Error', button = ['Ok'], icon = 'critical',
+                           message = "\n\n".join(errors) + "\n\nPlease fix this and try again.")
         return
 
-    if (not os.path.isdir(settingsPane.dirField.directory)):
-        cmds.confirmDialog(title = 'Invalid export directory', button = ['Ok'], icon = 'critical',
-                           message = f"Path \"{settingsPane.dirField.directory}\"" \
-        "\nis invalid or does not exist.\n\nPlease enter a valid path and try again.")
-        return
+    global objectIndex
+    conflicts = objectIndex.getConflicts()
+    if (len(conflicts) > 0):
+        for name, packs in conflicts.items():
+            print(f"{name} is in packages: {', '.join(pack.getFileName() for pack in packs)}")
 
-    if (len(namesList) != len(set(namesList))):
-        cmds.confirmDialog(title = 'Error', button = ['Ok'], icon = 'critical', message = "" \
-        "You have one or more packages with the same name.\n\nPlease rename the packages and try again.")
-        return
+        listed = "\n".join(list(conflicts)[:10])
+        if (len(conflicts) > 10):
+            listed += f"\n...and {len(conflicts) - 10} more (see the script editor)"
 
-    if (hasEmptyPackages):
         response = cmds.confirmDialog(title = 'Warning', button = ['Continue','Cancel'],
                            defaultButton = 'Cancel', cancelButton = 'Cancel',
                            dismissString = 'Cancel', icon = 'warning', message = "" \
-        "You have one or more packages with no items.\n\nThese will not be exported.")
+        "These objects are in more than one package, so they will be exported more than once:" \
+        f"\n\n{listed}")
 
         if (response == 'Cancel'):
             return
 
-    if (hasEmptyNames):
+    for warning in warnings:
         response = cmds.confirmDialog(title = 'Warning', button = ['Continue','Cancel'],
                            defaultButton = 'Cancel', cancelButton = 'Cancel',
-                           dismissString = 'Cancel', icon = 'warning', message = "" \
-        "You have one or more packages with no filename." \
-        "\n\nThese will not be exported.")
+                           dismissString = 'Cancel', icon = 'warning', message = warning)
 
         if (response == 'Cancel'):
             return
 
-    global rootTransform
-    if (jsonEnabled and rootTransform == None):
-        response = cmds.confirmDialog(title = 'Warning', button = ['Continue','Cancel'],
-                           defaultButton = 'Cancel', cancelButton = 'Cancel',
-                           dismissString = 'Cancel', icon = 'warning', message = "" \
-        "The root transform has not been set." \
-        "\n\nThis may cause issues when loading the JSON scene somewhere else.")
+    #endregion Error/Warning Dialogs
 
-        if (response == 'Cancel'):
-            return
+    # Created once the dialogs are answered, so time spent on them isn't part of the export
+    profile = Profiling.exportProfile('Export', settingsPane.getProfileEnabled())
 
-    #endregion Error/Warning Dialogs
+    # Re-sample the items that have changed since they were added (including renamed and reparented ones), so they're
+    # exported as they are now. Only done once the export is going ahead, so cancelling a dialog leaves packages as they were.
+    with profile.phase('refresh items'):
+        removed = sum(len(names) for names in refreshItems(packManagerPane.packages))
 
-    if (fbxEnabled):
-        exportFBX()
-    if (jsonEnabled):
-        exportJSON()
+    if (removed > 0):
+        print(f"Removed {removed} item(s) that no longer exist")
 
-def exportFBX():
-    global settingsPane
-    settingsPane.fbxSettings.sendProperties()
+    packManagerPane.refreshRows()
+
+    global packEditorPane
+    packEditorPane.updateItemsList()
 
-    print(f"Starting FBX Export to {settingsPane.dirField.directory}...")
+    # Export one package at a time while maya is idle, so the UI isn't frozen until the export finishes.
+    # The FBX and JSON exports each step the progress bar once per package.
+    progress = mainProgressBar('Exporting packages...', len(packages) * (settings.fbxEnabled + settings.jsonEnabled),
+                               showEstimate = True)
+    activeExport = slicedRunner('Export (packages)', Export.iterExport(packages, settings, progress, profile), progress,
+                                onFinished = lambda failed, error: onExportFinished(progress, failed, error))
 
-    global packManagerPane
-    for pack in packManagerPane.packageList.controls['top']:
-        fileName = pack.getFileName()
-
-        if (len(pack.items) <= 0):
-            print(f"No items in {fileName} package, skipping...")
-            continue
-
-        # Duplicate object and reset transforms so offsets/rotation arent baked into the mesh
-        # This helps for instancing later
-        dupe = cmds.duplicate(pack.items[0])[0]
-        cmds.setAttr(f"{dupe}.translate", 0, 0, 0, type = 'double3')
-        cmds.setAttr(f"{dupe}.rotate", 0, 0, 0, type = 'double3')
-        cmds.setAttr(f"{dupe}.scale", 1, 1, 1, type = 'double3')
-        cmds.select(dupe, replace = True)
-
-        if (fileName == ""):
-            print("Skipped exporting package due to empty filename")
-            continue
-
-        if (pack.customPathEnabled):
-            directory = f"{pack.dirField.directory}/{fileName}.fbx"
-        else:
-            directory = f"{settingsPane.dirField.directory}/{fileName}.fbx"
+    setExportRunning(True)
+    activeExport.start()
 
-        print(f"Exporting {fileName} package to {directory}")
-        # -s makes it export selected instead of export all
-        cmds.FBXExport("-file", directory, "-s")
-        
-        # Delete duplicated object so the scene is as it was
-        cmds.delete(dupe)
+def onExportFinished(progress, failed, error):
+    '''
+    Called when a time-sliced export finishes, is cancelled or raises an error.
+    '''
+    progress.end()
+    setExportRunning(False)
+
+    if (error != None):
+        import traceback
+        traceback.print_exception(type(error), error, error.__traceback__)
 
-    print(f"Finished FBX Export to {settingsPane.dirField.directory}.")
+        cmds.confirmDialog(title = 'Export failed', button = ['Ok'], icon = 'critical', message = "" \
+        f"The export stopped because of an error:\n\n{error}\n\nSee the script editor for details.")
+        return
 
-def exportJSON():
+    if (len(failed) > 0):
+        cmds.confirmDialog(title = 'FBX export incomplete', button = ['Ok'], icon = 'warning', message = "" \
+        f"{len(failed)} package(s) were not exported.\n\nSee the script editor for details.")
+
+def setExportRunning(running):
+    '''
+    Turns the export button into a cancel button while an export runs, and stops packages being edited during it.
+    '''
     global settingsPane
-    fullPath = f"{settingsPane.dirField.directory}/{settingsPane.fileName.text}.json"
+    global packManagerPane
+    global packEditorPane
+
+    # The window may have been closed during the export
+    if (settingsPane == None or not cmds.button(settingsPane.exportButton, exists = True)):
+        return
 
-    print(f"Starting JSON Export to {fullPath}...")
+    cmds.formLayout(packManagerPane, edit = True, enable = not running)
+    cmds.formLayout(packEditorPane, edit = True, enable = not running)
 
-    import json
-    packageData = []
+    if (running):
+        cmds.button(settingsPane.exportButton, edit = True, enable = True, label = "Cancel Export")
+    else:
+        settingsPane.onToggleUpdateUI()
+
+def getPackageDirectory(pack):
+    '''
+    Returns the directory a package's FBX file is exported to: its custom path if enabled, otherwise the export directory.
+    '''
+    global settingsPane
 
+    if (pack.customPathEnabled):
+        return pack.directory
+    return settingsPane.dirField.directory
+
+def getExportPackages():
+    '''
+    Returns the packages in the Package Manager, for the export API (see Export.exportPackage).
+    '''
     global packManagerPane
-    for pack in packManagerPane.packageList.controls['top']:
-        transformData = []
-        fileName = pack.getFileName()
+    return [Export.exportPackage(pack.getFileName(), getPackageDirectory(pack), pack.items) for pack in packManagerPane.packages]
 
-        if (len(pack.items) <= 0):
-            print(f"No items in {fileName} package. It will be left out of the scene JSON.")
-            continue
+def getExportSettings():
+    '''
+    Returns the settings in the Export Settings pane, for the export API (see Export.exportSettings).
+    '''
+    global settingsPane
+    global rootTransform
 
-        if (fileName == ""):
-            print(f"Package is missing a filename. It will be left out of the scene JSON.")
-            continue
+    return Export.exportSettings(settingsPane.dirField.directory, settingsPane.fileName.text,
+                                 fbxEnabled = cmds.checkBox(settingsPane.fbxToggle, query = True, value = True),
+                                 jsonEnabled = cmds.checkBox(settingsPane.jsonToggle, query = True, value = True),
+                                 fbxProperties = settingsPane.fbxSettings.getProperties(),
+                                 forceRebuild = settingsPane.fbxSettings.getForceRebuild(),
+                                 workerCount = settingsPane.fbxSettings.getParallelWorkers(),
+                                 jsonFormat = settingsPane.getJSONFormat(),
+                                 deltaEnabled = settingsPane.getDeltaEnabled(),
+                                 root = rootTransform.attributes if rootTransform != None else None,
+                                 profileEnabled = settingsPane.getProfileEnabled())
+
+def saveDefinition():
+    '''
+    Saves the packages and export settings in the window as a package definition file, for exporting without the window
+    (see Batch.py).
+    '''
+    global settingsPane
+    if (settingsPane == None):
+        cmds.confirmDialog(title = 'No packages', button = ['Ok'], icon = 'warning', message = "" \
+        "Open the Package Exporter window to create packages first.")
+        return
 
-        for item in pack.items:
-            transformData += [item.getRelativeAttributes(rootTransform)]
+    path = cmds.fileDialog2(fileMode = 0, caption = "Save Package Definition",
+                            fileFilter = "Package Definition (*.json)")
+    if (not path):
+        return
 
-        filePath = f"{settingsPane.dirField.directory}/{fileName}"
-        if (pack.customPathEnabled):
-            filePath = f"{pack.dirField.directory}/{fileName}"
+    scene = cmds.file(query = True, sceneName = True) or None
+    Export.writeDefinition(path[0], getExportPackages(), getExportSettings(), scene)
 
-        packageData += [{
-            "fileName" : fileName,
-            "transforms" : transformData,
-            "path" : filePath
-        }]
+    print(f"Saved package definition to {path[0]}")
 
-    scene = {
-        "rootTransform" : rootTransform.attributes,
-        "packages" : packageData
-    }
+def compactDeltas():
+    '''
+    Folds the delta files written since the last full JSON export back into the JSON scene (see DeltaExport.compact()).
+    '''
+    statePath = getExportSettings().getPath('state.json')
 
-    sceneJson = json.dumps(scene, indent = 4)
-    # 'w' for write
-    with open(fullPath, 'w') as f:
-        f.write(sceneJson)
+    try:
+        count = DeltaExport.compact(statePath)
+    except RuntimeError:
+        cmds.confirmDialog(title = 'Nothing to compact', button = ['Ok'], icon = 'warning', message = "" \
+        "There is no full JSON export to compact changes into.\n\nExport the JSON scene first and try again.")
+        return
 
-    print(f"Finished JSON Export to {fullPath}...")
+    print(f"Compacted {count} delta file(s) into the JSON scene.")
 
 def Create(windowName = "packageExporterWindow"):
     global currentPackage
@@ -1148,6 +1496,13 @@ def Create(windowName = "packageExporterWindow"):
 
     global syncSelectEnabled
     syncSelectEnabled = False
+
+    global objectIndex
+    objectIndex = PackageItems.packageIndex()
+
+    global watcher
+    watcher.clear()
+
     if (cmds.workspaceControl(windowName, exists = True)):
             cmds.workspaceControl(windowName, edit=True, close = True)
 
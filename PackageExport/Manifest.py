@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+from array import array
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+# Bump this when the hashed data changes, so older manifests are treated as out of date
+manifestVersion = 1
+
+def hashMesh(name):
+    '''
+    Returns a hash of the mesh data that ends up in a package's FBX file: the points, topology, UVs and normals of
+    every mesh under a maya transform (in object space, so moving the transform doesn't change it).
+
+    :param str name: The name of the transform in the maya scene.
+    :returns str: A hex digest of the mesh data.
+    '''
+    digest = hashlib.sha1()
+
+    shapes = cmds.listRelatives(name, allDescendents = True, type = 'mesh', fullPath = True) or []
+    for shape in sorted(shapes):
+        selection = om.MSelectionList()
+        selection.add(shape)
+        mesh = om.MFnMesh(selection.getDagPath(0))
+
+        digest.update(shape.rsplit('|', 1)[-1].encode())
+
+        points = mesh.getPoints(om.MSpace.kObject)
+        digest.update(array('d', [value for point in points for value in (point.x, point.y, point.z)]).tobytes())
+
+        faceVertexCounts, faceVertices = mesh.getVertices()
+        digest.update(array('i', faceVertexCounts).tobytes())
+        digest.update(array('i', faceVertices).tobytes())
+
+        for uvSet in mesh.getUVSetNames():
+            us, vs = mesh.getUVs(uvSet)
+            digest.update(uvSet.encode())
+            digest.update(array('f', us).tobytes())
+            digest.update(array('f', vs).tobytes())
+
+        normals = mesh.getNormals(om.MSpace.kObject)
+        digest.update(array('f', [value for normal in normals for value in (normal.x, normal.y, normal.z)]).tobytes())
+
+    return digest.hexdigest()
+
+def hashPackage(name, properties, output):
+    '''
+    Returns the hash a package's FBX file is recorded under in the manifest.
+    \nIt changes when the package's mesh data (see hashMesh()), the FBX settings or the output path change.
+
+    :param str name: The name of the package's representative transform in the maya scene.
+    :param list[tuple[str, int]] properties: The FBX properties the package is exported with.
+    :param str output: The path of the package's FBX file.
+    :returns str: A hex digest of the package.
+    '''
+    settings = json.dumps([manifestVersion, [list(pair) for pair in properties], output])
+
+    digest = hashlib.sha1(hashMesh(name).encode())
+    digest.update(settings.encode())
+    return digest.hexdigest()
+
+class exportManifest:
+    '''
+    Records the hash of every exported FBX file (see hashPackage()), so packages that haven't changed since they
+    were last exported can be skipped.
+    \nThe manifest is a JSON file beside the JSON scene.
+    '''
+    def __init__(self, path):
+        '''
+        :param str path: The path of the manifest file. It's read straight away if it exists.
+        '''
+        self.path = path
+        self.packages = {}
+        self.exported = []
+        self.skipped = []
+
+        self.load()
+
+    def load(self):
+        '''
+        Reads the manifest file. Missing, unreadable or outdated manifests are treated as empty.
+        '''
+        self.packages = {}
+
+        if (not os.path.isfile(self.path)):
+            return
+
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            print(f"Couldn't read export manifest {self.path}, every package will be exported")
+            return
+
+        if (type(data) == dict and data.get('version') == manifestVersion):
+            self.packages = data.get('packages', {})
+
+    def save(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({'version' : manifestVersion, 'packages' : self.packages}, indent = 4))
+
+    def isUpToDate(self, fileName, digest, output):
+        '''
+        Returns whether a package's FBX file was exported with the same hash and still exists.
+
+        :param str fileName: The package's filename.
+        :param str digest: The package's current hash (see hashPackage()).
+        :param str output: The path of the package's FBX file.
+        '''
+        entry = self.packages.get(fileName)
+        if (entry == None):
+            return False
+
+        return entry.get('hash') == digest and entry.get('output') == output and os.path.isfile(output)
+
+    def record(self, fileName, digest, output):
+        '''
+        Records that a package's FBX file was exported.
+        '''
+        self.packages[fileName] = {'hash' : digest, 'output' : output}
+        self.exported.append(fileName)
+
+    def skip(self, fileName):
+        '''
+        Records that a package was skipped because it's up to date.
+        '''
+        self.skipped.append(fileName)
+
+    def summary(self):
+        return f"{len(self.exported)} exported, {len(self.skipped)} skipped (unchanged)"
@@ -1,5 +1,6 @@
 import maya.cmds as cmds
 from PackageExport import MainWindow
+from PackageExport import CommandTracer
 
 def Create(menuName = "PackageExportMenu"):
     if (cmds.menu(menuName, exists = True)):
@@ -7,4 +8,10 @@ def Create(menuName = "PackageExportMenu"):
 
     menu = cmds.menu(menuName, label = "Package Exporter", parent = "MayaWindow", tearOff = True)
     cmds.menuItem(label = "Open Window", parent = menu,
-                  command = lambda _: MainWindow.Create())
\ No newline at end of file
+                  command = lambda _: MainWindow.Create())
+    cmds.menuItem(label = "Save Package Definition...", parent = menu,
+                  command = lambda _: MainWindow.saveDefinition())
+    cmds.menuItem(divider = True, parent = menu)
+    cmds.menuItem(label = "Trace Commands", parent = menu, checkBox = CommandTracer.isEnabled(),
+                  annotation = "Print the maya commands each action in the Package Exporter window calls, and how long they take",
+                  command = lambda enabled: CommandTracer.setEnabled(enabled))
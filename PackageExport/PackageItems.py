@@ -0,0 +1,509 @@
+import sys
+from array import array
+
+import maya.cmds as cmds
+
+from PackageExport import TransformMath
+from PackageExport import TransformSampling
+
+class itemStore:
+    '''
+    Compact, columnar storage for the items (maya transforms) of a package.
+    \nInstead of one object per item, it stores:
+    - 'names', a list of the items' (interned) names in the maya scene.
+    - 'values', one contiguous array('d') holding 9 values (translate, rotate, scale) per item.
+    - 'positions', a dict mapping each name to its index, so looking up and adding items is O(1).
+    - 'uuids', the items' maya node UUIDs (None until an item is first sampled), so items that have been renamed or
+    reparented can be found again (see resolve()).
+    \nEach name can only be in the store once.
+    \nRemoving an item only leaves a gap (a None name) in its slot, so removing is O(1) per item and the order of the
+    rest is kept, including the first item (the package's representative in the FBX export). The gaps are compacted
+    in a single pass the next time the items are read or added (see compact()).
+    \nIterating or indexing the store returns lightweight itemView objects, which behave like MainWindow.transform.
+    '''
+    def __init__(self, items = None, owner = None, sceneIndex = None):
+        '''
+        :param list items: Optional items to start with. See append() for the accepted types.
+        :param owner: The package this store belongs to.
+        :param packageIndex sceneIndex: Optional reverse index that is kept up to date as items are added and removed.
+        '''
+        # The columns, by slot. Removed items leave gaps until the store is compacted
+        self.nameSlots = []
+        self.uuidSlots = []
+        self.values = array('d')
+        self.positions = {}
+        self.gaps = 0
+        self.owner = owner
+        self.sceneIndex = sceneIndex
+
+        if (items):
+            self.extend(items)
+
+    @property
+    def names(self):
+        '''
+        The items' names, in order.
+        '''
+        self.compact()
+        return self.nameSlots
+
+    @property
+    def uuids(self):
+        '''
+        The items' UUIDs, in the same order as their names.
+        '''
+        self.compact()
+        return self.uuidSlots
+
+    def compact(self):
+        '''
+        Closes the gaps left by removed items in a single pass, keeping the order of the rest.
+        '''
+        if (self.gaps <= 0):
+            return
+
+        stride = TransformMath.valuesPerTransform
+        names = []
+        uuids = []
+        values = array('d')
+
+        # Copy the runs of kept items between the gaps
+        start = 0
+        for slot, name in enumerate(self.nameSlots + [None]):
+            if (name != None):
+                continue
+
+            names += self.nameSlots[start : slot]
+            uuids += self.uuidSlots[start : slot]
+            values.extend(self.values[start * stride : slot * stride])
+            start = slot + 1
+
+        self.nameSlots = names
+        self.uuidSlots = uuids
+        self.values = values
+        self.positions = {name : i for i, name in enumerate(names)}
+        self.gaps = 0
+
+    def append(self, item, uuid = None):
+        '''
+        Adds an item to the end of the store, if it isn't in the store already.
+
+        :param item: The item's name, or an object with a name (e.g. MainWindow.transform or itemView).
+        If it has sampled attributes, they are copied, otherwise the item starts untransformed until it's updated.
+        :param str uuid: Optional UUID of the item's maya node. If it isn't set, it's found when the item is updated.
+        :returns int: The index of the item.
+        '''
+        # Indices are only meaningful without gaps
+        self.compact()
+
+        uuid = uuid or getattr(item, 'uuid', None)
+
+        name = str(item)
+        if (name in self.positions):
+            if (uuid != None):
+                self.uuidSlots[self.positions[name]] = uuid
+            return self.positions[name]
+
+        name = sys.intern(name)
+        self.positions[name] = len(self.nameSlots)
+        self.nameSlots.append(name)
+        self.uuidSlots.append(uuid)
+
+        if (self.sceneIndex != None):
+            self.sceneIndex.add(name, self.owner)
+
+        attributes = getattr(item, 'attributes', None)
+        if (attributes):
+            self.values.extend(TransformMath.attributesToValues(attributes))
+        else:
+            self.values.extend(TransformMath.identityValues)
+
+        return self.positions[name]
+
+    def extend(self, items, uuids = None):
+        '''
+        :param list items: The items to add. See append() for the accepted types.
+        :param list[str] uuids: Optional UUIDs of the items' maya nodes, in the same order.
+        '''
+        if (uuids == None):
+            for item in items:
+                self.append(item)
+            return
+
+        for item, uuid in zip(items, uuids):
+            self.append(item, uuid)
+
+    def remove(self, value):
+        '''
+        Removes an item from the store by name, in O(1). Raises ValueError if it isn't in the store, like list.remove().
+
+        :param value: The item's name, or an object with a name (e.g. itemView).
+        '''
+        slot = self.positions.get(str(value))
+        if (slot == None):
+            raise ValueError(f"{value} is not in the package")
+
+        self.removeSlot(slot)
+
+    def removeMany(self, values):
+        '''
+        Removes many items from the store by name, in O(k) for k names. Names that aren't in the store are ignored.
+
+        :param list values: The items' names, or objects with names (e.g. itemView).
+        :returns int: The amount of items removed.
+        '''
+        removed = 0
+        for value in values:
+            slot = self.positions.get(str(value))
+            if (slot != None):
+                self.removeSlot(slot)
+                removed += 1
+
+        return removed
+
+    def pop(self, index = -1):
+        '''
+        Removes an item from the store by index and returns its name, keeping the order of the rest.
+        '''
+        self.compact()
+
+        if (index < 0):
+            index += len(self.nameSlots)
+        if (index < 0 or index >= len(self.nameSlots)):
+            raise IndexError("pop index out of range")
+
+        name = self.nameSlots[index]
+        self.removeSlot(index)
+        return name
+
+    def removeSlot(self, slot):
+        name = self.nameSlots[slot]
+        self.nameSlots[slot] = None
+        self.uuidSlots[slot] = None
+        del self.positions[name]
+        self.gaps += 1
+
+        if (self.sceneIndex != None):
+            self.sceneIndex.discard(name, self.owner)
+
+    def clear(self):
+        if (self.sceneIndex != None):
+            for name in self.positions:
+                self.sceneIndex.discard(name, self.owner)
+
+        self.nameSlots = []
+        self.uuidSlots = []
+        self.values = array('d')
+        self.positions = {}
+        self.gaps = 0
+
+    def index(self, value):
+        '''
+        Returns the index of an item by name. Raises ValueError if it isn't in the store, like list.index().
+        '''
+        self.compact()
+
+        index = self.positions.get(str(value))
+        if (index == None):
+            raise ValueError(f"{value} is not in the package")
+
+        return index
+
+    def update(self, indices = None):
+        '''
+        Re-samples items' attributes (and UUIDs) from the maya scene, in a single pass (see TransformSampling.sampleTransforms()).
+        \nItems that no longer exist in the scene are left unchanged.
+
+        :param list[int] indices: The indices of the items to update. If this isn't set, every item is updated.
+        :returns list[str]: The names of the updated items that no longer exist in the scene.
+        '''
+        self.compact()
+        stride = TransformMath.valuesPerTransform
+        names = self.nameSlots
+
+        if (indices == None):
+            values, missing = TransformSampling.sampleTransforms(names, self.uuidSlots)
+
+            # Keep the old values of missing items, then swap in the new buffer as a whole
+            missingSet = set(missing)
+            for i, name in enumerate(names):
+                if (name in missingSet):
+                    values[i * stride : (i + 1) * stride] = self.values[i * stride : (i + 1) * stride]
+
+            self.values = values
+            return missing
+
+        uuids = [self.uuidSlots[i] for i in indices]
+        values, missing = TransformSampling.sampleTransforms([names[i] for i in indices], uuids)
+        missingSet = set(missing)
+
+        for j, i in enumerate(indices):
+            if (names[i] in missingSet):
+                continue
+            self.values[i * stride : (i + 1) * stride] = values[j * stride : (j + 1) * stride]
+            self.uuidSlots[i] = uuids[j]
+
+        return missing
+
+    def getIndices(self, isDirty = None):
+        '''
+        Returns the indices of the items that have changed since they were last sampled.
+
+        :param isDirty: A function that returns whether the item with a UUID has changed (e.g. SceneWatcher.sceneWatcher.isDirty).
+        Items without a UUID yet always count as changed.
+        :returns list[int]: The indices, or None if 'isDirty' isn't set, meaning every item.
+        '''
+        if (isDirty == None):
+            return None
+
+        return [i for i, uuid in enumerate(self.uuids) if uuid == None or isDirty(uuid)]
+
+    def resolve(self, indices = None):
+        '''
+        Finds items that have been renamed or reparented by their UUIDs, and updates their names, in a single pass
+        (see TransformSampling.resolveUuids()).
+        \nItems without a UUID, or whose UUID isn't found, keep their names. If an item's new name is already in the
+        store (e.g. it was added again after being renamed), the item is removed instead.
+
+        :param list[int] indices: The indices of the items to resolve. If this isn't set, every item is resolved.
+        :returns list[tuple[str, str]]: The old and new name of each renamed item.
+        '''
+        self.compact()
+        names = self.nameSlots
+
+        if (indices == None):
+            indices = range(len(names))
+
+        moves = {}
+        for i, path in zip(indices, TransformSampling.resolveUuids([self.uuidSlots[i] for i in indices])):
+            if (path != None and path != names[i]):
+                moves[names[i]] = path
+
+        if (len(moves) <= 0):
+            return []
+
+        # Names can be swapped between items, but an item can't take a name another item keeps (or took first)
+        taken = set()
+        duplicates = []
+        for name, path in list(moves.items()):
+            if ((path in self.positions and path not in moves) or path in taken):
+                duplicates.append(name)
+                del moves[name]
+            else:
+                taken.add(path)
+
+        self.removeMany(duplicates)
+
+        # Take every old name out before giving out the new ones, so swapped names don't clash.
+        # Removing the duplicates only left gaps, so the positions are still slots
+        indices = [self.positions.pop(name) for name in moves]
+        if (self.sceneIndex != None):
+            for name in moves:
+                self.sceneIndex.discard(name, self.owner)
+
+        for index, path in zip(indices, moves.values()):
+            path = sys.intern(path)
+            self.nameSlots[index] = path
+            self.positions[path] = index
+
+            if (self.sceneIndex != None):
+                self.sceneIndex.add(path, self.owner)
+
+        return list(moves.items())
+
+    def refresh(self, existing = None, isDirty = None):
+        '''
+        Finds renamed and reparented items (see resolve()), removes items that no longer exist in the scene (or aren't
+        transforms anymore), then re-samples the rest.
+        \nExistence and type are checked for every item with a single cmds.ls() call, and the remaining items are
+        sampled in one pass.
+        \nEvery item is always resolved and checked, even if 'isDirty' is set: renaming or reparenting a group changes
+        the paths of everything under it, but only the group itself is changed.
+
+        :param set[str] existing: Optional full paths of the transforms that exist, for refreshing many stores with one
+        cmds.ls() call (see refreshStores()). The store must have been resolved already. If this isn't set, the store
+        is resolved and its own items are checked.
+        :param isDirty: Optional function that returns whether the item with a UUID has changed since it was last
+        sampled (see getIndices()). If it's set, only the changed items are re-sampled.
+        :returns list[str]: The names of the removed items.
+        '''
+        if (existing == None):
+            self.resolve()
+            existing = findTransforms(self.names)
+
+        removed = [name for name in self.names if name not in existing]
+        self.removeMany(removed)
+
+        # Anything that disappeared between the two checks is removed as well
+        missing = self.update(self.getIndices(isDirty))
+        self.removeMany(missing)
+
+        return removed + missing
+
+    def getValues(self):
+        '''
+        Returns a copy of the translate, rotate and scale of every item as one block of values.
+        \nThe block is a copy rather than a view of the store: while a numpy view exists, the store's array can't be
+        resized, so adding or removing items would raise BufferError.
+
+        :returns: A read-only (N, 9) float64 numpy array, or an array('d') if numpy isn't available.
+        '''
+        self.compact()
+
+        if (TransformMath.numpy != None):
+            values = TransformMath.numpy.array(self.values, dtype = TransformMath.numpy.float64).reshape(-1, TransformMath.valuesPerTransform)
+            values.setflags(write = False)
+            return values
+
+        return array('d', self.values)
+
+    def getAttributes(self, index):
+        '''
+        Returns an item's name, translate, rotate and scale as a dict, in the same format as MainWindow.transform.attributes.
+        '''
+        self.compact()
+        return TransformMath.valuesToAttributes(self.nameSlots[index], self.values, index * TransformMath.valuesPerTransform)
+
+    def __len__(self):
+        return len(self.nameSlots) - self.gaps
+
+    def __iter__(self):
+        # Re-check the length each step, so the loop ends safely if items are removed during it
+        i = 0
+        while (i < len(self)):
+            yield itemView(self, i)
+            i += 1
+
+    def __getitem__(self, index):
+        if (index < 0):
+            index += len(self)
+        if (index < 0 or index >= len(self)):
+            raise IndexError("item index out of range")
+
+        return itemView(self, index)
+
+    def __contains__(self, value):
+        return str(value) in self.positions
+
+def findTransforms(names):
+    '''
+    Returns which of the given full paths are transforms in the maya scene, with a single cmds.ls() call.
+    :returns set[str]:
+    '''
+    if (len(names) <= 0):
+        return set()
+
+    return set(cmds.ls(names, long = True, type = 'transform') or [])
+
+def refreshStores(stores, isDirty = None):
+    '''
+    Refreshes many item stores (e.g. every package) at once, checking the items of all of them with a single cmds.ls()
+    call. See itemStore.refresh().
+
+    :param list[itemStore] stores: The stores to refresh.
+    :param isDirty: Optional function that returns whether the item with a UUID has changed since it was last sampled.
+    If it's set, only the changed items are re-sampled. Every item is still resolved and checked.
+    :returns list[list[str]]: The names of the items removed from each store.
+    '''
+    for store in stores:
+        store.resolve()
+
+    existing = findTransforms([name for store in stores for name in store.names])
+    return [store.refresh(existing, isDirty) for store in stores]
+
+class packageIndex:
+    '''
+    Scene-wide reverse index from object names to the packages they're in.
+    \nItem stores created with a packageIndex keep it up to date, so finding which packages an object is in
+    (and whether it's in more than one) is O(1) instead of a scan of every package.
+    '''
+    def __init__(self):
+        self.packages = {}
+        self.conflicts = set()
+
+    def add(self, name, owner):
+        owners = self.packages.setdefault(name, [])
+        if (owner in owners):
+            return
+
+        owners.append(owner)
+        if (len(owners) > 1):
+            self.conflicts.add(name)
+
+    def discard(self, name, owner):
+        owners = self.packages.get(name)
+        if (owners == None or owner not in owners):
+            return
+
+        owners.remove(owner)
+        if (len(owners) <= 1):
+            self.conflicts.discard(name)
+        if (len(owners) <= 0):
+            del self.packages[name]
+
+    def getPackages(self, name):
+        '''
+        Returns the packages an object is in.
+        :param str name: The name of the object in the maya scene.
+        :returns list: The packages the object is in, in the order it was added to them.
+        '''
+        return list(self.packages.get(str(name), []))
+
+    def getConflicts(self):
+        '''
+        Returns the objects that are in more than one package (and would be exported more than once).
+        :returns dict[str, list]: The packages each of those objects is in, keyed by object name.
+        '''
+        return {name : list(self.packages[name]) for name in sorted(self.conflicts)}
+
+    def clear(self):
+        self.packages = {}
+        self.conflicts = set()
+
+    def __contains__(self, name):
+        return str(name) in self.packages
+
+class itemView:
+    '''
+    A lightweight view of one item in an itemStore, for code that expects MainWindow.transform objects.
+    \nViews refer to items by index, so they should not be kept after items have been removed from the store.
+    '''
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def name(self):
+        return self.store.names[self.index]
+
+    @property
+    def uuid(self):
+        return self.store.uuids[self.index]
+
+    @property
+    def attributes(self):
+        # Built on request, changing the returned dict doesn't change the store
+        return self.store.getAttributes(self.index)
+
+    def update(self, force = True):
+        '''
+        Checks and returns whether a maya transform exists in the scene under this item's name.
+        \nIf 'force' is enabled, this item's attributes will be updated to match those of the maya transform.
+
+        :param bool force: Whether or not this item's attributes should be updated.
+        :returns bool: True if a maya transform exists in the scene under the same name as this.
+        '''
+        if (force):
+            return len(self.store.update([self.index])) <= 0
+
+        return len(TransformSampling.sampleTransforms([self.name])[1]) <= 0
+
+    # Return the name of the maya transform for easy integration/display with UI objects.
+    def __str__(self):
+        return self.name
+
+    # Allow equal (==) operator to be used with this so items can be checked via name
+    def __eq__(self, value):
+        return self.name == str(value)
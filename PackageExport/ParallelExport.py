@@ -0,0 +1,215 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+# The script each worker process runs. Workers are started as: <executable> <workerScript> <job file>
+workerScript = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'FBXWorker.py')
+
+def findMayapy():
+    '''
+    Returns the path to the mayapy executable used for worker processes.
+    \nThe PACKAGE_EXPORT_MAYAPY environment variable takes priority, otherwise mayapy is expected next to the
+    running maya executable.
+
+    :returns str: The path to mayapy, or None if it couldn't be found.
+    '''
+    override = os.environ.get('PACKAGE_EXPORT_MAYAPY')
+    if (override):
+        return override
+
+    name = 'mayapy.exe' if sys.platform == 'win32' else 'mayapy'
+    path = os.path.join(os.path.dirname(sys.executable), name)
+
+    if (os.path.isfile(path)):
+        return path
+
+    return None
+
+def writeJobFile(path, jobs, properties):
+    '''
+    Writes the job file read by a worker process.
+    \nThe file is a JSON object with:
+    - 'properties', a list of [FBX property, value] pairs to apply before exporting.
+    - 'jobs', a list of {'name', 'scene', 'node', 'output'} objects. Each job opens 'scene', moves 'node' back to the origin
+    and exports it to the FBX file 'output'.
+
+    :param str path: Where to write the job file.
+    :param list[dict] jobs: The jobs for the worker.
+    :param list[tuple[str, int]] properties: The FBX properties for the worker to apply.
+    '''
+    with open(path, 'w') as f:
+        json.dump({'properties' : properties, 'jobs' : jobs}, f)
+
+def reportResult(name, status, message = ""):
+    '''
+    Reports the result of a job from a worker process to the pool, as one JSON line on stdout.
+
+    :param str name: The name of the job.
+    :param str status: 'done' or 'failed'.
+    :param str message: Optional details, e.g. the error a job failed with.
+    '''
+    print(json.dumps({'job' : name, 'status' : status, 'message' : message}), flush = True)
+
+class workerPool:
+    '''
+    Runs FBX export jobs across a pool of background worker processes (headless mayapy by default),
+    and collects their progress and failures centrally.
+    \nAny executable that follows the same protocol can stand in for mayapy, e.g. a stub for testing:
+    it's started as '<executable> <script> <job file>' (see writeJobFile()), and reports each job with one
+    JSON line on stdout (see reportResult()).
+    '''
+    def __init__(self, executable = None, workerCount = 4, script = workerScript):
+        '''
+        :param str executable: The worker executable. Defaults to findMayapy().
+        :param int workerCount: The maximum amount of worker processes to run at once.
+        :param str script: The script passed to each worker.
+        '''
+        self.executable = executable or findMayapy()
+        self.workerCount = max(1, workerCount)
+        self.script = script
+
+        self.jobs = []
+        self.workers = []
+        self.running = 0
+        self.tempDir = None
+
+    def start(self, jobs, properties):
+        '''
+        Splits the jobs between the workers and starts them, without waiting for them.
+        Call poll() until it returns False, then getResults(), and close() when done (even if an error was raised).
+
+        :param list[dict] jobs: The jobs to run (see writeJobFile()). Each job needs a unique 'name'.
+        :param list[tuple[str, int]] properties: The FBX properties for every worker to apply.
+        '''
+        if (self.executable == None):
+            raise RuntimeError("Couldn't find mayapy. Set the PACKAGE_EXPORT_MAYAPY environment variable to its path.")
+
+        import queue
+
+        self.jobs = jobs
+        self.results = {}
+        self.messages = queue.Queue()
+        self.workers = []
+        self.cancelled = False
+
+        chunks = [jobs[i::self.workerCount] for i in range(self.workerCount)]
+        chunks = [chunk for chunk in chunks if len(chunk) > 0]
+
+        self.tempDir = tempfile.mkdtemp(prefix = 'packageExportJobs_')
+        for i, chunk in enumerate(chunks):
+            jobFile = os.path.join(self.tempDir, f"worker{i}.json")
+            writeJobFile(jobFile, chunk, properties)
+
+            process = subprocess.Popen([self.executable, self.script, jobFile],
+                                       stdout = subprocess.PIPE, stderr = subprocess.STDOUT,
+                                       universal_newlines = True)
+            worker = {'process' : process, 'jobs' : chunk, 'log' : []}
+            self.workers.append(worker)
+
+            # Read each worker's output on its own thread, so one quiet worker can't block the others
+            threading.Thread(target = self.readOutput, args = (worker, self.messages), daemon = True).start()
+
+        self.running = len(self.workers)
+
+    def poll(self, progress = None, timeout = 0):
+        '''
+        Collects the results workers have reported since the last poll, without blocking for longer than 'timeout'.
+
+        :param mainProgressBar progress: Optional progress bar, stepped once per finished job. If the user cancels,
+        the workers are stopped and their unfinished jobs are reported as cancelled.
+        :param float timeout: How long to wait for the first result, in seconds.
+        :returns bool: Whether any worker is still running.
+        '''
+        import queue
+
+        if (progress and progress.isCancelled()):
+            self.cancel()
+
+        while (self.running > 0):
+            try:
+                worker, result = self.messages.get(timeout = timeout) if timeout > 0 else self.messages.get_nowait()
+            except queue.Empty:
+                break
+
+            # Only wait for the first result, then take whatever else is ready
+            timeout = 0
+
+            if (result == None):
+                self.running -= 1
+                self.collectUnfinished(worker, self.results, self.cancelled)
+                continue
+
+            self.results[result['job']] = result
+            if (progress):
+                progress.step()
+
+        return self.running > 0
+
+    def cancel(self):
+        '''
+        Stops the workers. Their unfinished jobs are reported as cancelled once they've exited.
+        '''
+        if (self.cancelled):
+            return
+
+        self.cancelled = True
+        for worker in self.workers:
+            if (worker['process'].poll() == None):
+                worker['process'].kill()
+
+    def getResults(self):
+        '''
+        :returns list[dict]: One {'job', 'status', 'message'} result per job, in the same order as the jobs given to start().
+        '''
+        return [self.results[job['name']] for job in self.jobs]
+
+    def close(self):
+        '''
+        Stops any workers that are still running and deletes their job files.
+        '''
+        import shutil
+
+        if (self.running > 0):
+            self.cancel()
+
+        if (self.tempDir):
+            shutil.rmtree(self.tempDir, ignore_errors = True)
+            self.tempDir = None
+
+    def readOutput(self, worker, messages):
+        '''
+        Reads a worker's output until it exits, passing job results to the pool. Other output is kept as the worker's log.
+        '''
+        for line in worker['process'].stdout:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                result = None
+
+            if (type(result) == dict and 'job' in result):
+                messages.put((worker, result))
+            else:
+                worker['log'].append(line.rstrip())
+
+        worker['process'].wait()
+        messages.put((worker, None))
+
+    def collectUnfinished(self, worker, results, cancelled):
+        '''
+        Reports the jobs of an exited worker that never reported a result as failed (or cancelled).
+        '''
+        code = worker['process'].returncode
+        log = "\n".join(worker['log'][-5:])
+
+        for job in worker['jobs']:
+            if (job['name'] in results):
+                continue
+
+            if (cancelled):
+                results[job['name']] = {'job' : job['name'], 'status' : 'cancelled', 'message' : ""}
+            else:
+                results[job['name']] = {'job' : job['name'], 'status' : 'failed',
+                                        'message' : f"Worker exited with code {code} before finishing.\n{log}"}
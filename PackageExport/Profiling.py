@@ -0,0 +1,187 @@
+'''
+Phase-level timing and memory instrumentation for exports and auto-generate.
+\nAn exportProfile records the wall time of each phase of an operation (e.g. 'fbx/export'), the time spent on each
+package, the size of the files written, and optionally the peak Python memory of each phase (with tracemalloc).
+Phases can be nested, and their times include the phases nested in them.
+\nReport format (see exportProfile.toDict()):
+    {"name", "seconds", "peakMemory", "phases": {<phase>: {"seconds", "count", "peakMemory", "bytes"}},
+     "packages": {<fileName>: {"seconds", "bytes", "phases": {<phase>: <seconds>}}}}
+\nMemory is in bytes, and is None if it wasn't traced.
+'''
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# The amount of slowest packages listed in the summary
+summaryPackageCount = 10
+
+class exportProfile:
+    def __init__(self, name, traceMemory = False):
+        '''
+        :param str name: The name of the operation, shown in the summary.
+        :param bool traceMemory: Whether to record peak memory with tracemalloc while the profile is started.
+        Tracing slows down every allocation, so it's off by default.
+        '''
+        self.name = name
+        self.traceMemory = traceMemory
+        self.ownsTracing = False
+        self.startTime = time.perf_counter()
+        self.seconds = 0.0
+        self.peakMemory = None
+        self.phases = {}
+        self.packages = {}
+        self.openPhases = []
+
+    def start(self):
+        '''
+        Starts tracing memory, if enabled. Call stop() when the operation is finished.
+        '''
+        if (self.traceMemory and not tracemalloc.is_tracing()):
+            tracemalloc.start()
+            self.ownsTracing = True
+
+    def stop(self):
+        self.seconds = time.perf_counter() - self.startTime
+
+        if (tracemalloc.is_tracing()):
+            self.updatePeaks()
+        if (self.ownsTracing):
+            tracemalloc.stop()
+            self.ownsTracing = False
+
+    def updatePeaks(self):
+        '''
+        Folds the memory peak since the last update into every open phase, then resets it,
+        so each phase's peak covers exactly its own lifetime (including nested phases).
+        '''
+        peak = tracemalloc.get_traced_memory()[1]
+
+        for entry in self.openPhases:
+            entry['peakMemory'] = max(entry['peakMemory'] or 0, peak)
+        self.peakMemory = max(self.peakMemory or 0, peak)
+
+        # tracemalloc.reset_peak() is new in Python 3.9, before then peaks are since tracing started
+        if (hasattr(tracemalloc, 'reset_peak')):
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def phase(self, name, package = None):
+        '''
+        Times a with block as a phase. Entering the same phase again adds to its time.
+
+        :param str name: The name of the phase, e.g. 'json/write'.
+        :param str package: Optional filename of the package the block works on, to also add the time to it.
+        '''
+        entry = self.phases.get(name)
+        if (entry == None):
+            entry = self.phases[name] = {'seconds' : 0.0, 'count' : 0, 'peakMemory' : None, 'bytes' : 0}
+
+        tracing = tracemalloc.is_tracing()
+        if (tracing):
+            self.updatePeaks()
+        self.openPhases.append(entry)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+
+            if (tracing and tracemalloc.is_tracing()):
+                self.updatePeaks()
+            self.openPhases.pop()
+
+            entry['seconds'] += seconds
+            entry['count'] += 1
+
+            if (package != None):
+                packageEntry = self.getPackage(package)
+                packageEntry['seconds'] += seconds
+                packageEntry['phases'][name] = packageEntry['phases'].get(name, 0.0) + seconds
+
+    def iterPhase(self, name, steps):
+        '''
+        Runs a generator of steps (e.g. Export.iterExportFBX()) as a phase, returning its result.
+        \nThe phase is left while the generator is suspended, so time between steps (e.g. between the slices of a
+        time-sliced export) isn't counted.
+        '''
+        try:
+            while (True):
+                with self.phase(name):
+                    try:
+                        next(steps)
+                    except StopIteration as stop:
+                        return stop.value
+                yield
+        finally:
+            steps.close()
+
+    def getPackage(self, fileName):
+        entry = self.packages.get(fileName)
+        if (entry == None):
+            entry = self.packages[fileName] = {'seconds' : 0.0, 'bytes' : 0, 'phases' : {}}
+        return entry
+
+    def addOutput(self, path, package = None):
+        '''
+        Adds the size of a written file to the innermost open phase (and a package, if given).
+        '''
+        if (not path or not os.path.isfile(path)):
+            return
+
+        size = os.path.getsize(path)
+        if (len(self.openPhases) > 0):
+            self.openPhases[-1]['bytes'] += size
+        if (package != None):
+            self.getPackage(package)['bytes'] += size
+
+    def toDict(self):
+        return {
+            'name' : self.name,
+            'seconds' : self.seconds,
+            'peakMemory' : self.peakMemory,
+            'phases' : self.phases,
+            'packages' : self.packages
+        }
+
+    def writeReport(self, path):
+        '''
+        Writes the profile as a JSON report (see the module's docstring for the format).
+        '''
+        with open(path, 'w') as f:
+            f.write(json.dumps(self.toDict(), indent = 4))
+
+    def summary(self):
+        '''
+        Returns the profile as a table, to print to the script editor.
+        '''
+        lines = [f"{self.name} profile: {self.seconds:.3f}s, peak memory {formatBytes(self.peakMemory)}",
+                 f"    {'phase':<24}{'seconds':>10}{'count':>8}{'peak memory':>14}{'output':>12}"]
+
+        for name, entry in self.phases.items():
+            lines.append(f"    {name:<24}{entry['seconds']:>10.3f}{entry['count']:>8}"
+                         f"{formatBytes(entry['peakMemory']):>14}{formatBytes(entry['bytes'] or None):>12}")
+
+        if (len(self.packages) > 0):
+            slowest = sorted(self.packages.items(), key = lambda item: item[1]['seconds'], reverse = True)[:summaryPackageCount]
+
+            lines.append(f"    {'slowest packages':<24}{'seconds':>10}{'':>8}{'':>14}{'output':>12}")
+            for fileName, entry in slowest:
+                lines.append(f"    {fileName:<24}{entry['seconds']:>10.3f}{'':>8}{'':>14}{formatBytes(entry['bytes'] or None):>12}")
+
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.name
+
+def formatBytes(size):
+    if (size == None):
+        return '-'
+
+    for unit in ('B', 'KB', 'MB'):
+        if (size < 1024):
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
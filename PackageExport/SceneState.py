@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+
+import maya.cmds as cmds
+
+# Local transform attributes and the values that leave a transform where its parent is
+neutralValues = {
+    'translate' : (0, 0, 0),
+    'rotate' : (0, 0, 0),
+    'scale' : (1, 1, 1)
+}
+
+@contextmanager
+def undoDisabled():
+    '''
+    Turns off undo for the duration of a with block, without flushing the undo queue, then restores it.
+    \nChanges made inside the block don't grow the undo queue, so they should leave the scene as it was before the
+    block ends (see neutralTransform()).
+    '''
+    state = cmds.undoInfo(query = True, stateWithoutFlush = True)
+    cmds.undoInfo(stateWithoutFlush = False)
+    try:
+        yield
+    finally:
+        cmds.undoInfo(stateWithoutFlush = state)
+
+@contextmanager
+def neutralTransform(name):
+    '''
+    Moves a maya transform back to its parent's origin (no translate/rotate, scale of 1) for the duration of a with block.
+    \nThe transform's own values are saved first and restored when the block ends, even if it raised an error,
+    so nothing is duplicated and the scene is left as it was.
+    \nIf the values can't be changed (e.g. they're locked or connected), a duplicate is neutralized and deleted instead.
+    Use this inside undoDisabled(), so the changes aren't added to the undo queue.
+
+    :param str name: The name of the transform in the maya scene.
+    :returns str: (from the with statement) The name of the neutralized transform, to select/export.
+    '''
+    saved = {attr : cmds.getAttr(f"{name}.{attr}")[0] for attr in neutralValues}
+
+    try:
+        for attr, value in neutralValues.items():
+            cmds.setAttr(f"{name}.{attr}", *value, type = 'double3')
+        settable = True
+    except RuntimeError:
+        restoreAttributes(name, saved)
+        settable = False
+
+    if (not settable):
+        with neutralDuplicate(name) as dupe:
+            yield dupe
+        return
+
+    try:
+        yield name
+    finally:
+        restoreAttributes(name, saved)
+
+@contextmanager
+def neutralDuplicate(name):
+    '''
+    Duplicates a maya transform and moves the duplicate back to its parent's origin for the duration of a with block.
+    The duplicate is deleted when the block ends, even if it raised an error.
+    '''
+    dupe = cmds.duplicate(name)[0]
+    try:
+        for attr, value in neutralValues.items():
+            cmds.setAttr(f"{dupe}.{attr}", *value, type = 'double3')
+
+        yield dupe
+    finally:
+        cmds.delete(dupe)
+
+def restoreAttributes(name, saved):
+    for attr, value in saved.items():
+        try:
+            cmds.setAttr(f"{name}.{attr}", *value, type = 'double3')
+        except RuntimeError:
+            # Values that couldn't be changed were never changed
+            pass
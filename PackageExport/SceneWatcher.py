@@ -0,0 +1,179 @@
+'''
+Tracks which packaged transforms have changed in the maya scene since they were last sampled, with OpenMaya callbacks,
+so refreshing and exporting only re-sample the items that changed.
+\nEach watched transform gets a single attribute changed callback. Removing, renaming and reparenting are caught by
+scene-wide callbacks, instead of more callbacks per transform. Callbacks only add the transform's UUID to the dirty set,
+and return straight away once it's in it, so dragging objects around only costs a set lookup per change.
+\nRenaming or reparenting a group only marks the group, not the transforms under it whose paths change too. The dirty
+set only decides what gets re-sampled; every item's path is still resolved by UUID on refresh (see PackageItems.refreshStores()).
+\nValues driven by animation or constraints don't send attribute changed messages, use a full refresh for those.
+\nshapeWatcher tracks edited mesh shapes the same way, so cached fingerprints (see FingerprintCache) of shapes that
+haven't changed are reused without reading their meshes.
+'''
+import maya.api.OpenMaya as om
+
+# Attributes whose changes make an item dirty, as returned by MPlug.partialName()
+watchedAttributes = {'t', 'tx', 'ty', 'tz', 'r', 'rx', 'ry', 'rz', 's', 'sx', 'sy', 'sz', 'rp', 'rpx', 'rpy', 'rpz'}
+
+class sceneWatcher:
+    '''
+    The set of changed ('dirty') transforms, out of the transforms being watched, by UUID.
+    \nTransforms that aren't watched count as dirty, so items added since the last sync() are always re-sampled.
+    '''
+    def __init__(self):
+        # UUID -> attribute changed callback ID
+        self.callbacks = {}
+        self.sceneCallbacks = []
+        self.dirty = set()
+
+        # Maya keeps a reference to each callback, so share one bound method rather than making one per node
+        self.callback = self.onAttributeChanged
+
+    def isDirty(self, uuid):
+        return uuid in self.dirty or uuid not in self.callbacks
+
+    def clean(self, uuids):
+        '''
+        Marks transforms as up to date, after they've been re-sampled.
+        '''
+        self.dirty.difference_update(uuids)
+
+    def sync(self, uuids):
+        '''
+        Watches exactly the given transforms: callbacks are added for new ones and removed for the rest, in bulk.
+        :param list[str] uuids: The UUIDs of the transforms, e.g. of every package's items. None entries are skipped.
+        '''
+        uuids = set(uuids)
+        uuids.discard(None)
+
+        self.unwatch([uuid for uuid in self.callbacks if uuid not in uuids])
+        self.watch([uuid for uuid in uuids if uuid not in self.callbacks])
+
+    def watch(self, uuids):
+        '''
+        Adds callbacks for many transforms in a single pass. Transforms that aren't in the scene are skipped.
+        '''
+        if (len(uuids) <= 0):
+            return
+
+        if (len(self.sceneCallbacks) <= 0):
+            self.addSceneCallbacks()
+
+        selection = om.MSelectionList()
+
+        for uuid in uuids:
+            selection.clear()
+            try:
+                selection.add(om.MUuid(uuid))
+            except (RuntimeError, ValueError):
+                continue
+
+            self.callbacks[uuid] = self.addCallback(selection.getDependNode(0), uuid)
+
+    def unwatch(self, uuids):
+        '''
+        Removes the callbacks of many transforms at once.
+        '''
+        ids = [self.callbacks.pop(uuid) for uuid in uuids if uuid in self.callbacks]
+        self.dirty.difference_update(uuids)
+        removeCallbacks(ids)
+
+        if (len(self.callbacks) <= 0):
+            removeCallbacks(self.sceneCallbacks)
+            self.sceneCallbacks = []
+
+    def clear(self):
+        self.unwatch(list(self.callbacks))
+        self.dirty = set()
+
+    def addCallback(self, node, uuid):
+        return om.MNodeMessage.addAttributeChangedCallback(node, self.callback, uuid)
+
+    def addSceneCallbacks(self):
+        self.sceneCallbacks = [
+            om.MDGMessage.addNodeRemovedCallback(self.onNodeChanged, 'transform'),
+            om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, self.onNameChanged),
+            om.MDagMessage.addParentAddedCallback(self.onParentAdded)
+        ]
+
+    #region Callbacks
+    def onAttributeChanged(self, message, plug, otherPlug, uuid):
+        if (uuid in self.dirty or not (message & om.MNodeMessage.kAttributeSet)):
+            return
+
+        if (plug.partialName() in watchedAttributes):
+            self.dirty.add(uuid)
+
+    def onNodeChanged(self, node, clientData = None):
+        uuid = om.MFnDependencyNode(node).uuid().asString()
+        if (uuid in self.callbacks):
+            self.dirty.add(uuid)
+
+    def onNameChanged(self, node, previousName, clientData = None):
+        self.onNodeChanged(node)
+
+    def onParentAdded(self, child, parent, clientData = None):
+        self.onNodeChanged(child.node())
+    #endregion Callbacks
+
+    def __len__(self):
+        return len(self.callbacks)
+
+class shapeWatcher(sceneWatcher):
+    '''
+    The set of mesh shapes that may have been edited since they were last fingerprinted (see FingerprintCache), by UUID.
+    \nEach watched shape gets a single node dirty callback, which is sent whenever its mesh has to be recomputed: its
+    history or its components were edited, its points were moved, etc. So a clean shape is known not to have changed,
+    without reading its mesh.
+    \nShapes that are deleted stop being watched, and so does every shape when another scene is opened, since their
+    callbacks go with them.
+    '''
+    def __init__(self):
+        super().__init__()
+        self.callback = self.onNodeDirty
+
+    def forget(self, uuids):
+        '''
+        Removes the callbacks of many shapes, leaving the scene callbacks in place (unlike unwatch()), so it can be
+        called from them.
+        '''
+        ids = [self.callbacks.pop(uuid) for uuid in uuids if uuid in self.callbacks]
+        self.dirty.difference_update(uuids)
+        removeCallbacks(ids)
+
+    def addCallback(self, node, uuid):
+        return om.MNodeMessage.addNodeDirtyPlugCallback(node, self.callback, uuid)
+
+    def addSceneCallbacks(self):
+        self.sceneCallbacks = [
+            om.MDGMessage.addNodeRemovedCallback(self.onNodeRemoved, 'mesh'),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeNew, self.onSceneChanged),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen, self.onSceneChanged)
+        ]
+
+    #region Callbacks
+    def onNodeDirty(self, node, plug, uuid):
+        self.dirty.add(uuid)
+
+    def onNodeRemoved(self, node, clientData = None):
+        self.forget([om.MFnDependencyNode(node).uuid().asString()])
+
+    def onSceneChanged(self, clientData = None):
+        self.forget(list(self.callbacks))
+    #endregion Callbacks
+
+def removeCallbacks(ids):
+    '''
+    Removes many callbacks at once. Callbacks that were already removed (e.g. with their node) are skipped.
+    '''
+    if (len(ids) <= 0):
+        return
+
+    try:
+        om.MMessage.removeCallbacks(ids)
+    except RuntimeError:
+        for callbackId in ids:
+            try:
+                om.MMessage.removeCallback(callbackId)
+            except RuntimeError:
+                pass
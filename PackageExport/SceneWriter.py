@@ -0,0 +1,109 @@
+import json
+
+# Formats the JSON scene can be written in
+formats = {
+    'pretty' : "Pretty (indented)",
+    'compact' : "Compact",
+    'ndjson' : "Newline-delimited",
+    'binary' : "Binary sidecar (float64)",
+    'binary32' : "Binary sidecar (float32)"
+}
+
+# File extension of each format
+extensions = {
+    'pretty' : 'json',
+    'compact' : 'json',
+    'ndjson' : 'ndjson',
+    'binary' : 'json',
+    'binary32' : 'json'
+}
+
+# Value type of each format written with a binary sidecar (see BinaryScene.writeScene())
+binaryTypes = {
+    'binary' : '<f8',
+    'binary32' : '<f4'
+}
+
+def writeScene(f, rootAttributes, packages, jsonFormat = 'pretty'):
+    '''
+    Writes the whole JSON scene to a file in one go (see iterWriteScene()).
+    '''
+    for _ in iterWriteScene(f, rootAttributes, packages, jsonFormat):
+        pass
+
+def iterWriteScene(f, rootAttributes, packages, jsonFormat = 'pretty'):
+    '''
+    Writes the JSON scene to a file incrementally, one transform at a time, so the whole scene never has to be
+    held in memory (as a dict or as one big string). Yields after each package is written, so the export can be
+    time-sliced and cancelled between packages; the file is only complete once the generator finishes.
+    \nFormats:
+    - 'pretty' is indented by 4 spaces, and is identical to json.dumps(scene, indent = 4).
+    - 'compact' is the same scene without any whitespace.
+    - 'ndjson' is newline-delimited: the first line is {"rootTransform": ...} and each following line is one package,
+    so the scene can be read package by package.
+
+    :param f: The file to write to, opened for writing text.
+    :param dict rootAttributes: The root transform's attributes (see MainWindow.transform.attributes).
+    :param packages: An iterable of {'fileName', 'transforms', 'path'} dicts. 'transforms' can be a generator of
+    attribute dicts (see TransformMath.iterAttributes()), it's only iterated while the package is being written.
+    :param str jsonFormat: 'pretty', 'compact' or 'ndjson'.
+    '''
+    if (jsonFormat == 'ndjson'):
+        f.write(dumps({"rootTransform" : rootAttributes}, None) + "\n")
+        for package in packages:
+            f.writelines(packageChunks(package, None, 0))
+            f.write("\n")
+            yield
+        return
+
+    indent = 4 if jsonFormat == 'pretty' else None
+    separator = ": " if indent else ":"
+
+    f.write("{" + newline(indent, 1) + '"rootTransform"' + separator + dumps(rootAttributes, indent, 1) + ",")
+    f.write(newline(indent, 1) + '"packages"' + separator + "[")
+
+    empty = True
+    for package in packages:
+        f.write(("" if empty else ",") + newline(indent, 2))
+        f.writelines(packageChunks(package, indent, 2))
+        empty = False
+        yield
+
+    f.write(("]" if empty else newline(indent, 1) + "]") + newline(indent, 0) + "}")
+
+def packageChunks(package, indent, depth):
+    '''
+    Yields one package as pieces of JSON text, starting with its opening brace.
+
+    :param dict package: A {'fileName', 'transforms', 'path'} dict.
+    :param int indent: Spaces per indentation level, or None for compact JSON.
+    :param int depth: The indentation level of the package's opening brace.
+    '''
+    separator = ": " if indent else ":"
+
+    yield "{" + newline(indent, depth + 1) + '"fileName"' + separator + dumps(package["fileName"], indent) + ","
+    yield newline(indent, depth + 1) + '"transforms"' + separator + "["
+
+    empty = True
+    for transform in package["transforms"]:
+        yield ("" if empty else ",") + newline(indent, depth + 2) + dumps(transform, indent, depth + 2)
+        empty = False
+
+    yield ("]" if empty else newline(indent, depth + 1) + "]") + ","
+    yield newline(indent, depth + 1) + '"path"' + separator + dumps(package["path"], indent)
+    yield newline(indent, depth) + "}"
+
+def newline(indent, depth):
+    if (indent == None):
+        return ""
+    return "\n" + " " * (indent * depth)
+
+def dumps(value, indent, depth = 0):
+    '''
+    Returns a value as JSON text, indented to sit at the given depth of the scene.
+    '''
+    if (indent == None):
+        return json.dumps(value, separators = (",", ":"))
+
+    # Strings are escaped by json.dumps(), so every newline in the output is a line break
+    return json.dumps(value, indent = indent).replace("\n", newline(indent, depth))
@@ -0,0 +1,231 @@
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+def getFingerprint(shape, cache = None):
+    '''
+    Returns a cheap topology fingerprint for a mesh shape.
+    \nShapes that cmds.polyCompare() considers similar always have the same fingerprint, so only shapes with
+    matching fingerprints need to be compared.
+    \nThe fingerprint contains:
+    - The vertex, edge, face and face-vertex counts.
+    - The names of the UV sets and the amount of UVs in each.
+    - A histogram of the amount of vertices per face.
+
+    :param str shape: The name of the mesh shape in the maya scene.
+    :param fingerprintCache cache: Optional cache. Shapes that haven't been edited since they were cached are returned
+    without reading their mesh (see fingerprintCache.getUnchanged()). Otherwise, if the shape's token (see
+    getShapeToken()) hasn't changed, the face histogram doesn't need to be rebuilt.
+    :returns tuple: A hashable fingerprint of the shape.
+    '''
+    selection = om.MSelectionList()
+    selection.add(shape)
+
+    if (cache != None):
+        uuid = om.MFnDependencyNode(selection.getDependNode(0)).uuid().asString()
+        fingerprint = cache.getUnchanged(uuid)
+        if (fingerprint != None):
+            return fingerprint
+
+    mesh = om.MFnMesh(selection.getDagPath(0))
+
+    faceVertexCounts, faceVertices = mesh.getVertices()
+    counts = getTopologyCounts(mesh)
+
+    if (cache != None):
+        token = getShapeToken(counts, faceVertexCounts, faceVertices)
+        fingerprint = cache.get(uuid, token)
+
+        if (fingerprint == None):
+            fingerprint = counts + (getFaceHistogram(faceVertexCounts),)
+            cache.set(uuid, token, fingerprint)
+
+        return fingerprint
+
+    return counts + (getFaceHistogram(faceVertexCounts),)
+
+def getTopologyCounts(mesh):
+    '''
+    Returns the parts of a mesh's fingerprint that can be queried without iterating over its faces.
+
+    :param MFnMesh mesh: The mesh to query.
+    :returns tuple: The vertex, edge, face and face-vertex counts, and the name and size of each UV set.
+    '''
+    uvSets = tuple((uvSet, mesh.numUVs(uvSet)) for uvSet in mesh.getUVSetNames())
+
+    return (mesh.numVertices, mesh.numEdges, mesh.numPolygons, mesh.numFaceVertices, uvSets)
+
+def getShapeToken(counts, faceVertexCounts, faceVertices):
+    '''
+    Returns a token that changes whenever a mesh's topology is edited, for checking cached fingerprints of shapes that
+    weren't watched for edits (see fingerprintCache.getUnchanged()), e.g. after the cache is loaded from the scene.
+    \nThe token holds the topology counts and a checksum of the face-vertex counts and connects, so topology edits that
+    keep the counts are caught. Moving points doesn't change it, since the fingerprint doesn't depend on them.
+    The checksum runs over the raw bytes, so it costs far less than the face histogram it saves.
+
+    :param tuple counts: The mesh's topology counts (see getTopologyCounts()).
+    :param faceVertexCounts: The amount of vertices of each face, from MFnMesh.getVertices().
+    :param faceVertices: The vertex index of each face-vertex, from MFnMesh.getVertices().
+    :returns tuple: A JSON-serializable token.
+    '''
+    import zlib
+    from array import array
+
+    checksum = zlib.crc32(array('i', faceVertexCounts).tobytes())
+    checksum = zlib.crc32(array('i', faceVertices).tobytes(), checksum)
+
+    return counts + (checksum,)
+
+def getFaceHistogram(faceVertexCounts):
+    '''
+    Returns a histogram of the amount of vertices per face of a mesh.
+
+    :param faceVertexCounts: The amount of vertices of each face, from MFnMesh.getVertices().
+    :returns tuple[tuple[int, int]]: Pairs of (vertices per face, amount of faces), sorted by vertices per face.
+    '''
+    histogram = {}
+    for count in faceVertexCounts:
+        histogram[count] = histogram.get(count, 0) + 1
+
+    return tuple(sorted(histogram.items()))
+
+def collapseInstances(shapes, progress = None):
+    '''
+    Collapses maya instances (several transforms sharing one shape node) down to one path per shape node, in a single pass.
+    \nInstances are guaranteed to be identical, so only one path per shape node needs to be fingerprinted and compared.
+    The other paths can be added back to its group afterwards with expandInstances().
+
+    :param list[str] shapes: The full paths of the mesh shapes in the maya scene.
+    :param mainProgressBar progress: Optional progress bar, stepped once per shape.
+    :returns tuple[list[str], dict[str, list[str]]]: The first path to each unique shape node, and the paths to
+    every instanced shape node keyed by that first path.
+    '''
+    byNode = {}
+
+    for shape in shapes:
+        if (progress):
+            progress.step()
+
+        selection = om.MSelectionList()
+        selection.add(shape)
+        dagPath = selection.getDagPath(0)
+
+        # Only instanced shapes need to be identified by their node, everything else is unique by path
+        key = shape
+        if (dagPath.isInstanced()):
+            key = om.MFnDependencyNode(dagPath.node()).uuid().asString()
+
+        byNode.setdefault(key, []).append(shape)
+
+    uniqueShapes = []
+    instances = {}
+    for paths in byNode.values():
+        uniqueShapes.append(paths[0])
+
+        if (len(paths) > 1):
+            instances[paths[0]] = paths
+
+    return uniqueShapes, instances
+
+def expandInstances(shapes, instances):
+    '''
+    Replaces the shapes collapsed by collapseInstances() with the paths to all of their instances.
+
+    :param list[str] shapes: The full paths of mesh shapes returned by collapseInstances().
+    :param dict[str, list[str]] instances: The instances returned by collapseInstances().
+    :returns list[str]: The full paths of the shapes, including every instance.
+    '''
+    expanded = []
+    for shape in shapes:
+        expanded += instances.get(shape, [shape])
+
+    return expanded
+
+def getParentTransforms(shapes):
+    '''
+    Returns the transform of each shape path, without querying the maya scene.
+
+    :param list[str] shapes: The full paths of mesh shapes in the maya scene.
+    :returns list[str]: The full path of each shape's parent transform.
+    '''
+    return [shape.rsplit('|', 1)[0] for shape in shapes]
+
+def bucketShapes(shapes, progress = None, cache = None):
+    '''
+    Sorts shapes into buckets of shapes with identical fingerprints, in a single pass.
+
+    :param list[str] shapes: The names of the mesh shapes in the maya scene.
+    :param mainProgressBar progress: Optional progress bar, stepped once per shape.
+    :param fingerprintCache cache: Optional cache of previously computed fingerprints.
+    :returns list[list[str]]: The buckets, in the order their first shape appeared in.
+    '''
+    buckets = {}
+
+    for shape in shapes:
+        if (progress):
+            if (progress.isCancelled()):
+                break
+            progress.step()
+
+        buckets.setdefault(getFingerprint(shape, cache), []).append(shape)
+
+    return list(buckets.values())
+
+def groupSimilarShapes(shapes, progress = None, cache = None):
+    '''
+    Groups shapes that cmds.polyCompare() considers similar (based on face descriptions and UV sets).
+    \nShapes are bucketed by fingerprint first, so polyCompare is only ever run between shapes in the same bucket.
+
+    :param list[str] shapes: The names of the mesh shapes in the maya scene.
+    :param mainProgressBar progress: Optional progress bar, stepped once per shape fingerprinted and once per shape grouped.
+    If the user cancels, the groups completed so far are returned.
+    :param fingerprintCache cache: Optional cache of previously computed fingerprints.
+    :returns list[list[str]]: Groups of similar shapes. The first shape of each group is the one the others were compared to.
+    '''
+    groups = []
+
+    for bucket in bucketShapes(shapes, progress, cache):
+        remaining = bucket
+
+        while (len(remaining) > 0):
+            if (progress and progress.isCancelled()):
+                return groups
+
+            # Take a shape from the list to base the group off of
+            group = [remaining.pop()]
+            others = []
+
+            for shape in remaining:
+                if (cmds.polyCompare(group[0], shape, faceDesc = True, uvSets = True) == 0):
+                    group.append(shape)
+                else:
+                    others.append(shape)
+
+            remaining = others
+            groups.append(group)
+
+            if (progress):
+                progress.step(len(group))
+
+    return groups
+
+def findPackageGroups(shapes, progress = None, cache = None):
+    '''
+    Works out which transforms should be packaged together, without touching the UI.
+    \nInstances are collapsed (see collapseInstances()), the unique shapes are grouped by similarity
+    (see groupSimilarShapes()), then every group is expanded back to the transforms of all of its shapes.
+
+    :param list[str] shapes: The full paths of the mesh shapes in the maya scene.
+    :param mainProgressBar progress: Optional progress bar, with a max value of 3 steps per shape.
+    :param fingerprintCache cache: Optional cache of previously computed fingerprints.
+    :returns list[list[str]]: The full paths of the transforms in each group.
+    '''
+    # Shapes shared by several transforms (maya instances) only need to be compared once
+    uniqueShapes, instances = collapseInstances(shapes, progress)
+
+    # Instances of an already checked shape skip fingerprinting and grouping
+    if (progress):
+        progress.step((len(shapes) - len(uniqueShapes)) * 2)
+
+    groups = groupSimilarShapes(uniqueShapes, progress, cache)
+
+    return [getParentTransforms(expandInstances(group, instances)) for group in groups]
@@ -0,0 +1,103 @@
+from array import array
+
+# NumPy ships with maya 2023 and later. Older versions fall back to plain python, which gives the same results.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Values stored per transform: translate xyz, rotate xyz, scale xyz
+valuesPerTransform = 9
+
+# Rows converted at a time by iterAttributes()
+iterChunkSize = 4096
+
+# Values of a transform that hasn't been moved, rotated or scaled. Used when no root transform has been set.
+identityValues = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+
+def attributesToValues(attributes):
+    '''
+    Returns a transform's attributes as a tuple of 9 values.
+
+    :param dict attributes: The 'translate', 'rotate' and 'scale' of a transform (see MainWindow.transform.attributes).
+    :returns tuple[float]: The translate, rotate and scale values.
+    '''
+    return tuple(attributes['translate']) + tuple(attributes['rotate']) + tuple(attributes['scale'])
+
+def valuesToAttributes(name, values, offset = 0):
+    '''
+    Returns 9 transform values as a dict in the same format as MainWindow.transform.attributes.
+
+    :param str name: The name of the transform.
+    :param values: A sequence of values.
+    :param int offset: The index in 'values' where the transform's translate, rotate and scale start.
+    :returns dict: The transform's name, translate, rotate and scale.
+    '''
+    return {
+        'name' : name,
+        'translate' : [float(value) for value in values[offset : offset + 3]],
+        'rotate' : [float(value) for value in values[offset + 3 : offset + 6]],
+        'scale' : [float(value) for value in values[offset + 6 : offset + 9]]
+    }
+
+def toArray(rows):
+    '''
+    Packs rows of 9 transform values into a single block.
+
+    :param list[tuple[float]] rows: The values of each transform.
+    :returns: An (N, 9) float64 numpy array, or a flat array('d') if numpy isn't available.
+    '''
+    if (numpy != None):
+        return numpy.array(rows, dtype = numpy.float64).reshape(-1, valuesPerTransform)
+
+    flat = array('d')
+    for row in rows:
+        flat.extend(row)
+    return flat
+
+def relativeTo(values, root):
+    '''
+    Returns the values of many transforms relative to a root transform, as a new block.
+    \n(i.e. changes that would be applied to the root transform in order to match each transform)
+    \nTranslate and rotate are offset by the root's, scale is divided by the root's. 'values' and 'root' are left unchanged.
+
+    :param values: The block of transform values returned by toArray().
+    :param tuple[float] root: The 9 values of the root transform.
+    :returns: A block of relative values, in the same format as 'values'.
+    '''
+    if (numpy != None):
+        root = numpy.asarray(root, dtype = numpy.float64)
+        relative = numpy.empty_like(values)
+
+        # One broadcast operation per block instead of one per value
+        numpy.subtract(values[:, :6], root[:6], out = relative[:, :6])
+        numpy.divide(values[:, 6:], root[6:], out = relative[:, 6:])
+        return relative
+
+    relative = array('d', values)
+    for i in range(0, len(relative), valuesPerTransform):
+        for j in range(6):
+            relative[i + j] -= root[j]
+        for j in range(6, valuesPerTransform):
+            relative[i + j] /= root[j]
+    return relative
+
+def iterAttributes(names, values):
+    '''
+    Yields each transform in a block as a dict in the same format as MainWindow.transform.attributes.
+    \nUse this at serialization time, so dicts are only built once they're about to be written.
+
+    :param list[str] names: The name of each transform in the block.
+    :param values: The block of transform values returned by toArray() or relativeTo().
+    '''
+    if (numpy == None):
+        for i, name in enumerate(names):
+            yield valuesToAttributes(name, values, i * valuesPerTransform)
+        return
+
+    # Convert a chunk of rows to python floats at a time, so large blocks aren't copied into one huge list
+    for start in range(0, len(names), iterChunkSize):
+        chunk = values[start : start + iterChunkSize].reshape(-1).tolist()
+
+        for i, name in enumerate(names[start : start + iterChunkSize]):
+            yield valuesToAttributes(name, chunk, i * valuesPerTransform)
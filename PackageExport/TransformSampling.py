@@ -0,0 +1,102 @@
+import maya.api.OpenMaya as om
+
+# Amount of values sampled per transform: translate (including the rotate pivot), rotate and scale
+valuesPerTransform = 9
+
+def sampleTransforms(names, uuids = None):
+    '''
+    Samples the translate, rotate and scale of many maya transforms in a single pass through the OpenMaya API,
+    instead of several maya.cmds calls per transform.
+    \nTranslate has the rotate pivot added to it, and all values are in the scene's UI units, to match cmds.getAttr().
+
+    :param list[str] names: The names of the transforms in the maya scene.
+    :param list uuids: Optional list to also get the transforms' UUIDs in. Each name's UUID is written at the
+    name's index (the list is grown if needed), and missing names' UUIDs are left as they were.
+    :returns tuple[array, list[str]]: A flat array of 9 values per name (translate xyz, rotate xyz, scale xyz),
+    and the names that no longer exist in the scene (or aren't transforms). Values for those names are left as 0.
+    '''
+    from array import array
+
+    values = array('d', bytes(8 * valuesPerTransform * len(names)))
+    missing = []
+
+    # Values from the API are in internal units (cm, radians), cmds.getAttr() returns UI units
+    linearScale = om.MDistance(1.0).asUnits(om.MDistance.uiUnit())
+    angularScale = om.MAngle(1.0).asUnits(om.MAngle.uiUnit())
+
+    selection = om.MSelectionList()
+    node = om.MFnDependencyNode()
+    fnTransform = om.MFnTransform()
+
+    if (uuids != None and len(uuids) < len(names)):
+        uuids.extend([None] * (len(names) - len(uuids)))
+
+    for i, name in enumerate(names):
+        selection.clear()
+        try:
+            selection.add(str(name))
+        except RuntimeError:
+            missing.append(name)
+            continue
+
+        dagPath = selection.getDagPath(0)
+        if (node.setObject(dagPath.node()).typeName != 'transform'):
+            missing.append(name)
+            continue
+
+        if (uuids != None):
+            uuids[i] = node.uuid().asString()
+
+        fnTransform.setObject(dagPath)
+        translate = fnTransform.translation(om.MSpace.kTransform)
+        pivot = fnTransform.rotatePivot(om.MSpace.kTransform)
+        rotate = fnTransform.rotation()
+        scale = fnTransform.scale()
+
+        offset = i * valuesPerTransform
+        values[offset : offset + valuesPerTransform] = array('d', [
+            (translate.x + pivot.x) * linearScale,
+            (translate.y + pivot.y) * linearScale,
+            (translate.z + pivot.z) * linearScale,
+            rotate.x * angularScale,
+            rotate.y * angularScale,
+            rotate.z * angularScale,
+            scale[0], scale[1], scale[2]
+        ])
+
+    return values, missing
+
+def resolveUuids(uuids):
+    '''
+    Finds the current full paths of many maya transforms by UUID, in a single pass through the OpenMaya API.
+    \nUnlike names, UUIDs stay the same when objects are renamed or reparented, so this finds them wherever they are now.
+
+    :param list[str] uuids: The UUIDs of the transforms. None entries are skipped.
+    :returns list[str]: The full path of each UUID's transform. None for UUIDs that aren't in the scene (or aren't
+    transforms), and for UUIDs that more than one node has (e.g. after importing a scene twice), which can't be told apart.
+    '''
+    paths = [None] * len(uuids)
+
+    selection = om.MSelectionList()
+    node = om.MFnDependencyNode()
+
+    for i, uuid in enumerate(uuids):
+        if (uuid == None):
+            continue
+
+        selection.clear()
+        try:
+            selection.add(om.MUuid(uuid))
+        except (RuntimeError, ValueError):
+            continue
+
+        if (selection.length() != 1):
+            continue
+
+        # Check the type before getting a DAG path, since non-DAG nodes don't have one
+        if (node.setObject(selection.getDependNode(0)).typeName != 'transform'):
+            continue
+
+        paths[i] = selection.getDagPath(0).fullPathName()
+
+    return paths
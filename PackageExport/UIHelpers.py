@@ -27,36 +27,57 @@ def bgColor(offset = 0):
     '''
     return [0.27 + offset, 0.27 + offset, 0.27 + offset]
 
+def formatDuration(seconds):
+    '''
+    Returns a rough, readable duration, e.g. 'about 2m 5s'.
+    '''
+    if (seconds < 1):
+        return 'less than 1s'
+
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    if (minutes <= 0):
+        return f"about {seconds}s"
+    return f"about {minutes}m {seconds}s"
+
+def cleanFileName(value):
+    '''
+    Returns a filename with the characters \/:*?"<>| removed.
+    '''
+    import re
+
+    return re.sub(r'[\\/:*?"<>|]+', '', value)
+
 class fileNameField:
     '''
     A maya UI text field that automatically excludes the characters \/:*?"<>|
     '''
-    def __init__(self, parent):
+    def __init__(self, parent, onChange = None):
         '''
         :param str parent: The maya UI object set to be the parent of this.
+        :param function onChange: Optional function called with the new text whenever the user edits the field.
         '''
         self.name = cmds.textField(p = parent, bgc = bgColor(-0.1), placeholderText = "filename", tcc = self.changeCommand)
         self.text = ""
+        self.onChange = onChange
     
     def setName(self, value):
         '''
         Set the text of the field. Automatically excludes the characters \/:*?"<>|
         '''
-        import re
-
-        self.text = re.sub(r'[\\/:*?"<>|]+', '', value)
+        self.text = cleanFileName(value)
 
         cmds.textField(self, edit = True, text = self.text)
 
     # self.name textChangedCommand
     def changeCommand(self, *args):
-        import re
-
         raw = cmds.textField(self, query = True, text = True)
-        self.text = re.sub(r'[\\/:*?"<>|]+', '', raw)
+        self.text = cleanFileName(raw)
 
         cmds.textField(self, edit = True, text = self.text)
 
+        if (self.onChange):
+            self.onChange(self.text)
+
     # Return self.name so this class can be interacted with in the same way as maya.cmds UI objects
     def __str__(self):
         return self.name
@@ -89,6 +110,27 @@ class verticalFormLayout:
             'top' : [],
             'bottom' : []
         }
+
+        self.suspended = 0
+        self.pendingUpdate = None
+
+    def suspendLayout(self):
+        '''
+        Suspends updateLayout() until resumeLayout() is called, so many controls can be added with a single layout update.
+        \nCalls can be nested, the layout is only updated once the outermost resumeLayout() is called.
+        '''
+        self.suspended += 1
+
+    def resumeLayout(self):
+        '''
+        Resumes updateLayout(). If it was called while suspended, the layout is updated once with the last arguments it was called with.
+        '''
+        self.suspended = max(0, self.suspended - 1)
+
+        if (self.suspended <= 0 and self.pendingUpdate != None):
+            pending = self.pendingUpdate
+            self.pendingUpdate = None
+            self.updateLayout(**pending)
     
     def updateLayout(self, xOffset = 4, yOffset = 4, w = None, h = None):
         '''
@@ -96,11 +138,16 @@ class verticalFormLayout:
         \n- All controls will be attached to the left and right.
         \n- The first top/bottom control will be attached to the form's top/bottom.
         \n- Consecutive top/bottom controls with be attached to the previous top/bottom control.
+        \nIf the layout is suspended (see suspendLayout()), the update is deferred until it's resumed.
         :param int xOffset: The horizontal offset for controls in the layout. This acts as both the margin and the spacing between controls.
         :param int yOffset: The vertical offset for controls in the layout. This acts as both the margin and the spacing between controls.
         :param int w: The maximum width of this layout. If this has not been set, the layout should stretch horizontally.
         :param int h: The maximum height of this layout. If this has not been set, the layout should stretch vertically.
         '''
+        if (self.suspended > 0):
+            self.pendingUpdate = {'xOffset' : xOffset, 'yOffset' : yOffset, 'w' : w, 'h' : h}
+            return
+
         attachControl = []
         attachForm = []
 
@@ -209,11 +256,13 @@ class directoryField:
     '''
     A field in the maya UI where the user can enter a directory. Includes a label, a text field and a browse button.
     '''
-    def __init__(self, parent):
+    def __init__(self, parent, onChange = None):
         '''
         :param str parent: The maya UI object set to be the parent of this.
+        :param function onChange: Optional function called with the new directory whenever the user edits or browses it.
         '''
         self.name = cmds.formLayout(parent = parent, ebg = False, nd = 100)
+        self.onChange = onChange
 
         self.label = cmds.text("Path:", parent = self, align = 'left')
         self.field = cmds.textField(parent = self, placeholderText = "Choose an export directory",
@@ -240,6 +289,16 @@ class directoryField:
 
         cmds.textField(self.field, edit = True, text = self.directory)
 
+        if (self.onChange):
+            self.onChange(self.directory)
+
+    def setDirectory(self, value):
+        '''
+        Set the directory of the field, without triggering onChange.
+        '''
+        self.directory = value
+        cmds.textField(self.field, edit = True, text = self.directory)
+
     # self.button button command
     def browseDir(self):
         '''
@@ -254,9 +313,191 @@ class directoryField:
         directory = cmds.fileDialog2(fileMode = 3, startingDirectory = start)
 
         if (directory):
-            self.directory = directory[0]
-            cmds.textField(self.field, edit = True, text = self.directory)
+            self.setDirectory(directory[0])
+
+            if (self.onChange):
+                self.onChange(self.directory)
     
     # Return self.name so this class can be interacted with in the same way as maya.cmds UI objects
     def __str__(self):
         return self.name
+
+class mainProgressBar:
+    '''
+    Wrapper around maya's main progress bar ($gMainProgressBar).
+    \nSteps and cancel checks are throttled by time, so long loops can call step()/isCancelled() on every iteration
+    without querying the maya UI every time.
+    '''
+    def __init__(self, status, maxValue, interruptable = True, interval = 0.1, showEstimate = False):
+        '''
+        :param str status: The status message shown next to the progress bar.
+        :param int maxValue: The value at which the progress bar is full.
+        :param bool interruptable: Whether the user can cancel the process by pressing ESC.
+        :param float interval: The minimum time (in seconds) between progress bar updates/cancel checks.
+        :param bool showEstimate: Whether to add the progress and an estimate of the time left to the status.
+        '''
+        import maya.mel as mel
+        import time
+
+        self.name = mel.eval('$tmp = $gMainProgressBar')
+        self.interval = interval
+        self.pendingSteps = 0
+        self.cancelled = False
+        self.lastUpdate = time.perf_counter()
+
+        self.status = status
+        self.maxValue = max(1, maxValue)
+        self.value = 0
+        self.showEstimate = showEstimate
+        self.startTime = self.lastUpdate
+
+        cmds.progressBar(self.name, edit = True, beginProgress = True,
+                         isInterruptable = interruptable, status = status,
+                         maxValue = max(1, maxValue))
+
+    def step(self, amount = 1):
+        '''
+        Steps the progress bar. Steps are accumulated and only sent to the UI once per interval.
+        '''
+        self.pendingSteps += amount
+        self.value += amount
+        self.poll()
+
+    def isCancelled(self):
+        '''
+        Returns whether the user has cancelled the process. The UI is only queried once per interval.
+        '''
+        self.poll()
+        return self.cancelled
+
+    def cancel(self):
+        '''
+        Cancels the process, as if the user pressed ESC.
+        '''
+        self.cancelled = True
+
+    def poll(self, force = False):
+        '''
+        Sends pending steps to the progress bar and checks for cancellation if the interval has passed.
+        :param bool force: Update regardless of how much time has passed since the last update.
+        '''
+        import time
+
+        now = time.perf_counter()
+        if (not force and now - self.lastUpdate < self.interval):
+            return
+
+        self.lastUpdate = now
+
+        if (self.pendingSteps > 0):
+            if (self.showEstimate):
+                cmds.progressBar(self.name, edit = True, step = self.pendingSteps, status = self.getEstimatedStatus())
+            else:
+                cmds.progressBar(self.name, edit = True, step = self.pendingSteps)
+            self.pendingSteps = 0
+
+        if (cmds.progressBar(self.name, query = True, isCancelled = True)):
+            self.cancelled = True
+
+    def getEstimatedStatus(self):
+        '''
+        Returns the status with the progress and an estimate of the time left, based on the time per step so far.
+        '''
+        import time
+
+        value = min(self.value, self.maxValue)
+        if (value <= 0):
+            return f"{self.status} 0/{self.maxValue}"
+
+        remaining = (time.perf_counter() - self.startTime) / value * (self.maxValue - value)
+        return f"{self.status} {value}/{self.maxValue}, {formatDuration(remaining)} left"
+
+    def setStatus(self, status):
+        self.status = status
+        cmds.progressBar(self.name, edit = True, status = status)
+
+    def end(self):
+        cmds.progressBar(self.name, edit = True, endProgress = True)
+
+    # Return self.name so this class can be interacted with in the same way as maya.cmds UI objects
+    def __str__(self):
+        return self.name
+
+class slicedRunner:
+    '''
+    Runs a generator of steps (e.g. Export.iterExport()) in time-boxed slices while maya is idle, so the UI stays
+    responsive while it runs.
+    \nEach slice runs steps until 'sliceSeconds' have passed, then schedules the next slice with
+    maya.utils.executeDeferred(). Steps should leave the scene in a usable state whenever they yield.
+    '''
+    def __init__(self, name, steps, progress = None, onFinished = None, sliceSeconds = 0.05):
+        '''
+        :param str name: The name of the process, for command tracing (see CommandTracer).
+        :param steps: The generator to run.
+        :param mainProgressBar progress: Optional progress bar the steps check for cancellation. If it's given,
+        cancel() cancels it and lets the steps stop themselves, otherwise cancel() closes the generator.
+        :param function onFinished: Called with the generator's result and the error it raised (or None) when it finishes.
+        :param float sliceSeconds: How long each slice runs steps for, at least one step per slice.
+        '''
+        self.name = name
+        self.steps = steps
+        self.progress = progress
+        self.onFinished = onFinished
+        self.sliceSeconds = sliceSeconds
+        self.running = False
+        self.trace = None
+
+    def start(self):
+        import maya.utils
+        from PackageExport import CommandTracer
+
+        self.running = True
+        self.trace = CommandTracer.startTrace(self.name)
+        maya.utils.executeDeferred(self.runSlice)
+
+    def cancel(self):
+        if (not self.running):
+            return
+
+        if (self.progress):
+            self.progress.cancel()
+            return
+
+        self.steps.close()
+        self.finish(None, None)
+
+    def runSlice(self):
+        import maya.utils
+        import time
+        from PackageExport import CommandTracer
+
+        if (not self.running):
+            return
+
+        deadline = time.perf_counter() + self.sliceSeconds
+        try:
+            with CommandTracer.resumeTrace(self.trace):
+                while (True):
+                    next(self.steps)
+                    if (time.perf_counter() >= deadline):
+                        break
+        except StopIteration as stop:
+            self.finish(stop.value, None)
+            return
+        except Exception as error:
+            self.finish(None, error)
+            return
+
+        maya.utils.executeDeferred(self.runSlice)
+
+    def finish(self, result, error):
+        from PackageExport import CommandTracer
+
+        self.running = False
+        CommandTracer.finishTrace(self.trace)
+
+        if (self.onFinished):
+            self.onFinished(result, error)
+
+    def __str__(self):
+        return self.name
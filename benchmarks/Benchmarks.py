@@ -0,0 +1,326 @@
+'''
+Benchmarks for the package exporter's hot paths, run against a fake maya (benchmarks/fakemaya) so they run anywhere:
+\n    python benchmarks/Benchmarks.py [--sizes 1000 10000] [--only exportJSON] [--shapes 50] [--instanced] [--memory] [--update]
+\nEach benchmark runs on a generated scene of N mesh transforms (see FakeScene.generateScene()), and reports its wall
+time and the amount of maya commands it called. In maya each command has a fixed overhead, so the command count is the
+better measure of how an operation scales; wall time here only covers the package's own Python.
+\nResults are compared against benchmarks/baselines.json. A benchmark regresses if it calls more commands than its
+baseline, or takes longer than its baseline by more than the tolerance. --update rewrites the baselines instead.
+\nExit codes: 0 if nothing regressed, 1 if anything did.
+'''
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+benchmarkDir = os.path.dirname(os.path.abspath(__file__))
+baselinePath = os.path.join(benchmarkDir, 'baselines.json')
+
+# Import the fake maya before the package, and allow 'PackageExport' to be imported when this file is run as a script
+sys.path.insert(0, os.path.join(benchmarkDir, 'fakemaya'))
+sys.path.insert(0, os.path.dirname(benchmarkDir))
+
+import FakeScene
+import maya.cmds as cmds
+import maya.utils
+
+from PackageExport import MainWindow
+from PackageExport import Export
+from PackageExport import PackageItems
+from PackageExport import UIHelpers
+
+defaultSizes = [1000, 10000, 100000]
+timingSlack = 0.05
+
+# Arguments to FakeScene.generateScene(), set from the command line
+sceneOptions = {}
+
+# Export benchmarks write to temporary directories in here, deleted when the run ends
+outputDirectory = None
+
+#region Benchmarks
+# Each benchmark is a setup function, which builds the scene and window and returns the function to time.
+
+def setupWindow(size):
+    names = FakeScene.generateScene(size, **sceneOptions)
+    MainWindow.Create()
+    return names
+
+def setupPackages(size):
+    setupWindow(size)
+    MainWindow.autoGeneratePackages()
+
+def autoGeneratePackages(size):
+    setupWindow(size)
+    return MainWindow.autoGeneratePackages
+
+def addSelection(size):
+    names = setupWindow(size)
+    MainWindow.packManagerPane.setCurrentPackage(MainWindow.packManagerPane.addPackage())
+    cmds.select(names, replace = True)
+    return MainWindow.packEditorPane.addSelection
+
+def syncSelect(size):
+    '''
+    Turning on sync select, then a scene selection change and a list selection change of half the package.
+    '''
+    names = setupWindow(size)
+    editor = MainWindow.packEditorPane
+    MainWindow.packManagerPane.setCurrentPackage(MainWindow.packManagerPane.addPackage())
+    cmds.select(names, replace = True)
+    editor.addSelection()
+    cmds.select(names[: size // 2], replace = True)
+
+    def run():
+        editor.syncIcon.setSyncSelect(True)
+
+        cmds.select(names[size // 2 :], replace = True)
+        editor.syncIcon.queueSceneSelectionChanged()
+        maya.utils.flush()
+
+        cmds.textScrollList(editor.itemsList, edit = True, deselectAll = True)
+        cmds.textScrollList(editor.itemsList, edit = True, selectItem = names[: size // 2])
+        editor.syncIcon.listSelectionChanged()
+    return run
+
+def removeItems(size):
+    '''
+    Removing every other item of a package one at a time, the way a script removing objects would, then reading the
+    package once.
+    '''
+    names = FakeScene.generateScene(size, **sceneOptions)
+    items = PackageItems.itemStore(names)
+
+    def run():
+        for name in names[::2]:
+            items.remove(name)
+        return items.names
+    return run
+
+def refreshPackages(size):
+    '''
+    Refreshing every package after a tenth of the scene's items have been deleted.
+    '''
+    names = setupWindow(size)
+    MainWindow.autoGeneratePackages()
+    cmds.delete(names[::10])
+    return MainWindow.packManagerPane.refreshPackages
+
+def refreshRenamed(size):
+    '''
+    Refreshing every package after a tenth of the scene's items have been renamed, and another tenth reparented.
+    '''
+    names = setupWindow(size)
+    MainWindow.autoGeneratePackages()
+    for name in names[::10]:
+        cmds.rename(name, name[1:] + 'Renamed')
+    for name in names[5::10]:
+        cmds.parent(name, '|root')
+    return MainWindow.packManagerPane.refreshPackages
+
+def moveItems(size):
+    '''
+    Moving a tenth of the packaged items twice, the way a user drags objects around, with their changes being watched
+    (see SceneWatcher). Compare against the same benchmark before packages are generated to see the callbacks' cost.
+    '''
+    names = setupWindow(size)
+    MainWindow.autoGeneratePackages()
+
+    def run():
+        for offset in (1, 2):
+            for name in names[::10]:
+                cmds.setAttr(f"{name}.translate", offset, offset, offset, type = 'double3')
+    return run
+
+def refreshMoved(size):
+    '''
+    Refreshing every package after a tenth of the scene's items have been moved. Only the moved items are re-sampled.
+    '''
+    names = setupWindow(size)
+    MainWindow.autoGeneratePackages()
+    for name in names[::10]:
+        cmds.setAttr(f"{name}.translate", 1, 2, 3, type = 'double3')
+    return MainWindow.packManagerPane.refreshPackages
+
+def getSettings(directory, **flags):
+    return Export.exportSettings(directory, 'scene', root = Export.getRootAttributes('|root'), **flags)
+
+def exportJSON(size):
+    setupPackages(size)
+    directory = tempfile.mkdtemp(dir = outputDirectory)
+    settings = getSettings(directory, fbxEnabled = False)
+    packages = MainWindow.getExportPackages()
+    return lambda: Export.runSteps(Export.iterExportJSON(packages, settings))
+
+def setupFBXExport(size):
+    setupPackages(size)
+    directory = tempfile.mkdtemp(dir = outputDirectory)
+    settings = getSettings(directory, jsonEnabled = False)
+    packages = [Export.exportPackage(pack.fileName, directory, pack.items) for pack in MainWindow.getExportPackages()]
+    return packages, settings
+
+def exportFBX(size):
+    packages, settings = setupFBXExport(size)
+    return lambda: Export.runSteps(Export.iterExportFBX(packages, settings))
+
+def exportFBXSliced(size):
+    '''
+    exportFBX, time-sliced the way the window runs it (see UIHelpers.slicedRunner).
+    '''
+    packages, settings = setupFBXExport(size)
+
+    def run():
+        UIHelpers.slicedRunner('Export', Export.iterExportFBX(packages, settings)).start()
+        maya.utils.flush()
+    return run
+
+def exportFBXConnected(size):
+    '''
+    exportFBX with every package's representative driven by a connection, so it can't be moved to the origin and a
+    duplicate is exported instead (see SceneState.neutralTransform()). This is what every export cost before
+    representatives were moved in place, to compare against.
+    '''
+    packages, settings = setupFBXExport(size)
+    for pack in packages:
+        if (len(pack.items) > 0):
+            cmds.connectAttr('|root.translate', f"{pack.items.names[0]}.translate")
+    return lambda: Export.runSteps(Export.iterExportFBX(packages, settings))
+
+benchmarks = {
+    'autoGeneratePackages' : autoGeneratePackages,
+    'addSelection' : addSelection,
+    'syncSelect' : syncSelect,
+    'removeItems' : removeItems,
+    'refreshPackages' : refreshPackages,
+    'refreshRenamed' : refreshRenamed,
+    'refreshMoved' : refreshMoved,
+    'moveItems' : moveItems,
+    'exportJSON' : exportJSON,
+    'exportFBX' : exportFBX,
+    'exportFBXSliced' : exportFBXSliced,
+    'exportFBXConnected' : exportFBXConnected
+}
+#endregion
+
+def measure(setup, size, memory = False):
+    '''
+    Runs a benchmark once on a scene of 'size' items.
+
+    :param bool memory: Whether to also record the peak Python memory allocated during the run, with tracemalloc.
+    Tracing slows down every allocation, so times measured with it aren't comparable to the baselines.
+    :returns dict: The wall time in seconds, the total amount of maya commands called, and the amount of each command.
+    With 'memory', also the peak memory in bytes ('peakMemory').
+    '''
+    import tracemalloc
+
+    # The package prints progress for every package, which would drown out the results
+    with contextlib.redirect_stdout(io.StringIO()):
+        run = setup(size)
+        cmds.resetCalls()
+
+        if (memory):
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        try:
+            run()
+            seconds = time.perf_counter() - start
+        finally:
+            if (memory):
+                peakMemory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+    calls = dict(sorted(cmds.calls.items()))
+    result = {'seconds' : round(seconds, 4), 'calls' : sum(calls.values()), 'commands' : calls}
+    if (memory):
+        result['peakMemory'] = peakMemory
+    return result
+
+def countCalls(result):
+    # Progress bar updates are throttled by time, so their amount changes from run to run
+    return result['calls'] - result['commands'].get('progressBar', 0)
+
+def compare(result, baseline, tolerance, compareTimes = True):
+    '''
+    Returns why a result regressed from its baseline, or None if it didn't.
+    \nTimes within 'timingSlack' of the baseline never regress, since short benchmarks are mostly noise.
+    '''
+    if (baseline == None):
+        return None
+    if (countCalls(result) > countCalls(baseline)):
+        return f"{result['calls']} commands, baseline {baseline['calls']}"
+    if (compareTimes and result['seconds'] > baseline['seconds'] * (1 + tolerance) + timingSlack):
+        return f"{result['seconds']:.3f}s, baseline {baseline['seconds']:.3f}s"
+    return None
+
+def loadBaselines():
+    if (not os.path.isfile(baselinePath)):
+        return {}
+    with open(baselinePath) as f:
+        return json.load(f)
+
+def parseArguments(args = None):
+    parser = argparse.ArgumentParser(description = "Benchmark the package exporter against a fake maya scene.")
+    parser.add_argument('--sizes', type = int, nargs = '+', default = defaultSizes, help = "the amounts of items to benchmark")
+    parser.add_argument('--only', nargs = '+', choices = list(benchmarks), help = "the benchmarks to run (default: all)")
+    parser.add_argument('--shapes', type = int, help = "the amount of unique shapes in the scene (default: 1 per 100 items)")
+    parser.add_argument('--instanced', action = 'store_true', help = "make copies of a shape maya instances of one mesh")
+    parser.add_argument('--update', action = 'store_true', help = "write the results as the new baselines")
+    parser.add_argument('--memory', action = 'store_true',
+                        help = "also report peak Python memory (times are slower, so only commands are compared)")
+    parser.add_argument('--tolerance', type = float, default = 0.5,
+                        help = "how much slower than its baseline a benchmark can be before it regresses (default: 0.5, i.e. 50%%)")
+
+    return parser.parse_args(args)
+
+def main(args = None):
+    arguments = parseArguments(args)
+    regressions = 0
+
+    sceneOptions.update(uniqueShapes = arguments.shapes, instanced = arguments.instanced)
+
+    # Baselines are only for the default scene
+    custom = arguments.shapes != None or arguments.instanced
+    if (custom and arguments.update):
+        print("Baselines can only be updated for the default scene (without --shapes or --instanced)")
+        return 1
+    if (arguments.memory and arguments.update):
+        print("Baselines can't be updated with --memory, since tracing memory slows everything down")
+        return 1
+    baselines = {} if custom else loadBaselines()
+
+    global outputDirectory
+    outputDirectory = tempfile.mkdtemp()
+
+    print(f"{'benchmark':<22}{'items':>8}{'seconds':>10}{'commands':>10}" + (f"{'peak MB':>10}" if arguments.memory else "") + "  result")
+
+    try:
+        for name in arguments.only or benchmarks:
+            for size in arguments.sizes:
+                result = measure(benchmarks[name], size, arguments.memory)
+                regression = compare(result, baselines.get(name, {}).get(str(size)), arguments.tolerance, not arguments.memory)
+                regressions += regression != None
+
+                memory = f"{result['peakMemory'] / 2 ** 20:>10.1f}" if arguments.memory else ""
+                print(f"{name:<22}{size:>8}{result['seconds']:>10.3f}{result['calls']:>10}{memory}  {regression and 'REGRESSED: ' + regression or 'ok'}")
+
+                if (arguments.update):
+                    baselines.setdefault(name, {})[str(size)] = result
+    finally:
+        shutil.rmtree(outputDirectory, ignore_errors = True)
+
+    if (arguments.update):
+        with open(baselinePath, 'w') as f:
+            json.dump(baselines, f, indent = 4)
+        print(f"Updated {baselinePath}")
+        return 0
+
+    return 1 if regressions > 0 else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
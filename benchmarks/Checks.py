@@ -0,0 +1,386 @@
+'''
+Behaviour checks for the package exporter, run against the same fake maya as the benchmarks (benchmarks/fakemaya):
+\n    python benchmarks/Checks.py [--only fingerprintCache]
+\nEach check builds a small scene, runs part of the exporter and raises AssertionError if the result is wrong.
+\nExit codes: 0 if every check passed, 1 if any failed.
+'''
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+
+benchmarkDir = os.path.dirname(os.path.abspath(__file__))
+
+# Import the fake maya before the package, and allow 'PackageExport' to be imported when this file is run as a script
+sys.path.insert(0, os.path.join(benchmarkDir, 'fakemaya'))
+sys.path.insert(0, os.path.dirname(benchmarkDir))
+
+import FakeScene
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+from PackageExport import BinaryScene
+from PackageExport import Export
+from PackageExport import FingerprintCache
+from PackageExport import MainWindow
+from PackageExport import PackageItems
+from PackageExport import ShapeGrouping
+
+# Checks that write files write to temporary directories in here, deleted when the run ends
+outputDirectory = None
+
+#region Checks
+
+def fingerprintCache():
+    '''
+    Cached fingerprints of shapes that haven't been edited are reused without reading their meshes, and moving points
+    doesn't invalidate them. Topology changes do, even if the counts don't change, whether the shape was watched for
+    edits or its entry was loaded from the scene. Saving the cache leaves the undo queue and the scene's modified state alone.
+    '''
+    FakeScene.generateScene(10)
+    shape = '|shape0_0|shape0_0Shape'
+    mesh = FakeScene.resolve(shape)[0]
+    cache = FingerprintCache.fingerprintCache()
+
+    fingerprint = ShapeGrouping.getFingerprint(shape, cache)
+
+    # The mesh of a shape that hasn't been edited isn't read
+    getVertices = om.MFnMesh.getVertices
+    om.MFnMesh.getVertices = None
+    try:
+        assert ShapeGrouping.getFingerprint(shape, cache) == fingerprint
+    finally:
+        om.MFnMesh.getVertices = getVertices
+    assert (cache.hits, cache.misses) == (1, 1), "unchanged shape wasn't a cache hit"
+
+    FakeScene.editMesh(mesh, offset = 2.5)
+    assert ShapeGrouping.getFingerprint(shape, cache) == fingerprint
+    assert (cache.hits, cache.misses) == (2, 1), "moving points invalidated the cached fingerprint"
+
+    # Same face counts, different vertices
+    faceVertices = [i % mesh.mesh['numVertices'] for i in range(sum(mesh.mesh['faceCounts']))]
+    FakeScene.editMesh(mesh, connects = list(reversed(faceVertices)))
+    ShapeGrouping.getFingerprint(shape, cache)
+    assert cache.misses == 2, "changing face-vertices with the same counts didn't invalidate the cached fingerprint"
+
+    # Saving doesn't add to the undo queue or mark the scene as modified
+    cmds.file(modified = False)
+    undoable = FakeScene.scene.undoable
+    cache.save()
+    assert FakeScene.scene.undoable == undoable, "saving the cache was added to the undo queue"
+    assert not cmds.file(query = True, modified = True), "saving the cache marked the scene as modified"
+
+    # Entries loaded from the scene aren't watched yet, so they're checked against the shape's token
+    loaded = FingerprintCache.fingerprintCache()
+    loaded.load()
+    mesh.mesh['connects'] = faceVertices
+    ShapeGrouping.getFingerprint(shape, loaded)
+    assert (loaded.hits, loaded.misses) == (0, 1), "loaded fingerprint of a changed shape was reused"
+    ShapeGrouping.getFingerprint(shape, loaded)
+    assert (loaded.hits, loaded.misses) == (1, 1), "unchanged shape wasn't a cache hit after loading"
+
+def itemOrder():
+    '''
+    Removing items keeps the order of the rest, so a package's first item (its representative) stays first.
+    '''
+    names = FakeScene.generateScene(20)
+    index = PackageItems.packageIndex()
+    items = PackageItems.itemStore(names, sceneIndex = index)
+    items.update()
+    expected = {name : items.getAttributes(i) for i, name in enumerate(names)}
+
+    items.remove(names[3])
+    assert items.removeMany([names[1], names[7], names[19], 'missing']) == 3
+    kept = [name for i, name in enumerate(names) if i not in (1, 3, 7, 19)]
+
+    assert items.names == kept, "removing items reordered the rest"
+    assert all(items.index(name) == i for i, name in enumerate(kept))
+    assert all(items.getAttributes(i) == expected[name] for i, name in enumerate(kept)), "values moved to another item"
+    assert names[7] not in index and kept[-1] in index
+
+    items.pop(0)
+    assert items.names == kept[1:]
+
+    # Removing leaves gaps until the items are next read or added, which must not show through
+    items.remove(kept[3])
+    assert len(items) == len(kept) - 2 and names[4] in items and kept[3] not in items
+    assert items.append(names[1]) == len(kept) - 2, "an item added after removing one got the wrong index"
+    items.update()
+    assert items.names == [name for name in kept[1:] if name != kept[3]] + [names[1]]
+    assert [str(item) for item in items] == items.names
+    assert items.getAttributes(len(items) - 1) == expected[names[1]]
+
+def heldValues():
+    '''
+    Items can still be added and removed while a block from getValues() is held, and the block doesn't change.
+    '''
+    names = FakeScene.generateScene(10)
+    items = PackageItems.itemStore(names[:5])
+    items.update()
+
+    values = items.getValues()
+    expected = [list(row) for row in values]
+    items.extend(names[5:])
+    items.update()
+    items.removeMany(names[:3])
+    assert [list(row) for row in values] == expected, "the held block changed with the store"
+    assert len(items.getValues()) == len(items) == 7
+
+class stubProgress:
+    '''
+    Stands in for UIHelpers.mainProgressBar, and cancels itself after 'cancelAfter' steps.
+    '''
+    def __init__(self, cancelAfter = None):
+        self.cancelAfter = cancelAfter
+        self.value = 0
+        self.cancelled = cancelAfter == 0
+
+    def step(self, amount = 1):
+        self.value += amount
+        if (self.cancelAfter != None and self.value >= self.cancelAfter):
+            self.cancelled = True
+
+    def isCancelled(self):
+        return self.cancelled
+
+    def cancel(self):
+        self.cancelled = True
+
+def runParallelExport(packageCount, progress = None, delay = 0, packages = None, stub = True):
+    '''
+    Runs Export.iterExportFBXParallel() with StubWorker.py standing in for mayapy, or with FBXWorker.py run by this
+    Python against the fake maya if 'stub' is False.
+
+    :param list[exportPackage] packages: The packages to export. Defaults to 'packageCount' new ones.
+    :returns tuple[list[str], list[exportPackage], int]: The failed packages, the packages, and the amount of steps taken.
+    '''
+    directory = tempfile.mkdtemp(dir = outputDirectory)
+    packages = packages or makePackages(packageCount, directory)
+    settings = Export.exportSettings(directory, 'scene', jsonEnabled = False, workerCount = 2)
+
+    environment = dict(os.environ)
+    if (stub):
+        os.environ['PACKAGE_EXPORT_MAYAPY'] = os.path.join(benchmarkDir, 'StubWorker.py')
+        os.environ['PACKAGE_EXPORT_STUB_DELAY'] = str(delay)
+    else:
+        os.environ['PACKAGE_EXPORT_MAYAPY'] = sys.executable
+        os.environ['PYTHONPATH'] = os.pathsep.join([os.path.join(benchmarkDir, 'fakemaya'), os.environ.get('PYTHONPATH', '')])
+    try:
+        steps = Export.iterExportFBXParallel(packages, settings, progress)
+        count = 0
+        while (True):
+            try:
+                next(steps)
+                count += 1
+            except StopIteration as stop:
+                return stop.value, packages, count
+    finally:
+        os.environ.clear()
+        os.environ.update(environment)
+
+def parallelExport():
+    '''
+    The parallel FBX export polls its workers between steps instead of blocking until they finish, and can be
+    cancelled while writing scenes or while the workers run.
+    '''
+    failed, packages, count = runParallelExport(6, delay = 0.05)
+    assert failed == [], f"stub workers failed: {failed}"
+    assert all(os.path.isfile(pack.getFBXPath()) for pack in packages)
+    # One step per scene written, then more while the workers run
+    assert count > len(packages), "the export didn't yield while the workers ran"
+
+    failed, packages, count = runParallelExport(6, stubProgress(cancelAfter = 0))
+    assert sorted(failed) == sorted(pack.fileName for pack in packages), "cancelled packages weren't reported"
+    assert count == 0, "scenes were written after the export was cancelled"
+
+    # A job can finish writing its FBX just as its worker is stopped, before reporting it. So only check that every
+    # package reported as exported was written, and that some never were
+    failed, packages, count = runParallelExport(6, stubProgress(cancelAfter = 1), delay = 0.5)
+    assert 0 < len(failed) < len(packages), "cancelling didn't stop the workers"
+    assert all(os.path.isfile(pack.getFBXPath()) for pack in packages if pack.fileName not in failed)
+    assert not all(os.path.isfile(pack.getFBXPath()) for pack in packages), "cancelling didn't stop the workers"
+
+def makePackages(packageCount, directory):
+    '''
+    Returns 'packageCount' export packages of 3 sampled items each, from a new scene.
+    '''
+    names = FakeScene.generateScene(packageCount * 3)
+    packages = []
+    for i in range(packageCount):
+        items = PackageItems.itemStore(names[i::packageCount])
+        items.update()
+        packages.append(Export.exportPackage(f"pack{i}", directory, items))
+
+    return packages
+
+def jsonExportSteps():
+    '''
+    The JSON export writes one package per step, and cancelling it deletes the partly written scene.
+    '''
+    directory = tempfile.mkdtemp(dir = outputDirectory)
+    packages = makePackages(8, directory)
+
+    for jsonFormat in ('pretty', 'ndjson', 'binary'):
+        settings = Export.exportSettings(directory, jsonFormat, fbxEnabled = False, jsonFormat = jsonFormat,
+                                         root = Export.getRootAttributes('|root'))
+        progress = stubProgress()
+        path = Export.runSteps(Export.iterExportJSON(packages, settings, progress = progress))
+        assert os.path.isfile(path) and progress.value == len(packages), f"{jsonFormat} wasn't written one package per step"
+
+        steps = Export.iterExportJSON(packages, settings, progress = stubProgress(cancelAfter = 3))
+        assert Export.runSteps(steps) == None
+        assert not os.path.isfile(path), f"cancelling left a partly written {jsonFormat} scene"
+
+    # Cancelling a delta export keeps the last export's state, so the next delta is still against it
+    settings = Export.exportSettings(directory, 'delta', fbxEnabled = False, deltaEnabled = True,
+                                     root = Export.getRootAttributes('|root'))
+    Export.runSteps(Export.iterExportJSON(packages, settings))
+    statePath = settings.getPath('state.json')
+    with open(statePath) as f:
+        state = f.read()
+
+    cmds.setAttr(f"{packages[0].items.names[0]}.translate", 5, 0, 0, type = 'double3')
+    packages[0].items.update()
+    assert Export.runSteps(Export.iterExportJSON(packages, settings, progress = stubProgress(cancelAfter = 1))) == None
+    with open(statePath) as f:
+        assert f.read() == state, "cancelling a delta export changed its state"
+
+    assert Export.runSteps(Export.iterExportJSON(packages, settings)) != None
+
+def binaryRoundTrip():
+    '''
+    A binary scene read back with BinaryScene.readScene() matches the pretty JSON scene of the same packages:
+    exactly for float64 values, and to float32 precision for float32 values.
+    '''
+    directory = tempfile.mkdtemp(dir = outputDirectory)
+    packages = makePackages(12, directory)
+    root = Export.getRootAttributes('|root')
+
+    paths = {}
+    for jsonFormat in ('pretty', 'binary', 'binary32'):
+        settings = Export.exportSettings(directory, jsonFormat, fbxEnabled = False, jsonFormat = jsonFormat, root = root)
+        paths[jsonFormat] = Export.runSteps(Export.iterExportJSON(packages, settings))
+
+    with open(paths['pretty']) as f:
+        pretty = f.read()
+
+    scene = BinaryScene.toJSONScene(BinaryScene.readScene(paths['binary']))
+    assert json.dumps(scene, indent = 4) == pretty, "float64 binary scene doesn't match the pretty JSON scene"
+
+    expected = json.loads(pretty)
+    scene = BinaryScene.toJSONScene(BinaryScene.readScene(paths['binary32']))
+    assert scene['rootTransform'] == expected['rootTransform']
+    assert len(scene['packages']) == len(expected['packages'])
+
+    for package, expectedPackage in zip(scene['packages'], expected['packages']):
+        assert (package['fileName'], package['path']) == (expectedPackage['fileName'], expectedPackage['path'])
+        assert [t['name'] for t in package['transforms']] == [t['name'] for t in expectedPackage['transforms']]
+
+        for transform, expectedTransform in zip(package['transforms'], expectedPackage['transforms']):
+            for attribute in ('translate', 'rotate', 'scale'):
+                assert all(math.isclose(a, b, rel_tol = 1e-6, abs_tol = 1e-5)
+                           for a, b in zip(transform[attribute], expectedTransform[attribute])), \
+                       f"float32 {attribute} of {transform['name']} doesn't match the pretty JSON scene"
+
+def renamedGroup():
+    '''
+    Refreshing packages follows items whose parent group was renamed or reparented, even though only the group
+    itself sends the change.
+    '''
+    names = FakeScene.generateScene(30)
+    MainWindow.Create()
+    MainWindow.autoGeneratePackages()
+
+    group = cmds.createNode('transform', name = 'grp')
+    grouped = names[:3]
+    for name in grouped:
+        cmds.parent(name, group)
+    MainWindow.packManagerPane.refreshPackages()
+
+    def getPaths():
+        items = {uuid : name for pack in MainWindow.packManagerPane.packages for name, uuid in zip(pack.items.names, pack.items.uuids)}
+        return [items[uuid] for uuid in uuids]
+
+    uuids = cmds.ls([f"|grp{name}" for name in grouped], uuid = True)
+    assert getPaths() == [f"|grp{name}" for name in grouped]
+
+    cmds.rename('|grp', 'grp2')
+    MainWindow.packManagerPane.refreshPackages()
+    assert getPaths() == [f"|grp2{name}" for name in grouped], "items weren't renamed with their group"
+    assert all(cmds.objExists(path) for path in getPaths())
+
+    cmds.parent('|grp2', '|root')
+    MainWindow.packManagerPane.refreshPackages()
+    assert getPaths() == [f"|root|grp2{name}" for name in grouped], "items weren't moved with their group"
+    assert all(cmds.objExists(path) for path in getPaths())
+
+def parallelConnected():
+    '''
+    Representatives whose transform values can't be set (e.g. connected) export in parallel, as they do serially.
+    '''
+    directory = tempfile.mkdtemp(dir = outputDirectory)
+    packages = makePackages(4, directory)
+    for pack in packages[::2]:
+        cmds.connectAttr('|root.translate', f"{pack.items.names[0]}.translate")
+
+    failed = Export.runSteps(Export.iterExportFBX(packages, Export.exportSettings(directory, 'scene', jsonEnabled = False)))
+    assert failed == [], f"serial export failed: {failed}"
+
+    for pack in packages:
+        os.remove(pack.getFBXPath())
+
+    failed, packages, _ = runParallelExport(4, packages = packages, stub = False)
+    assert failed == [], f"parallel export failed: {failed}"
+    assert all(os.path.isfile(pack.getFBXPath()) for pack in packages)
+
+checks = {
+    'fingerprintCache' : fingerprintCache,
+    'itemOrder' : itemOrder,
+    'heldValues' : heldValues,
+    'parallelExport' : parallelExport,
+    'parallelConnected' : parallelConnected,
+    'jsonExportSteps' : jsonExportSteps,
+    'binaryRoundTrip' : binaryRoundTrip,
+    'renamedGroup' : renamedGroup
+}
+#endregion
+
+def parseArguments(args = None):
+    parser = argparse.ArgumentParser(description = "Check the package exporter's behaviour against a fake maya scene.")
+    parser.add_argument('--only', nargs = '+', choices = list(checks), help = "the checks to run (default: all)")
+
+    return parser.parse_args(args)
+
+def main(args = None):
+    arguments = parseArguments(args)
+    failures = 0
+
+    global outputDirectory
+    outputDirectory = tempfile.mkdtemp()
+
+    try:
+        for name in arguments.only or checks:
+            output = io.StringIO()
+            try:
+                # The package prints progress, which would drown out the results
+                with contextlib.redirect_stdout(output):
+                    checks[name]()
+                print(f"{name:<28}ok")
+            except Exception:
+                failures += 1
+                print(f"{name:<28}FAILED")
+                print(output.getvalue()[-2000:], end = '')
+                traceback.print_exc()
+    finally:
+        shutil.rmtree(outputDirectory, ignore_errors = True)
+
+    return 1 if failures > 0 else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+'''
+Stand-in for mayapy, to run ParallelExport.workerPool without maya. Point the pool at it with:
+\n    PACKAGE_EXPORT_MAYAPY=benchmarks/StubWorker.py
+\nThe pool starts it as '<executable> <script> <job file>', so the script argument (FBXWorker.py) is ignored.
+Each job checks that its temporary scene was written, writes a placeholder FBX file and reports its result like
+FBXWorker.py does.
+\nPACKAGE_EXPORT_STUB_DELAY sets how long each job takes, in seconds, e.g. to cancel an export while it runs.
+'''
+import json
+import os
+import sys
+import time
+
+# Allow 'PackageExport' to be imported when this file is run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PackageExport.ParallelExport import reportResult
+
+def main(jobFile):
+    delay = float(os.environ.get('PACKAGE_EXPORT_STUB_DELAY', 0))
+
+    with open(jobFile) as f:
+        data = json.load(f)
+
+    for job in data['jobs']:
+        time.sleep(delay)
+
+        if (not os.path.isfile(job['scene'])):
+            reportResult(job['name'], 'failed', f"{job['scene']} was not written")
+            continue
+
+        with open(job['output'], 'w') as f:
+            f.write('fbx')
+        reportResult(job['name'], 'done')
+
+if __name__ == '__main__':
+    main(sys.argv[-1])
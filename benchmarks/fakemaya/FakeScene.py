@@ -0,0 +1,196 @@
+'''
+In-memory scene behind the fake maya modules, and a generator for synthetic scenes.
+\nNodes are stored by their (unique) short name. Transforms have translate/rotate/scale/rotatePivot attributes,
+meshes have a 'key': meshes with the same key are the same shape (cmds.polyCompare() reports them as similar).
+A mesh's points can be moved by setting its 'offset', and its face-vertices replaced by setting its 'connects'
+(see editMesh()).
+'''
+import random
+import uuid
+
+# Functions called with (event, node, attribute) when the scene changes, see notify()
+listeners = []
+
+def notify(event, n, attribute = None):
+    '''
+    Tells listeners (e.g. the fake OpenMaya messages) about a change: 'attributeSet', 'dirty', 'removed', 'renamed',
+    'parentAdded' or 'beforeOpen' (with no node).
+    '''
+    for listener in listeners:
+        listener(event, n, attribute)
+
+class node:
+    def __init__(self, name, nodeType, parent = None):
+        self.name = name
+        self.type = nodeType
+        self.parents = [parent] if parent else []
+        self.uuid = str(uuid.UUID(int = random.getrandbits(128))).upper()
+        self.attrs = {}
+        # Attributes driven by a connection, which can't be set
+        self.connected = set()
+        self.mesh = None
+
+class fakeScene:
+    def __init__(self):
+        self.nodes = {}
+        self.children = {}
+        self.uuids = {}
+        self.selection = []
+        self.fileName = ''
+        # Whether the scene has unsaved changes, and how many changes were made while undo was on (see maya.cmds.changed())
+        self.modified = False
+        self.undoEnabled = True
+        self.undoable = 0
+
+    def reset(self):
+        self.__init__()
+
+    def register(self, n, parent):
+        self.nodes[n.name] = n
+        self.uuids[n.uuid] = n
+        self.children.setdefault(n, [])
+        if (parent):
+            self.children.setdefault(parent, []).append(n)
+
+    def remove(self, n):
+        for child in list(self.children.get(n, [])):
+            if (len(child.parents) <= 1):
+                self.remove(child)
+            else:
+                child.parents.remove(n)
+
+        notify('removed', n)
+        self.nodes.pop(n.name, None)
+        self.uuids.pop(n.uuid, None)
+        self.children.pop(n, None)
+        for parent in n.parents:
+            if (n in self.children.get(parent, [])):
+                self.children[parent].remove(n)
+
+    def rename(self, n, name):
+        self.nodes.pop(n.name, None)
+        n.name = name
+        self.nodes[name] = n
+        notify('renamed', n)
+
+    def reparent(self, n, parent):
+        for oldParent in n.parents:
+            self.children[oldParent].remove(n)
+
+        n.parents = [parent] if parent else []
+        if (parent):
+            self.children.setdefault(parent, []).append(n)
+        notify('parentAdded', n)
+
+scene = fakeScene()
+
+def reset(seed = 0):
+    '''
+    Empties the scene. Node UUIDs are generated from 'seed', so benchmarks are repeatable.
+    '''
+    random.seed(seed)
+    scene.reset()
+
+def addTransform(name, parent = None, translate = (0, 0, 0), rotate = (0, 0, 0), scale = (1, 1, 1), pivot = (0, 0, 0)):
+    n = node(name, 'transform', parent)
+    n.attrs.update(translate = list(translate), rotate = list(rotate), scale = list(scale),
+                   rotatePivot = list(pivot), visibility = True)
+    scene.register(n, parent)
+    return n
+
+def addMesh(name, parent, faceCounts, uvSets, key):
+    '''
+    :param str name: The name of the mesh.
+    :param node parent: The transform the mesh is under.
+    :param list[int] faceCounts: The amount of vertices of each face.
+    :param dict[str, int] uvSets: The amount of UVs in each UV set.
+    :param key: Meshes with the same key are the same shape.
+    '''
+    n = node(name, 'mesh', parent)
+    n.mesh = {
+        'faceCounts' : list(faceCounts),
+        'uvSets' : dict(uvSets),
+        'key' : key,
+        'numVertices' : sum(faceCounts) // 2 + 2,
+        'numEdges' : sum(faceCounts) // 2 + len(faceCounts)
+    }
+    scene.register(n, parent)
+    return n
+
+def editMesh(mesh, **values):
+    '''
+    Changes a mesh's data (e.g. its 'offset' or 'connects') and marks the mesh dirty, like editing it in maya.
+    '''
+    mesh.mesh.update(values)
+    notify('dirty', mesh, 'outMesh')
+
+def instance(mesh, parent):
+    '''
+    Adds a mesh under another transform as well, like cmds.instance().
+    '''
+    mesh.parents.append(parent)
+    scene.children.setdefault(parent, []).append(mesh)
+
+def paths(n):
+    '''
+    Returns every full path to a node (more than one if it, or a parent, is instanced).
+    '''
+    if (not n.parents):
+        return ['|' + n.name]
+    return [path + '|' + n.name for parent in n.parents for path in paths(parent)]
+
+def resolve(name):
+    '''
+    Returns the node and full path an object name refers to, or (None, None) if it doesn't exist.
+    '''
+    name = str(name)
+    if ('|' not in name):
+        n = scene.nodes.get(name)
+        return (n, paths(n)[0]) if n else (None, None)
+
+    n = scene.nodes.get(name.rsplit('|', 1)[-1])
+    if (n == None):
+        return None, None
+
+    for path in paths(n):
+        if (path == name or path.endswith('|' + name)):
+            return n, path
+    return None, None
+
+def generateScene(items, uniqueShapes = None, instanced = False, seed = 0):
+    '''
+    Fills the scene with copies of a few unique meshes scattered around, like the scenes the exporter is made for.
+    \nThere's also a transform named 'root' to use as the root transform.
+
+    :param int items: The total amount of mesh transforms.
+    :param int uniqueShapes: The amount of different shapes. Defaults to 1 per 100 items.
+    :param bool instanced: Whether copies share one mesh node (maya instances) instead of each having their own.
+    :param int seed: Seed for positions and UUIDs, so scenes are repeatable.
+    :returns list[str]: The full paths of the mesh transforms.
+    '''
+    reset(seed)
+    uniqueShapes = uniqueShapes or max(1, items // 100)
+
+    addTransform('root', translate = (5, 1, 2), rotate = (0, 30, 0), scale = (2, 2, 2))
+
+    names = []
+    meshes = {}
+    for i in range(items):
+        shape = i % uniqueShapes
+        name = f"shape{shape}_{i // uniqueShapes}"
+
+        transform = addTransform(name,
+                                 translate = (random.uniform(-1000, 1000), random.uniform(-1000, 1000), random.uniform(0, 50)),
+                                 rotate = (0, 0, random.choice((0, 90, 180, 270))),
+                                 scale = (1, 1, random.uniform(0.8, 1.2)),
+                                 pivot = (0, 0, 0.5))
+        names.append('|' + name)
+
+        if (instanced and shape in meshes):
+            instance(meshes[shape], transform)
+            continue
+
+        # Shapes differ by face count and UV count, so some land in the same fingerprint bucket
+        meshes[shape] = addMesh(f"{name}Shape", transform, [4] * (6 + shape % 13), {'map1' : 14 + shape % 3}, shape)
+
+    return names
@@ -0,0 +1,321 @@
+'''
+Fake maya.api.OpenMaya, backed by the in-memory scene in FakeScene. Only the classes and methods the package uses.
+'''
+import itertools
+import math
+
+import FakeScene
+from FakeScene import scene, resolve, paths
+
+class MSpace:
+    kTransform = 1
+    kObject = 2
+    kWorld = 4
+
+class MObject:
+    def __init__(self, node = None):
+        self.fakeNode = node
+
+    def isNull(self):
+        return self.fakeNode == None
+
+MObject.kNullObj = MObject()
+
+class MUuid:
+    def __init__(self, value = None):
+        self.value = value
+
+    def asString(self):
+        return self.value
+
+class MDagPath:
+    def __init__(self, node = None, path = None):
+        self.fakeNode = node
+        self.path = path
+
+    def fullPathName(self):
+        return self.path
+
+    def partialPathName(self):
+        return self.path.rsplit('|', 1)[-1]
+
+    def node(self):
+        return MObject(self.fakeNode)
+
+    def isInstanced(self):
+        return len(self.fakeNode.parents) > 1
+
+class MSelectionList:
+    def __init__(self):
+        self.items = []
+
+    def clear(self):
+        self.items = []
+
+    def add(self, item):
+        if (isinstance(item, MUuid)):
+            n = scene.uuids.get(item.value)
+            if (n == None):
+                raise RuntimeError('(kInvalidParameter): Object does not exist')
+            self.items.append((n, paths(n)[0]))
+            return self
+
+        n, path = resolve(item)
+        if (n == None):
+            raise RuntimeError('(kInvalidParameter): Object does not exist')
+        self.items.append((n, path))
+        return self
+
+    def length(self):
+        return len(self.items)
+
+    def getDagPath(self, index):
+        return MDagPath(*self.items[index])
+
+    def getDependNode(self, index):
+        return MObject(self.items[index][0])
+
+class MFnDependencyNode:
+    def __init__(self, obj = None):
+        self.fakeNode = obj.fakeNode if obj != None else None
+
+    def setObject(self, obj):
+        self.fakeNode = obj.fakeNode
+        return self
+
+    def uuid(self):
+        return MUuid(self.fakeNode.uuid)
+
+    def name(self):
+        return self.fakeNode.name
+
+    @property
+    def typeName(self):
+        return self.fakeNode.type
+
+class MFnDagNode(MFnDependencyNode):
+    def fullPathName(self):
+        return paths(self.fakeNode)[0]
+
+class MVector(list):
+    def __init__(self, *values):
+        super().__init__(values if len(values) == 3 else values[0])
+
+    @property
+    def x(self):
+        return self[0]
+
+    @property
+    def y(self):
+        return self[1]
+
+    @property
+    def z(self):
+        return self[2]
+
+MPoint = MVector
+
+class MBoundingBox:
+    def __init__(self):
+        self.min = None
+        self.max = None
+
+    def expand(self, point):
+        self.min = MPoint([min(a, b) for a, b in zip(self.min or point, point)])
+        self.max = MPoint([max(a, b) for a, b in zip(self.max or point, point)])
+
+class MEulerRotation:
+    kXYZ = 0
+
+    def __init__(self, x = 0.0, y = 0.0, z = 0.0, order = 0):
+        self.x, self.y, self.z, self.order = x, y, z, order
+
+class MFnMesh(MFnDagNode):
+    @property
+    def numVertices(self):
+        return self.fakeNode.mesh['numVertices']
+
+    @property
+    def numEdges(self):
+        return self.fakeNode.mesh['numEdges']
+
+    @property
+    def numPolygons(self):
+        return len(self.fakeNode.mesh['faceCounts'])
+
+    @property
+    def numFaceVertices(self):
+        return sum(self.fakeNode.mesh['faceCounts'])
+
+    def getVertices(self):
+        faceCounts = self.fakeNode.mesh['faceCounts']
+        numVertices = self.numVertices
+        connects = self.fakeNode.mesh.get('connects') or [i % numVertices for i in range(sum(faceCounts))]
+        return list(faceCounts), list(connects)
+
+    def getUVSetNames(self):
+        return list(self.fakeNode.mesh['uvSets'])
+
+    def numUVs(self, uvSet = 'map1'):
+        return self.fakeNode.mesh['uvSets'][uvSet]
+
+    def getPoints(self, space = MSpace.kObject):
+        # Points depend on the shape's key (and how far they've been moved) only, so copies of a shape hash the same
+        key = hash(self.fakeNode.mesh['key']) % 7
+        offset = self.fakeNode.mesh.get('offset', 0)
+        return [MPoint(i, key, offset) for i in range(self.numVertices)]
+
+    @property
+    def boundingBox(self):
+        # The box around getPoints(), without building them
+        box = MBoundingBox()
+        key = hash(self.fakeNode.mesh['key']) % 7
+        offset = self.fakeNode.mesh.get('offset', 0)
+        box.expand(MPoint(0, key, offset))
+        box.expand(MPoint(self.numVertices - 1, key, offset))
+        return box
+
+    def getUVs(self, uvSet = 'map1'):
+        return [float(i) for i in range(self.numUVs(uvSet))], [0.0] * self.numUVs(uvSet)
+
+    def getNormals(self, space = MSpace.kObject):
+        return [MVector(0, 1, 0)] * self.numVertices
+
+class MFnTransform(MFnDagNode):
+    def translation(self, space):
+        return MVector(self.fakeNode.attrs['translate'])
+
+    def rotatePivot(self, space):
+        return MPoint(self.fakeNode.attrs['rotatePivot'])
+
+    def rotation(self, asQuaternion = False):
+        return MEulerRotation(*[math.radians(value) for value in self.fakeNode.attrs['rotate']])
+
+    def scale(self):
+        return list(self.fakeNode.attrs['scale'])
+
+class MDistance:
+    kCentimeters = 6
+
+    def __init__(self, value = 0.0, unit = 6):
+        self.value = value
+
+    def asUnits(self, unit):
+        return self.value
+
+    @staticmethod
+    def uiUnit():
+        return MDistance.kCentimeters
+
+class MAngle:
+    kRadians = 1
+    kDegrees = 2
+
+    def __init__(self, value = 0.0, unit = 1):
+        self.value = value
+
+    def asUnits(self, unit):
+        return math.degrees(self.value) if unit == MAngle.kDegrees else self.value
+
+    @staticmethod
+    def uiUnit():
+        return MAngle.kDegrees
+
+class MPlug:
+    # Short names of the attributes the fake scene has
+    shortNames = {'translate' : 't', 'rotate' : 'r', 'scale' : 's', 'rotatePivot' : 'rp', 'visibility' : 'v'}
+
+    def __init__(self, node = None, attribute = None):
+        self.fakeNode = node
+        self.attribute = attribute
+
+    def partialName(self, includeNodeName = False, includeNonMandatoryIndices = False, includeInstancedIndices = False,
+                    useAlias = False, useFullAttributePath = False, useLongNames = False):
+        return self.attribute if useLongNames else MPlug.shortNames.get(self.attribute, self.attribute)
+
+#region Messages
+# Callback ID -> (event, node), and (event, node) -> {callback ID : (function, clientData)}. Node None is every node.
+callbacks = {}
+callbacksByNode = {}
+callbackIds = itertools.count(1)
+
+def addCallback(event, node, function, clientData):
+    callbackId = next(callbackIds)
+    callbacks[callbackId] = (event, node)
+    callbacksByNode.setdefault((event, node), {})[callbackId] = (function, clientData)
+    return callbackId
+
+def dispatch(event, n, attribute):
+    for key in ((event, n), (event, None)) if n != None else ((event, None),):
+        for function, clientData in list(callbacksByNode.get(key, {}).values()):
+            if (event == 'attributeSet'):
+                function(MNodeMessage.kAttributeSet, MPlug(n, attribute), MPlug(), clientData)
+            elif (event == 'dirty'):
+                function(MObject(n), MPlug(n, attribute), clientData)
+            elif (n == None):
+                function(clientData)
+            elif (event == 'renamed'):
+                function(MObject(n), '', clientData)
+            elif (event == 'parentAdded'):
+                function(MDagPath(n, paths(n)[0]), MDagPath(), clientData)
+            else:
+                function(MObject(n), clientData)
+
+def onSceneChanged(event, n, attribute):
+    # Removal callbacks are registered per node type
+    if (event == 'removed'):
+        dispatch(f"removed:{n.type}", n, attribute)
+        if (n.type != 'dependNode'):
+            dispatch('removed:dependNode', n, attribute)
+        return
+
+    dispatch(event, n, attribute)
+
+FakeScene.listeners.append(onSceneChanged)
+
+class MMessage:
+    @staticmethod
+    def removeCallback(callbackId):
+        if (callbackId not in callbacks):
+            raise RuntimeError('(kInvalidParameter): Invalid callback id')
+        key = callbacks.pop(callbackId)
+        del callbacksByNode[key][callbackId]
+
+    @staticmethod
+    def removeCallbacks(ids):
+        for callbackId in ids:
+            MMessage.removeCallback(callbackId)
+
+class MNodeMessage(MMessage):
+    kAttributeSet = 8
+
+    @staticmethod
+    def addAttributeChangedCallback(node, function, clientData = None):
+        return addCallback('attributeSet', node.fakeNode, function, clientData)
+
+    @staticmethod
+    def addNameChangedCallback(node, function, clientData = None):
+        return addCallback('renamed', node.fakeNode, function, clientData)
+
+    @staticmethod
+    def addNodeDirtyPlugCallback(node, function, clientData = None):
+        return addCallback('dirty', node.fakeNode, function, clientData)
+
+class MDGMessage(MMessage):
+    @staticmethod
+    def addNodeRemovedCallback(function, nodeType = 'dependNode', clientData = None):
+        return addCallback(f"removed:{nodeType}", None, function, clientData)
+
+class MSceneMessage(MMessage):
+    kBeforeNew = 'beforeNew'
+    kBeforeOpen = 'beforeOpen'
+
+    @staticmethod
+    def addCallback(message, function, clientData = None):
+        return addCallback(message, None, function, clientData)
+
+class MDagMessage(MMessage):
+    @staticmethod
+    def addParentAddedCallback(function, clientData = None):
+        return addCallback('parentAdded', None, function, clientData)
+#endregion Messages
@@ -0,0 +1,397 @@
+'''
+Fake maya.cmds, backed by the in-memory scene in FakeScene.
+\nOnly the commands and flags the package uses are implemented. UI commands just store their flags, so the window
+can be built and driven without maya. Every call is counted in 'calls', so benchmarks can report how many commands an
+operation takes (the count is what matters in maya, where each command has a fixed overhead).
+'''
+import itertools
+
+import FakeScene
+from FakeScene import scene, resolve, paths
+
+calls = {}
+controls = {}
+nameCounter = itertools.count()
+
+def count(name):
+    calls[name] = calls.get(name, 0) + 1
+
+def resetCalls():
+    calls.clear()
+
+def flatten(args):
+    items = []
+    for arg in args:
+        if (isinstance(arg, (list, tuple))):
+            items += flatten(arg)
+        elif (arg != None):
+            items.append(arg)
+    return items
+
+def flag(flags, longName, shortName, default = None):
+    return flags.get(longName, flags.get(shortName, default))
+
+def changed():
+    '''
+    Marks the scene as modified, and adds the change to the undo queue if undo is on.
+    '''
+    scene.modified = True
+    if (scene.undoEnabled):
+        scene.undoable += 1
+
+#region UI
+def uiCommand(commandName):
+    '''
+    Makes a UI command. Creating a control returns a unique name; edit stores flags and query returns them.
+    \ntextScrollList keeps its items and selection, like the real control.
+    '''
+    def command(*args, **flags):
+        count(commandName)
+        edit = flags.pop('edit', flags.pop('e', False))
+        query = flags.pop('query', flags.pop('q', False))
+
+        if (flags.pop('exists', flags.pop('ex', False))):
+            return str(args[0]) in controls
+
+        if (not edit and not query):
+            name = str(args[0]) if (args and commandName in ('menu', 'workspaceControl')) else f"{commandName}{next(nameCounter)}"
+            controls[name] = dict(flags, items = [], selected = [])
+            return name
+
+        control = controls.setdefault(str(args[0]), {'items' : [], 'selected' : []})
+        if (query):
+            for key in flags:
+                if (key in ('selectItem', 'si')):
+                    return list(control['selected']) or None
+                if (key in ('allItems', 'ai')):
+                    return list(control['items']) or None
+                if (key in ('numberOfItems', 'ni')):
+                    return len(control['items'])
+                if (key == 'isCancelled'):
+                    return False
+                return control.get(key)
+            return None
+
+        if (commandName == 'textScrollList'):
+            editList(control, flags)
+        control.update(flags)
+    return command
+
+def editList(control, flags):
+    def values(key):
+        value = flags[key]
+        return [str(item) for item in (value if isinstance(value, (list, tuple)) else [value])]
+
+    if (flags.get('removeAll')):
+        control['items'] = []
+        control['selected'] = []
+    if ('append' in flags):
+        control['items'] += values('append')
+    if (flags.get('deselectAll')):
+        control['selected'] = []
+    if ('selectItem' in flags):
+        control['selected'] += values('selectItem')
+    if ('removeItem' in flags):
+        removed = set(values('removeItem'))
+        control['items'] = [item for item in control['items'] if item not in removed]
+        control['selected'] = [item for item in control['selected'] if item not in removed]
+
+for commandName in ['formLayout', 'iconTextButton', 'text', 'textField', 'checkBox', 'button', 'frameLayout', 'scrollLayout',
+                    'textScrollList', 'paneLayout', 'workspaceControl', 'symbolButton', 'menu', 'menuItem', 'progressBar',
+                    'intField', 'optionMenu', 'intScrollBar', 'columnLayout', 'rowLayout', 'separator']:
+    globals()[commandName] = uiCommand(commandName)
+
+def deleteUI(*args, **flags):
+    count('deleteUI')
+    for name in args:
+        controls.pop(str(name), None)
+
+def confirmDialog(*args, **flags):
+    '''
+    Presses the first button.
+    '''
+    count('confirmDialog')
+    return flags.get('button', ['Ok'])[0]
+
+def fileDialog2(*args, **flags):
+    count('fileDialog2')
+    return None
+
+def getModifiers():
+    return 0
+
+jobCounter = itertools.count(1)
+def scriptJob(*args, **flags):
+    count('scriptJob')
+    return next(jobCounter)
+
+def refresh(*args, **flags):
+    count('refresh')
+
+def evalDeferred(*args, **flags):
+    pass
+#endregion
+
+#region Plugins
+def undoInfo(*args, **flags):
+    count('undoInfo')
+    if (flag(flags, 'query', 'q', False)):
+        return scene.undoEnabled
+    scene.undoEnabled = flag(flags, 'stateWithoutFlush', 'swf', scene.undoEnabled)
+
+def pluginInfo(*args, **flags):
+    return True
+
+def loadPlugin(*args, **flags):
+    pass
+
+def FBXExport(*args, **flags):
+    count('FBXExport')
+    if ('-file' in args):
+        with open(args[args.index('-file') + 1], 'w') as f:
+            f.write('fbx')
+
+def FBXProperty(*args, **flags):
+    count('FBXProperty')
+
+def FBXResetExport(*args, **flags):
+    count('FBXResetExport')
+#endregion
+
+#region Scene
+def ls(*args, **flags):
+    count('ls')
+
+    if (flag(flags, 'selection', 'sl', False)):
+        found = list(scene.selection)
+    elif (args):
+        found = []
+        for name in flatten(args):
+            n, path = resolve(name)
+            if (n != None):
+                found.append(path)
+            elif (str(name) in scene.uuids):
+                found += paths(scene.uuids[str(name)])
+    else:
+        found = [path for n in list(scene.nodes.values()) for path in paths(n)]
+
+    types = flag(flags, 'type', 'typ')
+    if (types):
+        types = [types] if isinstance(types, str) else types
+        found = [path for path in found if resolve(path)[0].type in types]
+
+    if (flag(flags, 'uuid', 'uid', False)):
+        return [resolve(path)[0].uuid for path in found]
+    if (not flag(flags, 'long', 'l', False)):
+        found = [path.rsplit('|', 1)[-1] for path in found]
+    return found
+
+def filterExpand(items, **flags):
+    count('filterExpand')
+    meshes = []
+    for name in flatten([items]):
+        n, path = resolve(name)
+        if (n == None):
+            continue
+        if (n.type == 'mesh'):
+            meshes.append(path)
+            continue
+        meshes += [f"{path}|{child.name}" for child in scene.children.get(n, []) if child.type == 'mesh']
+    return meshes or None
+
+def listRelatives(items, **flags):
+    count('listRelatives')
+    found = []
+    for name in flatten([items]):
+        n, path = resolve(name)
+        if (n == None):
+            continue
+
+        if (flag(flags, 'parent', 'p', False)):
+            if (flag(flags, 'allParents', 'ap', False)):
+                found += [parentPath for parent in n.parents for parentPath in paths(parent)]
+            elif (n.parents):
+                found.append(path.rsplit('|', 1)[0])
+        elif (flag(flags, 'allDescendents', 'ad', False)):
+            def walk(parent, parentPath):
+                for child in scene.children.get(parent, []):
+                    childPath = f"{parentPath}|{child.name}"
+                    found.append(childPath)
+                    walk(child, childPath)
+            walk(n, path)
+        else:
+            found += [f"{path}|{child.name}" for child in scene.children.get(n, [])]
+            if (flag(flags, 'shapes', 's', False)):
+                found = [childPath for childPath in found if resolve(childPath)[0].type == 'mesh']
+
+    nodeType = flag(flags, 'type', 'typ')
+    if (nodeType):
+        found = [path for path in found if resolve(path)[0].type == nodeType]
+
+    if (not flag(flags, 'fullPath', 'f', False)):
+        found = [path.rsplit('|', 1)[-1] for path in found]
+    return list(dict.fromkeys(found)) or None
+
+def polyCompare(first, second, **flags):
+    '''
+    Returns 0 if the meshes are the same shape.
+    '''
+    count('polyCompare')
+    return 0 if resolve(first)[0].mesh['key'] == resolve(second)[0].mesh['key'] else 1
+
+def objExists(name):
+    count('objExists')
+    return resolve(name)[0] != None
+
+def objectType(name):
+    count('objectType')
+    return resolve(name)[0].type
+
+def getAttr(plug, **flags):
+    count('getAttr')
+    name, attribute = str(plug).rsplit('.', 1)
+    n = resolve(name)[0]
+    if (n == None):
+        raise ValueError(f"No object matches name: {plug}")
+
+    value = n.attrs[attribute]
+    return [tuple(value)] if isinstance(value, list) else value
+
+def setAttr(plug, *values, **flags):
+    count('setAttr')
+    name, attribute = str(plug).rsplit('.', 1)
+    n = resolve(name)[0]
+    if (n == None):
+        raise RuntimeError(f"No object matches name: {plug}")
+    if (attribute in n.connected):
+        raise RuntimeError(f"setAttr: The attribute '{plug}' is locked or connected and cannot be modified.")
+    n.attrs[attribute] = list(values) if len(values) > 1 else values[0]
+    changed()
+    FakeScene.notify('attributeSet', n, attribute)
+
+def connectAttr(source, destination, **flags):
+    '''
+    Only marks the destination as connected, so setting it fails. Duplicates don't keep the connection.
+    '''
+    count('connectAttr')
+    name, attribute = str(destination).rsplit('.', 1)
+    resolve(name)[0].connected.add(attribute)
+
+def select(*args, **flags):
+    count('select')
+    if (flag(flags, 'clear', 'cl', False)):
+        scene.selection = []
+        return
+
+    items = []
+    for name in flatten(args):
+        n, path = resolve(name)
+        if (n == None):
+            raise ValueError(f"No object matches name: {name}")
+        items.append(path)
+
+    if (flag(flags, 'add', 'add', False)):
+        selected = set(scene.selection)
+        scene.selection += [item for item in dict.fromkeys(items) if item not in selected]
+    elif (flag(flags, 'deselect', 'd', False)):
+        removed = set(items)
+        scene.selection = [item for item in scene.selection if item not in removed]
+    elif (flag(flags, 'toggle', 'tgl', False)):
+        selected = dict.fromkeys(scene.selection)
+        for item in items:
+            if (item in selected):
+                del selected[item]
+            else:
+                selected[item] = None
+        scene.selection = list(selected)
+    else:
+        scene.selection = list(dict.fromkeys(items))
+
+def duplicate(name, **flags):
+    count('duplicate')
+    n = resolve(name)[0]
+    copy = FakeScene.addTransform(f"{n.name}Copy{next(nameCounter)}", n.parents[0] if n.parents else None,
+                                  n.attrs['translate'], n.attrs['rotate'], n.attrs['scale'], n.attrs['rotatePivot'])
+    for child in scene.children.get(n, []):
+        if (child.type == 'mesh'):
+            FakeScene.addMesh(f"{child.name}Copy{next(nameCounter)}", copy, child.mesh['faceCounts'], child.mesh['uvSets'], child.mesh['key'])
+    return [copy.name]
+
+def delete(*args, **flags):
+    count('delete')
+    for name in flatten(args):
+        n = resolve(name)[0]
+        if (n != None):
+            scene.remove(n)
+
+def rename(name, newName, **flags):
+    count('rename')
+    scene.rename(resolve(name)[0], newName)
+    return newName
+
+def parent(name, parentName = None, **flags):
+    count('parent')
+    n = resolve(name)[0]
+    scene.reparent(n, None if flag(flags, 'world', 'w', False) else resolve(parentName)[0])
+    return [n.name]
+
+def file(*args, **flags):
+    '''
+    Exported scenes hold the selected nodes and everything under them, and opening one replaces the scene with them
+    (at the top of the scene), so worker processes can open the scenes the package writes.
+    '''
+    import pickle
+
+    count('file')
+    if (flag(flags, 'query', 'q', False)):
+        if (flag(flags, 'modified', 'mf', False)):
+            return scene.modified
+        return scene.fileName if flag(flags, 'sceneName', 'sn', False) else None
+    if (flag(flags, 'modified', 'mf') != None):
+        scene.modified = flag(flags, 'modified', 'mf')
+        return ''
+    if (flag(flags, 'exportSelected', 'es', False)):
+        exported = []
+        def walk(n, parent):
+            exported.append((n.name, n.type, n.uuid, n.attrs, n.connected, n.mesh, parent))
+            for child in scene.children.get(n, []):
+                walk(child, n.name)
+        for path in scene.selection:
+            walk(resolve(path)[0], None)
+
+        with open(args[0], 'wb') as f:
+            pickle.dump(exported, f)
+        return args[0]
+    if (flag(flags, 'open', 'o', False)):
+        with open(args[0], 'rb') as f:
+            exported = pickle.load(f)
+
+        FakeScene.notify('beforeOpen', None)
+        scene.reset()
+        for name, nodeType, uuid, attrs, connected, mesh, parent in exported:
+            n = FakeScene.node(name, nodeType, scene.nodes[parent] if parent else None)
+            n.uuid, n.attrs, n.connected, n.mesh = uuid, attrs, connected, mesh
+            scene.register(n, n.parents[0] if n.parents else None)
+        scene.fileName = args[0]
+    return ''
+
+def createNode(nodeType, name = None, **flags):
+    count('createNode')
+    n = FakeScene.node(name or f"{nodeType}{next(nameCounter)}", nodeType)
+    scene.register(n, None)
+    changed()
+    return n.name
+
+def addAttr(name, **flags):
+    count('addAttr')
+    resolve(name)[0].attrs[flag(flags, 'longName', 'ln')] = ''
+    changed()
+
+def attributeQuery(attribute, node = None, exists = False, **flags):
+    count('attributeQuery')
+    n = resolve(node)[0]
+    return n != None and attribute in n.attrs
+
+def lockNode(*args, **flags):
+    count('lockNode')
+#endregion
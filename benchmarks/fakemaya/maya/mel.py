@@ -0,0 +1,11 @@
+'''
+Fake maya.mel: only the global variables the package reads.
+'''
+globals_ = {'$gMainProgressBar' : 'MayaWindow|mainProgressBar'}
+
+def eval(command):
+    # e.g. mel.eval('$tmp = $gMainProgressBar')
+    for name, value in globals_.items():
+        if (name in command):
+            return value
+    return None
@@ -0,0 +1,8 @@
+'''
+Fake maya.standalone.
+'''
+def initialize(name = 'python'):
+    pass
+
+def uninitialize():
+    pass
@@ -0,0 +1,12 @@
+'''
+Fake maya.utils: deferred calls are queued until flush() is called (maya runs them when it's idle).
+'''
+deferred = []
+
+def executeDeferred(function, *args):
+    deferred.append((function, args))
+
+def flush():
+    while (deferred):
+        function, args = deferred.pop(0)
+        function(*args)